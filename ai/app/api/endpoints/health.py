@@ -1,6 +1,10 @@
 """Health check endpoints."""
 from fastapi import APIRouter
 from app.core.logging import get_logger
+from app.services.cache import upstream_cache
+from app.services.coalescing import match_coalescer
+from app.services.llm_cache import llm_cache
+from app.services.llm_registry import llm_registry
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -9,4 +13,18 @@ logger = get_logger(__name__)
 async def health_check():
     """Check API health."""
     logger.debug("Health check requested")
-    return {"status": "healthy"} 
\ No newline at end of file
+    return {"status": "healthy"}
+
+@router.get("/health/cache")
+async def cache_stats():
+    """Report upstream data and LLM response cache hit/miss counters."""
+    return {
+        "upstream": upstream_cache.stats(),
+        "llm": llm_cache.stats(),
+        "match_requests": match_coalescer.stats(),
+    }
+
+@router.get("/health/llm")
+async def llm_usage():
+    """Report LLM token usage per agent role, including prompt tokens served from the provider cache."""
+    return llm_registry.usage_stats()
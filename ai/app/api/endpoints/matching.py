@@ -1,10 +1,16 @@
 """Endpoints for employee matching."""
-from fastapi import APIRouter, HTTPException
-from datetime import datetime
-from typing import Dict, Any
+import asyncio
+import json
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Any, Optional
 
 from app.core.logging import get_logger
-from app.schemas.project import TextProjectRequest, MatchingResponse
+from app.core.workflow import WorkflowEventCallback
+from app.schemas.project import TextProjectRequest, MatchingResponse, MatchJobResponse
+from app.services.coalescing import description_key, match_coalescer, requirement_key
+from app.services.jobs import JobQueueFullError, MatchJob, match_jobs
 from app.services.matching import MatchingService
 from app.services.parser import RequirementsParserService
 from app.models.project import ProjectRequirement, Skills, ExperienceLevel
@@ -18,23 +24,11 @@ async def match_employees(req: TextProjectRequest) -> Dict[str, Any]:
     try:
         logger.info(f"Received project requirement: {req.description[:100]}...")
         
-        # Parse the free text into structured data
-        parser_service = RequirementsParserService()
-        parsed_req = parser_service.parse_requirements(req.description)
-        
-        # Create project requirement from parsed data
-        project_requirement = await _create_project_requirement(
-            title=parsed_req["title"],
-            tech_stack=parsed_req["tech_stack"],
-            domains=parsed_req["domains"],
-            required_level=parsed_req["required_level"],
-            start_date=parsed_req["start_date"]
+        # Identical descriptions in flight share one parse and workflow run
+        result = await match_coalescer.run(
+            description_key(req.description), lambda: _match_description(req.description)
         )
         
-        # Run the matching workflow
-        matching_service = MatchingService()
-        result = matching_service.run_workflow(project_requirement)
-        
         if result.get("error"):
             logger.warning(f"Matching workflow returned error: {result['error']}")
             return MatchingResponse(
@@ -53,6 +47,156 @@ async def match_employees(req: TextProjectRequest) -> Dict[str, Any]:
         logger.error(f"Error in matching endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+async def _match_description(description: str) -> Dict[str, Any]:
+    """Parse a description and run the workflow, shared with identical requirements in flight."""
+    # Parse the free text into structured data
+    # Created off the event loop: the first one imports the LLM stack
+    parser_service = await asyncio.to_thread(RequirementsParserService)
+    parsed_req = await parser_service.aparse_requirements(description)
+    
+    # Create project requirement from parsed data
+    project_requirement = await _create_project_requirement(
+        title=parsed_req["title"],
+        tech_stack=parsed_req["tech_stack"],
+        domains=parsed_req["domains"],
+        required_level=parsed_req["required_level"],
+        start_date=parsed_req["start_date"]
+    )
+    
+    # Run the matching workflow
+    matching_service = MatchingService()
+    return await match_coalescer.run(
+        requirement_key(project_requirement),
+        lambda: matching_service.arun_workflow(project_requirement)
+    )
+
+@router.post("/match/stream")
+async def stream_match_employees(req: TextProjectRequest, request: Request) -> StreamingResponse:
+    """Match employees like /match, streaming progress as Server-Sent Events.
+    
+    Emits "stage" events as the workflow advances, "requirement" once the
+    description is parsed, "batch_analyzed" and provisional "candidates" as
+    analysis batches finish, then a final "result" (or "error") event.
+    """
+    logger.info(f"Received streaming project requirement: {req.description[:100]}...")
+    return StreamingResponse(
+        _match_event_stream(req, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def _format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+async def _match_event_stream(req: TextProjectRequest, request: Request) -> AsyncIterator[str]:
+    """Run the matching pipeline in the background and yield its events as they arrive."""
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+    
+    def emit(event: str, data: Dict[str, Any]) -> None:
+        queue.put_nowait((event, data))
+    
+    async def run_pipeline() -> None:
+        try:
+            result = await _run_matching(req.description, emit)
+            if result.get("error"):
+                logger.warning(f"Matching workflow returned error: {result['error']}")
+                queue.put_nowait(("error", {"status_code": 500, "detail": result["error"], "result": result}))
+            else:
+                queue.put_nowait(("result", result))
+        
+        except HTTPException as e:
+            queue.put_nowait(("error", {"status_code": e.status_code, "detail": e.detail}))
+        except ValueError as e:
+            logger.error(f"Error parsing requirements: {str(e)}")
+            queue.put_nowait(("error", {"status_code": 400, "detail": f"Error parsing requirements: {str(e)}"}))
+        except Exception as e:
+            logger.error(f"Error in streaming matching endpoint: {str(e)}")
+            queue.put_nowait(("error", {"status_code": 500, "detail": f"Internal server error: {str(e)}"}))
+        finally:
+            queue.put_nowait(done)
+    
+    task = asyncio.create_task(run_pipeline())
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if await request.is_disconnected():
+                logger.info("Client disconnected from match stream")
+                break
+            yield _format_sse(*item)
+    finally:
+        # Stop the workflow if the client went away
+        task.cancel()
+
+async def _run_matching(description: str, on_event: Optional[WorkflowEventCallback] = None) -> Dict[str, Any]:
+    """Parse a free-text description and run the matching workflow."""
+    def emit(event: str, data: Dict[str, Any]) -> None:
+        if on_event is not None:
+            on_event(event, data)
+    
+    emit("stage", {"stage": "parsing"})
+    # Created off the event loop: the first one imports the LLM stack
+    parser_service = await asyncio.to_thread(RequirementsParserService)
+    parsed_req = await parser_service.aparse_requirements(description)
+    emit("requirement", parsed_req)
+    
+    project_requirement = await _create_project_requirement(
+        title=parsed_req["title"],
+        tech_stack=parsed_req["tech_stack"],
+        domains=parsed_req["domains"],
+        required_level=parsed_req["required_level"],
+        start_date=parsed_req["start_date"]
+    )
+    
+    matching_service = MatchingService()
+    return await matching_service.arun_workflow(project_requirement, on_event)
+
+@router.post("/match/jobs", response_model=MatchJobResponse, status_code=202)
+async def create_match_job(req: TextProjectRequest) -> MatchJobResponse:
+    """Queue a matching job and return its id without waiting for the result."""
+    logger.info(f"Received project requirement for background job: {req.description[:100]}...")
+    try:
+        job = match_jobs.submit(lambda on_event: _run_matching(req.description, on_event))
+    except JobQueueFullError as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+    return _job_response(job)
+
+@router.get("/match/jobs/{job_id}", response_model=MatchJobResponse)
+async def get_match_job(job_id: str) -> MatchJobResponse:
+    """Get the status of a matching job, including its result once finished."""
+    job = match_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Match job {job_id} not found")
+    return _job_response(job)
+
+@router.delete("/match/jobs/{job_id}", response_model=MatchJobResponse)
+async def cancel_match_job(job_id: str) -> MatchJobResponse:
+    """Cancel a queued or running matching job."""
+    job = match_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Match job {job_id} not found")
+    return _job_response(job)
+
+def _job_response(job: MatchJob) -> MatchJobResponse:
+    """Convert a job's state to its API representation."""
+    def as_datetime(timestamp: Optional[float]) -> Optional[datetime]:
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc) if timestamp is not None else None
+    
+    return MatchJobResponse(
+        job_id=job.id,
+        status=job.status,
+        stage=job.stage,
+        created_at=as_datetime(job.created_at),
+        started_at=as_datetime(job.started_at),
+        finished_at=as_datetime(job.finished_at),
+        result=job.result,
+        error=job.error
+    )
+
 async def _create_project_requirement(
     title: str, 
     tech_stack: list, 
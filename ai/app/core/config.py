@@ -1,6 +1,7 @@
 """Configuration settings for the application."""
 import os
 from typing import Optional
+from pydantic import Field
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -24,6 +25,113 @@ class Settings(BaseSettings):
     URL_EMPINFO: Optional[str] = os.getenv("URL_EMPINFO")
     INSIDER_BEARER_TOKEN: Optional[str] = os.getenv("INSIDER_BEARER_TOKEN")
     EMP_INFO_TOKEN: Optional[str] = os.getenv("EMP_INFO_TOKEN")
+
+    # Upstream HTTP client settings
+    UPSTREAM_CONNECT_TIMEOUT: float = 5.0
+    UPSTREAM_READ_TIMEOUT: float = 30.0
+    UPSTREAM_MAX_CONNECTIONS: int = 50
+    UPSTREAM_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    UPSTREAM_MAX_CONNECTIONS_PER_HOST: int = 10
+    UPSTREAM_HTTP2: bool = True
+    UPSTREAM_FETCH_DEADLINE: float = 45.0
+
+    # Upstream data cache settings (seconds)
+    CACHE_ROSTER_TTL: float = 900.0
+    CACHE_ACTIVE_STATUS_TTL: float = 300.0
+    CACHE_PROJECTS_TTL: float = 300.0
+    CACHE_STALE_WHILE_REVALIDATE: float = 3600.0
+    BOOKING_STORE_TTL: float = 600.0
+
+    # Decode upstream payloads straight into typed structs with msgspec (when installed)
+    FAST_DECODING: bool = True
+
+    # Parse the roster and active status responses element by element as they download
+    # (requires ijson) instead of holding the whole body
+    STREAM_INGEST: bool = False
+
+    # Keep the roster in compact columnar arrays instead of one pydantic model graph per employee
+    ROSTER_COLUMNAR: bool = True
+
+    # Memory-mapped roster snapshot loaded at startup and rewritten after each roster change
+    # (columnar roster only)
+    ROSTER_SNAPSHOT_ENABLED: bool = True
+    ROSTER_SNAPSHOT_DIR: str = ".cache/roster_snapshot"
+
+    # Maximum number of employee analysis batches sent to the LLM at once
+    ANALYSIS_MAX_CONCURRENCY: int = 4
+
+    # Token budget for one employee analysis batch
+    ANALYSIS_BATCH_MAX_INPUT_TOKENS: int = 24000
+    ANALYSIS_BATCH_MAX_OUTPUT_TOKENS: int = 8000
+    ANALYSIS_BATCH_MAX_PROFILES: int = 50
+    # Expected completion tokens per profile: base + ratio * profile tokens
+    ANALYSIS_OUTPUT_TOKENS_BASE: int = 90
+    ANALYSIS_OUTPUT_TOKENS_RATIO: float = 0.6
+
+    # Skill/domain vocabulary typo matching: shortest name matched fuzzily, and the most
+    # edits allowed (one per five characters up to this cap)
+    VOCABULARY_FUZZY_MIN_LENGTH: int = 5
+    VOCABULARY_FUZZY_MAX_EDITS: int = 2
+
+    # Candidates sent to the LLM matcher: the best MATCH_SHORTLIST_SIZE by the scoring
+    # formula plus up to MATCH_SHORTLIST_DIVERSITY_MARGIN differing profiles
+    MATCH_SHORTLIST_ENABLED: bool = True
+    MATCH_SHORTLIST_SIZE: int = 30
+    MATCH_SHORTLIST_DIVERSITY_MARGIN: int = 10
+
+    # Profile vector index: when enabled, only the VECTOR_INDEX_TOP_N pre-filtered employees
+    # most similar to the requirement are analyzed
+    VECTOR_INDEX_ENABLED: bool = False
+    VECTOR_INDEX_TOP_N: int = 100
+    VECTOR_INDEX_PATH: str = ".cache/profile_index"
+    VECTOR_INDEX_DIMENSIONS: int = 1024
+
+    # LLM matcher shards: candidates per prompt, shards evaluated at once, and retries
+    # (with exponential backoff starting at MATCH_SHARD_RETRY_BACKOFF seconds) before
+    # a shard falls back to the scoring formula
+    MATCH_SHARD_SIZE: int = Field(15, gt=0)
+    MATCH_MAX_CONCURRENCY: int = Field(4, gt=0)
+    MATCH_SHARD_RETRIES: int = Field(2, ge=0)
+    MATCH_SHARD_RETRY_BACKOFF: float = Field(1.0, ge=0)
+
+    # Number of provisional candidates sent in each /match/stream update
+    STREAM_PROVISIONAL_LIMIT: int = 10
+
+    # Background match jobs: worker count, queued job limit and how long finished jobs are kept (seconds)
+    MATCH_JOB_WORKERS: int = 2
+    MATCH_JOB_QUEUE_SIZE: int = 20
+    MATCH_JOB_RETENTION: float = 3600.0
+
+    # Run identical concurrent /match requests once and share the result
+    MATCH_COALESCING_ENABLED: bool = True
+
+    # Load the LLM client stack in the background at startup instead of on the first request
+    LLM_PREWARM: bool = False
+
+    # LLM client per agent role: model, temperature and completion token limit (None for the model default)
+    LLM_PARSER_MODEL: str = "gpt-4o"
+    LLM_PARSER_TEMPERATURE: float = 0.1
+    LLM_PARSER_MAX_TOKENS: Optional[int] = None
+    LLM_ANALYZER_MODEL: str = "gpt-4o"
+    LLM_ANALYZER_TEMPERATURE: float = 0.1
+    LLM_ANALYZER_MAX_TOKENS: Optional[int] = None
+    LLM_MATCHER_MODEL: str = "gpt-4o"
+    LLM_MATCHER_TEMPERATURE: float = 0.1
+    LLM_MATCHER_MAX_TOKENS: Optional[int] = None
+
+    # Connection pool of each LLM client, timeouts in seconds
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    LLM_CONNECT_TIMEOUT: float = 10.0
+    LLM_READ_TIMEOUT: float = 120.0
+
+    # LLM response cache settings
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: str = ".cache/llm_responses.sqlite3"
+    LLM_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    LLM_CACHE_PARSER_TTL: float = 24 * 3600.0
+    LLM_CACHE_ANALYZER_TTL: float = 7 * 24 * 3600.0
+    LLM_CACHE_MATCHER_TTL: float = 24 * 3600.0
     
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from app.models.models import Employee, ProjectRequirement
 from app.services.agents import (
     RequirementAnalyzer,
@@ -10,40 +10,120 @@ import logging
 import time
 import asyncio
 import concurrent.futures
-import math
+import threading
+import weakref
+from datetime import datetime
+import numpy as np
+from app.core.config import settings
+from app.services.http_client import get_http_client
+from app.services.roster_index import get_roster_index
+from app.services.scoring import ScoringMatrix
 from app.services.services import APIService
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Batch size for employee analysis to prevent token limit issues
-EMPLOYEE_BATCH_SIZE = 50
+# Called with (batch index, batch count, analyses, latency) as analysis batches finish
+BatchCallback = Callable[[int, int, List[Dict], float], None]
+
+# Called with (event name, payload) as the workflow progresses
+WorkflowEventCallback = Callable[[str, Dict], None]
+
+# Shared executor for analysis batches, created on first use
+_analysis_executor = None
+_analysis_executor_lock = threading.Lock()
+
+# Bound on concurrent analysis batches in the async workflow, one per event loop, created on first use
+_analysis_semaphores = weakref.WeakKeyDictionary()
+
+async def load_workflow_data(api_service: APIService, project_start_date: datetime) -> Dict:
+    """Fetch roster, active status and bookings concurrently under one deadline.
+
+    A source that fails or misses the deadline degrades to an empty list, the same
+    way the individual API calls already do on error.
+    """
+    tasks = {
+        "employees": asyncio.ensure_future(api_service.aget_employee_skills()),
+        "employee_status_list": asyncio.ensure_future(api_service.aget_employee_active_status()),
+        "employee_bookings": asyncio.ensure_future(api_service.aget_employee_bookings(project_start_date)),
+    }
+    
+    _, pending = await asyncio.wait(tasks.values(), timeout=settings.UPSTREAM_FETCH_DEADLINE)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    
+    data = {}
+    for name, task in tasks.items():
+        if task in pending:
+            logger.warning(f"Fetching {name} exceeded the {settings.UPSTREAM_FETCH_DEADLINE}s deadline, continuing without it")
+            data[name] = []
+        elif task.cancelled():
+            logger.warning(f"Fetching {name} was cancelled, continuing without it")
+            data[name] = []
+        elif task.exception() is not None:
+            logger.error(f"Error fetching {name}: {str(task.exception())}")
+            data[name] = []
+        else:
+            data[name] = task.result()
+    
+    return data
+
+def _naive_start_date(project_requirement: ProjectRequirement) -> datetime:
+    """Project start date as a naive datetime for consistent comparison."""
+    project_start_date = project_requirement.start_date
+    if hasattr(project_start_date, 'tzinfo') and project_start_date.tzinfo is not None:
+        # Convert to naive UTC
+        project_start_date = project_start_date.replace(tzinfo=None)
+    return project_start_date
+
+def _build_state(project_requirement: ProjectRequirement, data: Dict, start_time: float, api_service: APIService) -> Dict:
+    """Create the initial workflow state from loaded upstream data."""
+    logger.info(f"Retrieved {len(data['employees'])} employees")
+    return {
+        "project_requirement": project_requirement,
+        "employees": data["employees"],
+        "employee_status_list": data["employee_status_list"],
+        "employee_bookings": data["employee_bookings"],
+        "requirement_analysis": None,
+        "employee_analyses": [],
+        "matches": [],
+        "start_time": start_time,
+        "api_service": api_service  # Store API service in state for reuse
+    }
 
 def initialize_workflow(project_requirement: ProjectRequirement) -> Dict:
     """Initialize workflow with required data."""
     try:
         start_time = time.time()
         
-        # Initialize API service for better caching
+        # Upstream data is cached process-wide, so a per-request service is cheap
         api_service = APIService()
+        project_start_date = _naive_start_date(project_requirement)
         
-        # Get employees from API
-        logger.info("Retrieving employees...")
-        employees = api_service.get_employee_skills()
-        logger.info(f"Retrieved {len(employees)} employees")
-        
-        # Create initial state
-        state = {
-            "project_requirement": project_requirement,
-            "employees": employees,
-            "requirement_analysis": None,
-            "employee_analyses": [],
-            "matches": [],
-            "start_time": start_time,
-            "api_service": api_service  # Store API service in state for reuse
-        }
+        # Get employees, active status and bookings from API in parallel
+        logger.info(f"Retrieving employees, active status and bookings for project start date: {project_start_date}")
+        data = get_http_client().run_sync(load_workflow_data(api_service, project_start_date))
+        return _build_state(project_requirement, data, start_time, api_service)
         
-        return state
+    except Exception as e:
+        logger.error(f"Error in initialize_workflow: {str(e)}")
+        return None
+
+async def ainitialize_workflow(project_requirement: ProjectRequirement) -> Dict:
+    """Initialize workflow with required data without blocking the event loop."""
+    try:
+        start_time = time.time()
+        
+        # Upstream data is cached process-wide, so a per-request service is cheap
+        api_service = APIService()
+        project_start_date = _naive_start_date(project_requirement)
+        
+        # Get employees, active status and bookings from API in parallel
+        logger.info(f"Retrieving employees, active status and bookings for project start date: {project_start_date}")
+        data = await get_http_client().run(load_workflow_data(api_service, project_start_date))
+        return _build_state(project_requirement, data, start_time, api_service)
         
     except Exception as e:
         logger.error(f"Error in initialize_workflow: {str(e)}")
@@ -70,110 +150,219 @@ def process_employee_batch(employees_batch, analyzer):
         logger.error(traceback.format_exc())
         return []
 
-async def analyze_employees_async(employees: List[Employee], analyzer: EmployeeAnalyzer) -> List[Dict]:
+def get_analysis_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Get the shared executor that bounds concurrent analysis batches."""
+    global _analysis_executor
+    with _analysis_executor_lock:
+        if _analysis_executor is None:
+            _analysis_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=settings.ANALYSIS_MAX_CONCURRENCY,
+                thread_name_prefix="employee-analysis"
+            )
+        return _analysis_executor
+
+def _timed_batch(employees_batch, analyzer):
+    """Process a batch and measure how long it took."""
+    batch_start = time.perf_counter()
+    batch_analyses = process_employee_batch(employees_batch, analyzer)
+    return batch_analyses, time.perf_counter() - batch_start
+
+def _collect_batch_results(batch_results, num_batches: int, wall_time: float) -> List[Dict]:
+    """Flatten per-batch results in batch order and report their latency."""
+    all_analyses = []
+    latencies = []
+    for i, (batch_analyses, elapsed) in enumerate(batch_results):
+        latencies.append(elapsed)
+        logger.info(f"Batch {i+1}/{num_batches} returned {len(batch_analyses)} analyses in {elapsed:.2f}s")
+        all_analyses.extend(batch_analyses)
+    
+    if latencies:
+        logger.info(
+            f"Analyzed {num_batches} batches in {wall_time:.2f}s wall time "
+            f"(batch latency min {min(latencies):.2f}s, max {max(latencies):.2f}s, sum {sum(latencies):.2f}s)"
+        )
+    return all_analyses
+
+def run_employee_batches(batches: List[List[Employee]], analyzer: EmployeeAnalyzer, on_batch: Optional[BatchCallback] = None) -> List[Dict]:
+    """Analyze batches concurrently on the shared executor, preserving batch order.
+    
+    If given, on_batch is called with (batch index, batch count, analyses, latency)
+    as each batch finishes, in completion order.
+    """
+    wall_start = time.perf_counter()
+    executor = get_analysis_executor()
+    futures = [executor.submit(_timed_batch, batch, analyzer) for batch in batches]
+    if on_batch is not None:
+        indexes = {future: i for i, future in enumerate(futures)}
+        for future in concurrent.futures.as_completed(futures):
+            batch_analyses, elapsed = future.result()
+            try:
+                on_batch(indexes[future], len(batches), batch_analyses, elapsed)
+            except Exception as e:
+                logger.warning(f"Error in batch completion callback: {str(e)}")
+    return _collect_batch_results(
+        [future.result() for future in futures], len(batches), time.perf_counter() - wall_start
+    )
+
+def get_analysis_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore that bounds concurrent analysis batches on the running event loop.
+
+    A semaphore can only be used on one loop, so each loop gets its own.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _analysis_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _analysis_semaphores[loop] = asyncio.Semaphore(settings.ANALYSIS_MAX_CONCURRENCY)
+    return semaphore
+
+async def _atimed_batch(employees_batch, analyzer):
+    """Process a batch asynchronously and measure how long it took."""
+    async with get_analysis_semaphore():
+        batch_start = time.perf_counter()
+        batch_size = len(employees_batch)
+        logger.info(f"Processing batch of {batch_size} pre-filtered employees")
+        batch_analyses = await analyzer.aanalyze_employees(employees_batch)
+        if batch_analyses:
+            logger.info(f"Successfully analyzed batch of {batch_size} employees, got {len(batch_analyses)} results")
+        else:
+            logger.warning(f"No analyses returned for batch of {batch_size} employees")
+        return batch_analyses or [], time.perf_counter() - batch_start
+
+async def analyze_employees_async(employees: List[Employee], analyzer: EmployeeAnalyzer, on_batch: Optional[BatchCallback] = None) -> List[Dict]:
     """Analyze employees in batches asynchronously."""
     total_employees = len(employees)
-    logger.info(f"Analyzing {total_employees} employees in batches of {EMPLOYEE_BATCH_SIZE}...")
+    logger.info(f"Analyzing {total_employees} employees in token-budgeted batches...")
     
     # No employees to analyze
     if not employees:
         return []
     
-    # Calculate number of batches
-    num_batches = math.ceil(total_employees / EMPLOYEE_BATCH_SIZE)
+    # Create batches sized by the analyzer's token budget; tokenizing is CPU work
+    batches = await asyncio.to_thread(analyzer.plan_batches, employees)
+    num_batches = len(batches)
     logger.info(f"Split into {num_batches} batches for processing")
     
-    # Create batches
-    batches = []
-    for i in range(0, total_employees, EMPLOYEE_BATCH_SIZE):
-        batch = employees[i:i + EMPLOYEE_BATCH_SIZE]
-        batches.append(batch)
-    
-    # Process batches in thread pool to enable concurrent processing
-    all_analyses = []
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        loop = asyncio.get_event_loop()
-        futures = [
-            loop.run_in_executor(
-                executor,
-                process_employee_batch,
-                batch,
-                analyzer
-            )
-            for batch in batches
-        ]
-        
-        # Process results as they complete
-        completed = 0
-        for batch_result in await asyncio.gather(*futures):
-            completed += 1
-            logger.info(f"Completed batch {completed}/{num_batches}")
-            all_analyses.extend(batch_result)
+    # Process batches concurrently, up to ANALYSIS_MAX_CONCURRENCY at a time
+    wall_start = time.perf_counter()
+    tasks = [asyncio.ensure_future(_atimed_batch(batch, analyzer)) for batch in batches]
+    try:
+        if on_batch is not None:
+            indexes = {task: i for i, task in enumerate(tasks)}
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    batch_analyses, elapsed = task.result()
+                    try:
+                        # Callbacks score everyone analyzed so far, which is CPU work
+                        await asyncio.to_thread(on_batch, indexes[task], num_batches, batch_analyses, elapsed)
+                    except Exception as e:
+                        logger.warning(f"Error in batch completion callback: {str(e)}")
+        batch_results = await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+    all_analyses = _collect_batch_results(batch_results, num_batches, time.perf_counter() - wall_start)
     
     logger.info(f"Successfully analyzed {len(all_analyses)} employees across {num_batches} batches")
     return all_analyses
 
-def analyze_employees(employees: List[Employee], analyzer: EmployeeAnalyzer, project_requirement: ProjectRequirement) -> List[Dict]:
-    """Analyze all employees by processing in batches to handle large numbers."""
+def prefilter_employees(employees: List[Employee], project_requirement: ProjectRequirement, available: Optional[np.ndarray] = None) -> List[Employee]:
+    """Keep employees with valid primary skills that overlap the required tech stack.
+    
+    If given, available is a mask over employees restricting the candidates further.
+    """
+    index = get_roster_index(employees)
+    candidates = available if available is not None else ~index.empty()
+    
+    # Pre-filter employees with null primary skills upfront
+    valid = candidates & index.valid
+    total_employees = int(np.count_nonzero(candidates))
+    valid_count = int(np.count_nonzero(valid))
+    logger.info(f"Pre-filtered {total_employees - valid_count} employees with null primary skills. Proceeding with {valid_count} valid employees.")
+    
+    # Filter out employees whose primary skills don't exist in project requirements
+    matching = valid & index.skills_mask(project_requirement.required_skills.tech_stack)
+    matching_count = int(np.count_nonzero(matching))
+    logger.info(f"Filtered out {valid_count - matching_count} employees with no matching primary skills. Proceeding with {matching_count} employees.")
+    
+    # Keep only the profiles closest to the requirement when there are too many to analyze
+    if settings.VECTOR_INDEX_ENABLED and matching_count > settings.VECTOR_INDEX_TOP_N:
+        try:
+            # Imported on first use: the index pulls in the vector store stack
+            from app.services.profile_index import profile_index
+
+            # Syncing embeds profiles, so it never runs here; employees the index
+            # does not have yet are kept
+            profile_index.sync_in_background(employees)
+            emp_codes = [employee.empCode for employee in index.select(matching)]
+            nearest = profile_index.nearest(project_requirement, settings.VECTOR_INDEX_TOP_N, emp_codes)
+            matching &= index.codes_mask(nearest) | index.codes_mask(profile_index.unindexed(emp_codes))
+            logger.info(f"Kept the {int(np.count_nonzero(matching))} employees with profiles nearest to the requirement.")
+        except Exception as e:
+            logger.error(f"Error querying the profile index, keeping all matching employees: {str(e)}")
+    return index.select(matching)
+
+def analyze_employees(employees: List[Employee], analyzer: EmployeeAnalyzer, project_requirement: ProjectRequirement, on_batch: Optional[BatchCallback] = None, available: Optional[np.ndarray] = None) -> List[Dict]:
+    """Analyze all employees by processing in batches to handle large numbers.
+    
+    If given, available is a mask over employees limiting who is considered.
+    """
     logger.info(f"Starting employee analysis for {len(employees)} employees...")
     
     try:
-        total_employees = len(employees)
-        
         # No employees to analyze
-        if not total_employees:
+        if not employees:
             return []
         
-        # Pre-filter employees with null primary skills upfront
-        logger.info("Pre-filtering employees with null primary skills...")
-        valid_employees = []
-        for employee in employees:
-            if not employee.skills or any(not skill.skillName or skill.skillName.lower() == "none" for skill in employee.skills):
-                logger.debug(f"Pre-filtering: Skipping employee {employee.empCode} due to null or invalid primary skills")
-                continue
-            valid_employees.append(employee)
-        
-        filtered_count = total_employees - len(valid_employees)
-        logger.info(f"Pre-filtered {filtered_count} employees with null primary skills. Proceeding with {len(valid_employees)} valid employees.")
-        
-        # Filter out employees whose primary skills don't exist in project requirements
-        logger.info("Filtering employees whose primary skills don't match project requirements...")
-        required_skills = set([skill.lower() for skill in project_requirement.required_skills.tech_stack])
-        matching_skill_employees = []
-        
-        for employee in valid_employees:
-            employee_skills = set([skill.skillName.lower() for skill in employee.skills if skill.skillName])
-            # Check if any of the employee's skills match any of the required skills
-            if employee_skills.intersection(required_skills):
-                matching_skill_employees.append(employee)
-            else:
-                logger.debug(f"Filtering out employee {employee.empCode} - no matching primary skills with project requirements")
-        
-        skill_filtered_count = len(valid_employees) - len(matching_skill_employees)
-        logger.info(f"Filtered out {skill_filtered_count} employees with no matching primary skills. Proceeding with {len(matching_skill_employees)} employees.")
+        matching_skill_employees = prefilter_employees(employees, project_requirement, available)
         
         # If no valid employees after filtering
         if not matching_skill_employees:
             logger.warning("No employees with matching primary skills to project requirements after filtering")
             return []
         
-        # Calculate number of batches based on valid employees
-        num_batches = math.ceil(len(matching_skill_employees) / EMPLOYEE_BATCH_SIZE)
-        logger.info(f"Processing {len(matching_skill_employees)} qualified employees in {num_batches} batches of {EMPLOYEE_BATCH_SIZE}...")
+        # Create batches from valid employees only, sized by the analyzer's token budget
+        batches = analyzer.plan_batches(matching_skill_employees)
+        logger.info(f"Processing {len(matching_skill_employees)} qualified employees in {len(batches)} token-budgeted batches...")
         
-        # Create batches from valid employees only
-        batches = []
-        for i in range(0, len(matching_skill_employees), EMPLOYEE_BATCH_SIZE):
-            batch = matching_skill_employees[i:i + EMPLOYEE_BATCH_SIZE]
-            batches.append(batch)
+        # Process batches concurrently, up to ANALYSIS_MAX_CONCURRENCY at a time
+        all_analyses = run_employee_batches(batches, analyzer, on_batch)
         
-        # Process batches sequentially (non-async alternative)
-        all_analyses = []
-        for i, batch in enumerate(batches):
-            logger.info(f"Processing batch {i+1}/{num_batches} with {len(batch)} employees")
-            batch_result = process_employee_batch(batch, analyzer)
-            all_analyses.extend(batch_result)
-            logger.info(f"Completed batch {i+1}/{num_batches}")
+        if not all_analyses:
+            logger.warning("No valid employee analyses found")
+            return []
+        
+        logger.info(f"Successfully analyzed {len(all_analyses)} employees in total")
+        return all_analyses
+        
+    except Exception as e:
+        logger.error(f"Error in batch employee analysis: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+        return []
+
+async def aanalyze_employees(employees: List[Employee], analyzer: EmployeeAnalyzer, project_requirement: ProjectRequirement, on_batch: Optional[BatchCallback] = None, available: Optional[np.ndarray] = None) -> List[Dict]:
+    """Analyze all employees in batches without blocking the event loop.
+    
+    If given, available is a mask over employees limiting who is considered.
+    on_batch is called in a worker thread.
+    """
+    logger.info(f"Starting employee analysis for {len(employees)} employees...")
+    
+    try:
+        # No employees to analyze
+        if not employees:
+            return []
+        
+        matching_skill_employees = await asyncio.to_thread(prefilter_employees, employees, project_requirement, available)
+        
+        # If no valid employees after filtering
+        if not matching_skill_employees:
+            logger.warning("No employees with matching primary skills to project requirements after filtering")
+            return []
+        
+        all_analyses = await analyze_employees_async(matching_skill_employees, analyzer, on_batch)
         
         if not all_analyses:
             logger.warning("No valid employee analyses found")
@@ -220,181 +409,264 @@ def match_employees(state: Dict) -> Dict:
         state["matches"] = []
         return state
 
-def run_workflow(project_requirement: ProjectRequirement) -> Dict:
-    """Run the complete workflow."""
+def _emit(on_event: Optional[WorkflowEventCallback], event: str, data: Dict) -> None:
+    """Report workflow progress to an optional listener without letting it break the run."""
+    if on_event is None:
+        return
+    try:
+        on_event(event, data)
+    except Exception as e:
+        logger.warning(f"Error reporting workflow event {event}: {str(e)}")
+
+def _build_agents() -> Tuple[EmployeeAnalyzer, MatchingAgent, WorkloadOptimizer]:
+    """Create the agents of a workflow run.
+
+    Blocking: the first call imports the LLM stack and loads the tokenizer.
+    """
+    return EmployeeAnalyzer(), MatchingAgent(), WorkloadOptimizer()
+
+def _threadsafe_events(on_event: Optional[WorkflowEventCallback]) -> Optional[WorkflowEventCallback]:
+    """Wrap an event listener so stages running in worker threads report on the running event loop."""
+    if on_event is None:
+        return None
+    loop = asyncio.get_running_loop()
+    
+    def emit(event: str, data: Dict) -> None:
+        loop.call_soon_threadsafe(_emit, on_event, event, data)
+    
+    return emit
+
+def _error_result(error: str, summary: str) -> Dict:
+    """Workflow result reporting an error."""
+    return {
+        "error": error,
+        "recommended_employees": [],
+        "selection_criteria": [],
+        "recommendation_summary": summary
+    }
+
+def _available_employees_mask(state: Dict, on_event: Optional[WorkflowEventCallback]) -> Union[np.ndarray, Dict]:
+    """Analyze requirements and mask out inactive and fully booked employees.
+    
+    Returns a mask over the roster in state["employees"], or an error result
+    instead if the workflow cannot continue.
+    """
+    # Analyze requirements
+    analyzer = RequirementAnalyzer()
+    state["requirement_analysis"] = analyzer.analyze_requirement(state["project_requirement"])
+    if not state.get("requirement_analysis"):
+        logger.error("Failed to analyze requirements")
+        return _error_result("Failed to analyze requirements", "Error occurred during requirement analysis.")
+
+    # Step 1: Use employee active status to filter out inactive employees
+    _emit(on_event, "stage", {"stage": "filtering", "employees": len(state["employees"])})
+    employee_status_list = state["employee_status_list"]
+    
+    # Explicitly check for False to handle None values
+    inactive_employees = {s.get("empCode") for s in employee_status_list if s.get("empCode") and s.get("isActive") is False}
+    if employee_status_list:
+        active_count = sum(1 for s in employee_status_list if s.get("empCode") and s.get("isActive") is True)
+        logger.info(f"Found {active_count} active employees and {len(inactive_employees)} inactive employees")
+    else:
+        logger.warning("No employee active status data available. Skipping inactive employee filtering.")
+    
+    # Step 2: Use employee bookings for workload filtering
+    employee_bookings = state["employee_bookings"]
+    
+    if not employee_bookings:
+        logger.warning("No employee bookings found, continuing with active employee filtering only")
+    else:
+        logger.info(f"Retrieved {len(employee_bookings)} employee bookings")
+    
+    # Extract employee codes from bookings where dailyHour > 6
+    high_workload_bookings = [b["empCode"] for b in employee_bookings if b.get("empCode") and b.get("dailyHour", 0) > 6.0]
+    high_workload_employees = set(high_workload_bookings)
+    logger.info(f"Found {len(high_workload_bookings)} bookings with dailyHour > 6")
+    logger.info(f"Found {len(high_workload_employees)} unique employees with dailyHour > 6")
+
+    # Step 3: Apply both filters over the roster index
+    index = get_roster_index(state["employees"])
+    inactive = index.codes_mask(inactive_employees)
+    high_workload = index.codes_mask(high_workload_employees) & ~inactive
+    available = ~(inactive | high_workload)
+    available_count = int(np.count_nonzero(available))
+    
+    logger.info(f"Filtered from {len(index)} total employees:")
+    logger.info(f"- Removed {int(np.count_nonzero(inactive))} inactive employees")
+    logger.info(f"- Removed {int(np.count_nonzero(high_workload))} high workload employees")
+    logger.info(f"- Remaining {available_count} employees after initial filtering")
+    
+    if not available_count:
+        return _error_result(
+            "No available employees found",
+            "No active employees with suitable workload are available for the project."
+        )
+    return available
+
+def _provisional_ranking(
+    on_event: Optional[WorkflowEventCallback],
+    matcher: MatchingAgent,
+    optimizer: WorkloadOptimizer,
+    project_requirement: ProjectRequirement
+) -> Optional[BatchCallback]:
+    """Batch callback streaming a provisional deterministic ranking as analyses complete."""
+    if on_event is None:
+        return None
+    analyzed_so_far = ScoringMatrix()
+    
+    def on_batch(index, total, batch_analyses, elapsed):
+        _emit(on_event, "batch_analyzed", {
+            "batch": index + 1,
+            "total_batches": total,
+            "analyses": len(batch_analyses),
+            "latency_seconds": round(elapsed, 3),
+        })
+        analyzed_so_far.extend(batch_analyses)
+        provisional = optimizer.optimize_workload(
+            matcher.score_matches(analyzed_so_far, project_requirement, limit=settings.STREAM_PROVISIONAL_LIMIT)
+        )
+        _emit(on_event, "candidates", {
+            "provisional": True,
+            "analyzed": len(analyzed_so_far),
+            "recommended_employees": provisional["recommended_employees"][:settings.STREAM_PROVISIONAL_LIMIT],
+        })
+    
+    return on_batch
+
+def _shortlist_candidates(
+    matcher: MatchingAgent,
+    employee_analyses: List[Dict],
+    project_requirement: ProjectRequirement,
+    on_event: Optional[WorkflowEventCallback]
+) -> List[Dict]:
+    """Pre-rank analyzed employees and keep the shortlist for LLM matching."""
+    candidates, diagnostics = matcher.shortlist(employee_analyses, project_requirement)
+    _emit(on_event, "shortlist", diagnostics)
+    _emit(on_event, "stage", {"stage": "matching", "employees": len(candidates)})
+    return candidates
+
+def run_workflow(project_requirement: ProjectRequirement, on_event: Optional[WorkflowEventCallback] = None) -> Dict:
+    """Run the complete workflow.
+    
+    If on_event is given, it receives progress events as they happen: "stage" when
+    a workflow stage starts, "batch_analyzed" when an analysis batch finishes,
+    "candidates" with a provisional ranking of everyone analyzed so far and
+    "shortlist" with recall diagnostics of the candidates sent to the LLM matcher.
+    """
     try:
         # Initialize state
+        _emit(on_event, "stage", {"stage": "loading_data"})
         state = initialize_workflow(project_requirement)
         if not state:
             logger.error("Failed to initialize workflow")
-            return {
-                "error": "Failed to initialize workflow",
-                "recommended_employees": [],
-                "selection_criteria": [],
-                "recommendation_summary": "Error occurred during workflow initialization."
-            }
-
-        # Analyze requirements
-        analyzer = RequirementAnalyzer()
-        state["requirement_analysis"] = analyzer.analyze_requirement(state["project_requirement"])
-        if not state.get("requirement_analysis"):
-            logger.error("Failed to analyze requirements")
-            return {
-                "error": "Failed to analyze requirements",
-                "recommended_employees": [],
-                "selection_criteria": [],
-                "recommendation_summary": "Error occurred during requirement analysis."
-            }
-
-        # Use the API service instance stored in state
-        api_service = state["api_service"]  # Reuse the instance created in initialize_workflow
-        
-        # Step 1: Get employee active status and filter out inactive employees
-        logger.info("Fetching employee active status...")
-        employee_status_list = api_service.get_employee_active_status()
-        
-        # Create a set of inactive employee codes for quick lookup
-        inactive_employees = set()
-        active_count = 0
-        inactive_count = 0
-        
-        if employee_status_list:
-            for emp_status in employee_status_list:
-                emp_code = emp_status.get("empCode")
-                is_active = emp_status.get("isActive")
-                
-                if emp_code and is_active is False:  # Explicitly check for False to handle None values
-                    inactive_employees.add(emp_code)
-                    inactive_count += 1
-                elif emp_code and is_active is True:
-                    active_count += 1
-            
-            logger.info(f"Found {active_count} active employees and {inactive_count} inactive employees")
-        else:
-            logger.warning("No employee active status data available. Skipping inactive employee filtering.")
-        
-        # Step 2: Get employee bookings for workload filtering
-        project_start_date = state["project_requirement"].start_date
-        
-        # Ensure project_start_date is naive for consistent comparison
-        if hasattr(project_start_date, 'tzinfo') and project_start_date.tzinfo is not None:
-            # Convert to naive UTC
-            project_start_date = project_start_date.replace(tzinfo=None)
-            
-        logger.info(f"Fetching employee bookings for project start date: {project_start_date}")
-        
-        employee_bookings = api_service.get_employee_bookings(project_start_date)
-        
-        if not employee_bookings:
-            logger.warning("No employee bookings found, continuing with active employee filtering only")
-        else:
-            logger.info(f"Retrieved {len(employee_bookings)} employee bookings")
-        
-        # Extract employee codes from bookings where dailyHour > 6
-        high_workload_employees = set()
-        high_workload_count = 0
-        
-        for booking in employee_bookings:
-            emp_code = booking.get("empCode")
-            daily_hour = booking.get("dailyHour", 0)
-            
-            # Check if dailyHour > 6.0
-            if emp_code and daily_hour > 6.0:
-                high_workload_employees.add(emp_code)
-                high_workload_count += 1
-                
-        logger.info(f"Found {high_workload_count} bookings with dailyHour > 6")
-        logger.info(f"Found {len(high_workload_employees)} unique employees with dailyHour > 6")
-
-        # Step 3: Apply both filters to get available employees
-        all_employees = state["employees"]
-        
-        # Filter out both inactive and high workload employees
-        filtered_employees = []
-        inactive_filtered_count = 0
-        high_workload_filtered_count = 0
-        
-        for emp in all_employees:
-            if emp.empCode in inactive_employees:
-                inactive_filtered_count += 1
-                logger.debug(f"Filtering out inactive employee: {emp.empCode}")
-                continue
-            if emp.empCode in high_workload_employees:
-                high_workload_filtered_count += 1
-                logger.debug(f"Filtering out high workload employee: {emp.empCode}")
-                continue
-            filtered_employees.append(emp)
-        
-        logger.info(f"Filtered from {len(all_employees)} total employees:")
-        logger.info(f"- Removed {inactive_filtered_count} inactive employees")
-        logger.info(f"- Removed {high_workload_filtered_count} high workload employees")
-        logger.info(f"- Remaining {len(filtered_employees)} employees after initial filtering")
-        
-        if not filtered_employees:
-            return {
-                "error": "No available employees found",
-                "recommended_employees": [],
-                "selection_criteria": [],
-                "recommendation_summary": "No active employees with suitable workload are available for the project."
-            }
+            return _error_result("Failed to initialize workflow", "Error occurred during workflow initialization.")
+
+        available = _available_employees_mask(state, on_event)
+        if isinstance(available, dict):
+            return available
         
         # Create analyzer instance and analyze available employees using batch processing
-        employee_analyzer = EmployeeAnalyzer()
+        employee_analyzer, matcher, optimizer = _build_agents()
+        _emit(on_event, "stage", {"stage": "analyzing", "employees": int(np.count_nonzero(available))})
+        on_batch = _provisional_ranking(on_event, matcher, optimizer, project_requirement)
         
         # Pass project_requirement to analyze_employees to enable skill filtering
-        employee_analyses = analyze_employees(filtered_employees, employee_analyzer, project_requirement)
+        employee_analyses = analyze_employees(state["employees"], employee_analyzer, project_requirement, on_batch, available)
         
         if not employee_analyses:
-            return {
-                "error": "No valid employee analyses",
-                "recommended_employees": [],
-                "selection_criteria": [],
-                "recommendation_summary": "No employees with matching skills were found for the project requirements."
-            }
+            return _error_result(
+                "No valid employee analyses",
+                "No employees with matching skills were found for the project requirements."
+            )
             
         # Update state with analyses
         state["employee_analyses"] = employee_analyses
         logger.info(f"Successfully analyzed {len(employee_analyses)} employees")
 
         # Match employees
-        matcher = MatchingAgent()
+        candidates = _shortlist_candidates(matcher, employee_analyses, project_requirement, on_event)
         matches = matcher.evaluate_matches(
-            employee_analyses,
+            candidates,
             state["requirement_analysis"],
             state["project_requirement"]
         )
-        
-        if not matches:
-            logger.info("No matches found, ending workflow")
-            return {
-                "error": "No matches found",
-                "recommended_employees": [],
-                "selection_criteria": [],
-                "recommendation_summary": "No suitable matches were found for the project requirements."
-            }
-            
-        state["matches"] = matches
-        logger.info(f"Found {len(matches)} potential matches")
+        return _optimize_matches(state, matches, optimizer, on_event)
+
+    except Exception as e:
+        logger.error(f"Error running workflow: {str(e)}")
+        return _error_result(str(e), f"An error occurred: {str(e)}")
+
+async def arun_workflow(project_requirement: ProjectRequirement, on_event: Optional[WorkflowEventCallback] = None) -> Dict:
+    """Run the complete workflow without blocking the event loop.
+    
+    Upstream data is loaded on the shared upstream HTTP loop, LLM calls are
+    awaited and the CPU-bound stages (filtering, pre-ranking and scoring) run in
+    worker threads, so many workflows can run concurrently on one event loop.
+    Emits the same events as run_workflow, on the event loop.
+    """
+    try:
+        # Initialize state
+        _emit(on_event, "stage", {"stage": "loading_data"})
+        state = await ainitialize_workflow(project_requirement)
+        if not state:
+            logger.error("Failed to initialize workflow")
+            return _error_result("Failed to initialize workflow", "Error occurred during workflow initialization.")
 
-        # Optimize workload
-        optimizer = WorkloadOptimizer()
-        recommendations = optimizer.optimize_workload(matches)
+        events = _threadsafe_events(on_event)
+        available = await asyncio.to_thread(_available_employees_mask, state, events)
+        if isinstance(available, dict):
+            return available
+        
+        # Create analyzer instance and analyze available employees using batch processing;
+        # building the agents may load the LLM stack and tokenizer
+        employee_analyzer, matcher, optimizer = await asyncio.to_thread(_build_agents)
+        _emit(on_event, "stage", {"stage": "analyzing", "employees": int(np.count_nonzero(available))})
+        on_batch = _provisional_ranking(events, matcher, optimizer, project_requirement)
         
-        if not recommendations:
-            return {
-                "error": "Optimization failed",
-                "recommended_employees": [],
-                "selection_criteria": [],
-                "recommendation_summary": "Failed to optimize workload distribution."
-            }
+        employee_analyses = await aanalyze_employees(state["employees"], employee_analyzer, project_requirement, on_batch, available)
         
-        return recommendations
+        if not employee_analyses:
+            return _error_result(
+                "No valid employee analyses",
+                "No employees with matching skills were found for the project requirements."
+            )
+            
+        # Update state with analyses
+        state["employee_analyses"] = employee_analyses
+        logger.info(f"Successfully analyzed {len(employee_analyses)} employees")
+
+        # Match employees
+        candidates = await asyncio.to_thread(_shortlist_candidates, matcher, employee_analyses, project_requirement, events)
+        matches = await matcher.aevaluate_matches(
+            candidates,
+            state["requirement_analysis"],
+            state["project_requirement"]
+        )
+        return await asyncio.to_thread(_optimize_matches, state, matches, optimizer, events)
 
     except Exception as e:
         logger.error(f"Error running workflow: {str(e)}")
-        return {
-            "error": str(e),
-            "recommended_employees": [],
-            "selection_criteria": [],
-            "recommendation_summary": f"An error occurred: {str(e)}"
-        }
\ No newline at end of file
+        return _error_result(str(e), f"An error occurred: {str(e)}")
+
+def _optimize_matches(
+    state: Dict,
+    matches: List[Dict],
+    optimizer: WorkloadOptimizer,
+    on_event: Optional[WorkflowEventCallback]
+) -> Dict:
+    """Turn evaluated matches into the final recommendations."""
+    if not matches:
+        logger.info("No matches found, ending workflow")
+        return _error_result("No matches found", "No suitable matches were found for the project requirements.")
+        
+    state["matches"] = matches
+    logger.info(f"Found {len(matches)} potential matches")
+
+    # Optimize workload
+    _emit(on_event, "stage", {"stage": "optimizing", "matches": len(matches)})
+    recommendations = optimizer.optimize_workload(matches)
+    
+    if not recommendations:
+        return _error_result("Optimization failed", "Failed to optimize workload distribution.")
+    
+    return recommendations
@@ -1,4 +1,5 @@
 """Pydantic schemas for project-related requests and responses."""
+from datetime import datetime
 from typing import List, Optional
 from pydantic import BaseModel, Field
 
@@ -29,4 +30,16 @@ class MatchingResponse(BaseModel):
     recommended_employees: List[EmployeeMatchResponse]
     selection_criteria: List[str]
     recommendation_summary: str
-    error: Optional[str] = None 
\ No newline at end of file
+    error: Optional[str] = None
+
+
+class MatchJobResponse(BaseModel):
+    """Response model for a background matching job."""
+    job_id: str
+    status: str = Field(..., description="One of queued, running, succeeded, failed or cancelled.")
+    stage: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[MatchingResponse] = None
+    error: Optional[str] = None
@@ -1,8 +1,5 @@
-from typing import List, Dict
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
-from langchain_core.pydantic_v1 import BaseModel, Field
+from typing import List, Dict, Optional, Tuple, Union
+from pydantic import BaseModel, Field
 from app.models.models import (
     Employee,
     ProjectRequirement,
@@ -10,12 +7,29 @@ from app.models.models import (
     BusinessDomain,
     AdditionalSkill,
 )
+from app.core.config import settings
+from app.services.batching import TokenBudgetPacker, count_tokens
+from app.services.llm_cache import llm_cache
+from app.services.llm_flow import CALL, INVOKE, SLEEP, Flow, arun_flow, run_flow
+from app.services.llm_registry import llm_registry
+from app.services.parser import RequirementsParserService
+from app.services.scoring import MIN_MATCH_SCORE, ScoringMatrix, resolve_required, shortlist, top_k
+from app.services.vocabulary import domain_vocabulary, skill_vocabulary
+import asyncio
+import json
 import logging
+import math
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Bump when a prompt below changes so cached responses are not reused
+ANALYZER_PROMPT_VERSION = "1"
+MATCHER_PROMPT_VERSION = "1"
+
 
 class RequirementAnalysisSchema(BaseModel):
     """Schema for requirement analysis output."""
@@ -106,6 +120,18 @@ class WorkloadOptimizationSchema(BaseModel):
     )
 
 
+def prewarm_llm_stack() -> None:
+    """Import the LLM client libraries and load the tokenizer ahead of the first request."""
+    start = time.perf_counter()
+    try:
+        EmployeeAnalyzer()
+        MatchingAgent()
+        RequirementsParserService()
+        logger.info(f"LLM stack pre-warmed in {time.perf_counter() - start:.2f}s")
+    except Exception as e:
+        logger.error(f"Error pre-warming the LLM stack: {str(e)}")
+
+
 class RequirementAnalyzer:
     """Analyzes project requirements to determine key aspects and needs."""
 
@@ -116,19 +142,15 @@ class RequirementAnalyzer:
             "technical_complexity": {
                 "frontend": {
                     "description": "Frontend technical requirements",
-                    "requirements": [
-                        skill
-                        for skill in requirement.required_skills.tech_stack
-                        if skill in ["React", "Angular", "JavaScript", "Vue"]
-                    ],
+                    "requirements": skill_vocabulary.in_category(
+                        requirement.required_skills.tech_stack, "frontend"
+                    ),
                 },
                 "backend": {
                     "description": "Backend technical requirements",
-                    "requirements": [
-                        skill
-                        for skill in requirement.required_skills.tech_stack
-                        if skill in [".NET", "Java", "Python", "Node.js"]
-                    ],
+                    "requirements": skill_vocabulary.in_category(
+                        requirement.required_skills.tech_stack, "backend"
+                    ),
                 },
             },
             "domain_knowledge_requirements": [
@@ -160,16 +182,16 @@ class RequirementAnalyzer:
         }
 
 
-class EmployeeAnalyzer:
-    def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4o", temperature=0.1)
-        self.parser = JsonOutputParser()
-
-        self.analysis_prompt = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    """You are an expert at analyzing employee profiles.
+def _analysis_chain() -> Tuple:
+    """Build the analyzer prompt and output parser."""
+    from langchain_core.output_parsers import JsonOutputParser
+    from langchain_core.prompts import ChatPromptTemplate
+
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                """You are an expert at analyzing employee profiles.
             Analyze the provided employee profiles and extract key information about their skills,
             experience level, and domain expertise.
             
@@ -192,12 +214,32 @@ class EmployeeAnalyzer:
             
             Return an array of these objects, one for each employee profile provided.
             """,
-                ),
-                ("human", "{employee_profile}"),
-            ]
-        )
+            ),
+            ("human", "{employee_profile}"),
+        ]
+    )
+    return prompt, JsonOutputParser()
 
-        self.chain = self.analysis_prompt | self.llm | self.parser
+
+class EmployeeAnalyzer:
+    def __init__(self):
+        prepared = llm_registry.chain("analyzer", _analysis_chain, ANALYZER_PROMPT_VERSION)
+        self.llm = prepared.llm
+        self.parser = prepared.parser
+        self.analysis_prompt = prepared.prompt
+        self.chain = prepared.chain
+
+        self.packer = TokenBudgetPacker(
+            model=self.llm.model_name,
+            max_input_tokens=settings.ANALYSIS_BATCH_MAX_INPUT_TOKENS,
+            max_output_tokens=settings.ANALYSIS_BATCH_MAX_OUTPUT_TOKENS,
+            output_tokens_base=settings.ANALYSIS_OUTPUT_TOKENS_BASE,
+            output_tokens_ratio=settings.ANALYSIS_OUTPUT_TOKENS_RATIO,
+            max_items=settings.ANALYSIS_BATCH_MAX_PROFILES,
+            prompt_overhead_tokens=count_tokens(
+                self.analysis_prompt.format(employee_profile=""), self.llm.model_name
+            ),
+        )
 
     def analyze_employee(self, employee: Employee) -> Dict:
         """Analyze an employee's profile."""
@@ -230,19 +272,20 @@ class EmployeeAnalyzer:
             # Return a basic analysis based on available data
             return self._fallback_analysis(employee)
 
-    def _format_employee_profile(self, employee: Employee) -> str:
+    @staticmethod
+    def _format_employee_profile(employee: Employee) -> str:
         """Format employee profile with validation."""
         try:
             # Validate and format skills
-            skills_str = self._format_skills(employee.skills)
+            skills_str = EmployeeAnalyzer._format_skills(employee.skills)
             if skills_str == "No skills information available":
                 return None
 
             # Validate and format domains
-            domains_str = self._format_domains(employee.businessDomains)
+            domains_str = EmployeeAnalyzer._format_domains(employee.businessDomains)
 
             # Format additional skills (optional)
-            additional_skills_str = self._format_additional_skills(
+            additional_skills_str = EmployeeAnalyzer._format_additional_skills(
                 employee.additionalSkills
             )
 
@@ -268,7 +311,8 @@ class EmployeeAnalyzer:
             )
             return None
 
-    def _format_skills(self, skills: List[Skill]) -> str:
+    @staticmethod
+    def _format_skills(skills: List[Skill]) -> str:
         """Format skills for display with validation."""
         try:
             if not skills:
@@ -305,7 +349,8 @@ class EmployeeAnalyzer:
             logger.error(f"Error formatting skills: {str(e)}")
             return "No skills information available"
 
-    def _format_domains(self, domains: List[BusinessDomain]) -> str:
+    @staticmethod
+    def _format_domains(domains: List[BusinessDomain]) -> str:
         """Format business domains for display (optional)."""
         try:
             if not domains:
@@ -322,7 +367,8 @@ class EmployeeAnalyzer:
             logger.error(f"Error formatting domains: {str(e)}")
             return "No domain information available"
 
-    def _format_additional_skills(self, skills: List[AdditionalSkill]) -> str:
+    @staticmethod
+    def _format_additional_skills(skills: List[AdditionalSkill]) -> str:
         """Format additional skills for display (optional)."""
         try:
             if not skills:
@@ -394,53 +440,30 @@ class EmployeeAnalyzer:
 
     def analyze_employees(self, employees: List[Employee]) -> List[Dict]:
         """Analyze a batch of pre-filtered employees."""
+        return run_flow(self._analysis_flow(employees), self.chain.invoke)
+
+    async def aanalyze_employees(self, employees: List[Employee]) -> List[Dict]:
+        """Analyze a batch of pre-filtered employees without blocking the event loop."""
+        return await arun_flow(self._analysis_flow(employees), self.chain.ainvoke)
+
+    def _analysis_flow(self, employees: List[Employee]) -> Flow:
+        """Format, split and analyze a batch of employee profiles."""
         try:
             logger.info(f"Analyzing a batch of {len(employees)} pre-filtered employees")
 
-            # Format all employee profiles at once
-            profiles = []
-            employee_additional_skills = {}  # Store additional skills for each employee
-
-            for employee in employees:
-                profile = self._format_employee_profile(employee)
-                if profile:
-                    # Extract additional skills
-                    additional_skills = [
-                        skill.additionalSkillName
-                        for skill in employee.additionalSkills
-                        if skill.additionalSkillName
-                        and skill.additionalSkillName.lower() != "none"
-                    ]
-                    employee_additional_skills[employee.empCode] = additional_skills
-
-                    profiles.append(
-                        {"employee_code": employee.empCode, "profile": profile}
-                    )
-
+            # Formatting and token counting are CPU work
+            profiles, employee_additional_skills = yield CALL, lambda: self._prepare_profiles(employees)
             if not profiles:
                 logger.warning("No valid profiles to format in this batch")
                 return []
 
-            # Check if batch is too large for LLM context
-            if len(profiles) > 50:
-                logger.warning(
-                    f"Batch size of {len(profiles)} profiles is too large. Splitting into smaller batches."
+            all_results = []
+            sub_batches = yield CALL, lambda: self._split_profiles(profiles)
+            for sub_batch in sub_batches:
+                all_results.extend(
+                    (yield from self._profile_batch_flow(sub_batch, employee_additional_skills))
                 )
-                # Split into smaller batches of 25 employees each
-                all_results = []
-                for i in range(0, len(profiles), 25):
-                    sub_batch = profiles[i : i + 25]
-                    logger.info(
-                        f"Processing sub-batch {i//25 + 1} with {len(sub_batch)} employees"
-                    )
-                    sub_results = self._process_profile_batch(
-                        sub_batch, employee_additional_skills
-                    )
-                    all_results.extend(sub_results)
-                return all_results
-
-            # Process the batch if it's a reasonable size
-            return self._process_profile_batch(profiles, employee_additional_skills)
+            return all_results
 
         except Exception as e:
             logger.error(f"Error in batch employee analysis: {str(e)}")
@@ -449,65 +472,72 @@ class EmployeeAnalyzer:
             logger.error(traceback.format_exc())
             return []
 
-    def _process_profile_batch(
+    def _prepare_profiles(self, employees: List[Employee]) -> Tuple[List[Dict], Dict]:
+        """Format employee profiles and collect each employee's additional skills."""
+        profiles = []
+        employee_additional_skills = {}  # Store additional skills for each employee
+
+        for employee in employees:
+            profile = self._format_employee_profile(employee)
+            if profile:
+                # Extract additional skills
+                additional_skills = [
+                    skill.additionalSkillName
+                    for skill in employee.additionalSkills
+                    if skill.additionalSkillName
+                    and skill.additionalSkillName.lower() != "none"
+                ]
+                employee_additional_skills[employee.empCode] = additional_skills
+
+                profiles.append({"employee_code": employee.empCode, "profile": profile})
+
+        return profiles, employee_additional_skills
+
+    def _split_profiles(self, profiles: List[Dict]) -> List[List[Dict]]:
+        """Split profiles into sub-batches if they exceed the token budget."""
+        sub_batches = self.packer.pack(profiles, self._batch_entry)
+        if len(sub_batches) > 1:
+            logger.warning(
+                f"Batch of {len(profiles)} profiles exceeds the token budget. "
+                f"Splitting into {len(sub_batches)} smaller batches."
+            )
+        return sub_batches
+
+    def plan_batches(self, employees: List[Employee]) -> List[List[Employee]]:
+        """Group employees into batches that fit the analysis token budget."""
+        profiles = []
+        for employee in employees:
+            profile = self._format_employee_profile(employee)
+            if profile:
+                profiles.append(
+                    {"employee_code": employee.empCode, "profile": profile, "employee": employee}
+                )
+
+        batches = self.packer.pack(profiles, self._batch_entry)
+        logger.info(
+            f"Packed {len(profiles)} profiles into {len(batches)} batches: "
+            f"{self.packer.describe(batches, self._batch_entry)}"
+        )
+        return [[p["employee"] for p in batch] for batch in batches]
+
+    @staticmethod
+    def _batch_entry(profile: Dict) -> str:
+        """Text a profile contributes to the combined batch prompt."""
+        return f"Employee: {profile['employee_code']}\n{profile['profile']}\n\n---\n\n"
+
+    def _profile_batch_flow(
         self, profiles: List[Dict], employee_additional_skills: Dict
-    ) -> List[Dict]:
+    ) -> Flow:
         """Process a batch of employee profiles with the LLM."""
         try:
-            # Combine all profiles into a single prompt
-            combined_profiles = (
-                "\n\n=== EMPLOYEE PROFILES ===\n\n"
-                + "\n\n---\n\n".join(
-                    f"Employee: {p['employee_code']}\n{p['profile']}" for p in profiles
+            cache_keys, analyses, uncached_profiles = yield CALL, lambda: self._lookup_cached_analyses(profiles)
+            if uncached_profiles:
+                # Get analysis from LLM for all employees at once
+                result = yield INVOKE, {"employee_profile": self._combine_profiles(uncached_profiles)}
+                analyses.extend(
+                    (yield CALL, lambda: self._store_analyses(result, uncached_profiles, cache_keys))
                 )
-            )
-
-            # Get analysis from LLM for all employees at once
-            result = self.chain.invoke({"employee_profile": combined_profiles})
-
-            # Ensure result is a list
-            analyses = result if isinstance(result, list) else [result]
-
-            # Format analyses to match expected structure
-            formatted_analyses = []
-            for analysis in analyses:
-                employee_code = analysis.get("employee_name", "")
-
-                formatted_analysis = {
-                    "employee_name": employee_code,
-                    "technical_skills": {
-                        "advanced": analysis.get("technical_skills", {}).get(
-                            "advanced", []
-                        ),
-                        "intermediate": analysis.get("technical_skills", {}).get(
-                            "intermediate", []
-                        ),
-                        "beginner": analysis.get("technical_skills", {}).get(
-                            "beginner", []
-                        ),
-                    },
-                    "domain_expertise": {
-                        "primary_domains": analysis.get("domain_expertise", {}).get(
-                            "primary_domains", []
-                        ),
-                        "secondary_domains": analysis.get("domain_expertise", {}).get(
-                            "secondary_domains", []
-                        ),
-                    },
-                    "experience_level": analysis.get("experience_level", "junior"),
-                    "key_strengths": analysis.get("key_strengths", []),
-                    "development_areas": analysis.get("development_areas", []),
-                    # Include additional skills from our dictionary
-                    "additional_skills": employee_additional_skills.get(
-                        employee_code, []
-                    ),
-                }
-                formatted_analyses.append(formatted_analysis)
-
-            logger.info(
-                f"Successfully analyzed {len(formatted_analyses)} employees in this batch"
-            )
-            return formatted_analyses
+            return self._format_analyses(analyses, employee_additional_skills)
 
         except Exception as e:
             logger.error(f"Error processing profile batch: {str(e)}")
@@ -516,17 +546,116 @@ class EmployeeAnalyzer:
             logger.error(traceback.format_exc())
             return []
 
+    def _lookup_cached_analyses(
+        self, profiles: List[Dict]
+    ) -> Tuple[Dict[str, str], List[Dict], List[Dict]]:
+        """Split profiles into cached analyses and profiles that still need the LLM."""
+        cache_keys = {
+            p["employee_code"]: llm_cache.make_key(
+                "analyzer",
+                self.llm.model_name,
+                ANALYZER_PROMPT_VERSION,
+                p["profile"],
+            )
+            for p in profiles
+        }
+        analyses = []
+        uncached_profiles = []
+        for p in profiles:
+            cached = llm_cache.get("analyzer", cache_keys[p["employee_code"]])
+            if cached is not None:
+                analyses.append(cached)
+            else:
+                uncached_profiles.append(p)
+
+        if analyses:
+            logger.info(
+                f"Using {len(analyses)} cached employee analyses, sending {len(uncached_profiles)} to LLM"
+            )
+        return cache_keys, analyses, uncached_profiles
 
-class MatchingAgent:
-    def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4o", temperature=0.1)
-        self.parser = JsonOutputParser()
-
-        self.matching_prompt = ChatPromptTemplate.from_messages(
-            [
-                (
-                    "system",
-                    """You are an expert at evaluating employee matches for projects.
+    @staticmethod
+    def _combine_profiles(profiles: List[Dict]) -> str:
+        """Combine all profiles into a single prompt."""
+        return "\n\n=== EMPLOYEE PROFILES ===\n\n" + "\n\n---\n\n".join(
+            f"Employee: {p['employee_code']}\n{p['profile']}" for p in profiles
+        )
+
+    @staticmethod
+    def _store_analyses(
+        result, uncached_profiles: List[Dict], cache_keys: Dict[str, str]
+    ) -> List[Dict]:
+        """Cache the analyses returned for uncached profiles."""
+        # Ensure result is a list
+        llm_analyses = result if isinstance(result, list) else [result]
+
+        uncached_codes = {p["employee_code"] for p in uncached_profiles}
+        for analysis in llm_analyses:
+            employee_code = analysis.get("employee_name", "")
+            if employee_code in uncached_codes:
+                llm_cache.set("analyzer", cache_keys[employee_code], analysis)
+        return llm_analyses
+
+    @staticmethod
+    def _format_analyses(
+        analyses: List[Dict], employee_additional_skills: Dict
+    ) -> List[Dict]:
+        """Format analyses to match expected structure."""
+        formatted_analyses = []
+        for analysis in analyses:
+            employee_code = analysis.get("employee_name", "")
+
+            formatted_analysis = {
+                "employee_name": employee_code,
+                "technical_skills": {
+                    "advanced": analysis.get("technical_skills", {}).get(
+                        "advanced", []
+                    ),
+                    "intermediate": analysis.get("technical_skills", {}).get(
+                        "intermediate", []
+                    ),
+                    "beginner": analysis.get("technical_skills", {}).get(
+                        "beginner", []
+                    ),
+                },
+                "domain_expertise": {
+                    "primary_domains": analysis.get("domain_expertise", {}).get(
+                        "primary_domains", []
+                    ),
+                    "secondary_domains": analysis.get("domain_expertise", {}).get(
+                        "secondary_domains", []
+                    ),
+                },
+                "experience_level": analysis.get("experience_level", "junior"),
+                "key_strengths": analysis.get("key_strengths", []),
+                "development_areas": analysis.get("development_areas", []),
+                # Include additional skills from our dictionary
+                "additional_skills": employee_additional_skills.get(
+                    employee_code, []
+                ),
+            }
+            formatted_analyses.append(formatted_analysis)
+
+        logger.info(
+            f"Successfully analyzed {len(formatted_analyses)} employees in this batch"
+        )
+        return formatted_analyses
+
+
+def _matching_chain() -> Tuple:
+    """Build the matcher prompt and output parser.
+
+    The project requirements come before the employee list, so the shards of one
+    request share their prompt prefix up to the candidates.
+    """
+    from langchain_core.output_parsers import JsonOutputParser
+    from langchain_core.prompts import ChatPromptTemplate
+
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                """You are an expert at evaluating employee matches for projects.
             Analyze the provided employee profiles and project requirements to determine the best matches.
             Consider all skills (both primary technical skills and additional skills), domain expertise, and experience level.
             
@@ -568,19 +697,27 @@ class MatchingAgent:
                     }}
                 ]
             }}""",
-                ),
-                (
-                    "human",
-                    """Project Requirements:
+            ),
+            (
+                "human",
+                """Project Requirements:
             {project_requirements}
             
             Available Employees (already filtered for availability):
             {employee_analyses}""",
-                ),
-            ]
-        )
+            ),
+        ]
+    )
+    return prompt, JsonOutputParser()
 
-        self.chain = self.matching_prompt | self.llm | self.parser
+
+class MatchingAgent:
+    def __init__(self):
+        prepared = llm_registry.chain("matcher", _matching_chain, MATCHER_PROMPT_VERSION)
+        self.llm = prepared.llm
+        self.parser = prepared.parser
+        self.matching_prompt = prepared.prompt
+        self.chain = prepared.chain
 
     def evaluate_matches(
         self,
@@ -588,10 +725,144 @@ class MatchingAgent:
         requirement_analysis: Dict,
         project_requirement: ProjectRequirement,
     ) -> List[Dict]:
-        """Evaluate all available employees at once using LLM."""
+        """Evaluate employees using LLM, scoring shards of them concurrently."""
+        try:
+            shards = self._shard(employee_analyses)
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(settings.MATCH_MAX_CONCURRENCY, len(shards))),
+                thread_name_prefix="match-shard",
+            ) as executor:
+                shard_matches = list(
+                    executor.map(
+                        lambda shard: self._evaluate_shard(shard, project_requirement),
+                        shards,
+                    )
+                )
+            return self._merge_shards(shard_matches)
+
+        except Exception as e:
+            logger.error(f"Error in LLM-based matching: {str(e)}")
+            logger.warning("Falling back to direct calculation for matching")
+            return self._fallback_evaluate_matches(
+                employee_analyses, project_requirement
+            )
+
+    async def aevaluate_matches(
+        self,
+        employee_analyses: List[Dict],
+        requirement_analysis: Dict,
+        project_requirement: ProjectRequirement,
+    ) -> List[Dict]:
+        """Evaluate employees using LLM without blocking, scoring shards concurrently."""
         try:
-            # Format project requirements
-            project_info = f"""
+            semaphore = asyncio.Semaphore(settings.MATCH_MAX_CONCURRENCY)
+
+            async def evaluate(shard: List[Dict]) -> List[Dict]:
+                async with semaphore:
+                    return await self._aevaluate_shard(shard, project_requirement)
+
+            shard_matches = await asyncio.gather(
+                *(evaluate(shard) for shard in self._shard(employee_analyses))
+            )
+            return self._merge_shards(shard_matches)
+
+        except Exception as e:
+            logger.error(f"Error in LLM-based matching: {str(e)}")
+            logger.warning("Falling back to direct calculation for matching")
+            return self._fallback_evaluate_matches(
+                employee_analyses, project_requirement
+            )
+
+    def _shard(self, employee_analyses: List[Dict]) -> List[List[Dict]]:
+        """Split candidates into shards of at most MATCH_SHARD_SIZE.
+
+        Candidates are dealt round-robin, so every shard gets a similar spread of
+        strong and weak profiles and the LLM calibrates its scores alike.
+        """
+        num_shards = max(1, math.ceil(len(employee_analyses) / settings.MATCH_SHARD_SIZE))
+        shards = [employee_analyses[i::num_shards] for i in range(num_shards)]
+        logger.info(
+            f"Evaluating {len(employee_analyses)} candidates in {num_shards} shard(s)"
+        )
+        return [shard for shard in shards if shard]
+
+    def _evaluate_shard(
+        self, shard: List[Dict], project_requirement: ProjectRequirement
+    ) -> List[Dict]:
+        """Score one shard with the LLM, retrying before falling back to the formula."""
+        return run_flow(self._shard_flow(shard, project_requirement), self.chain.invoke)
+
+    async def _aevaluate_shard(
+        self, shard: List[Dict], project_requirement: ProjectRequirement
+    ) -> List[Dict]:
+        """Score one shard with the LLM without blocking, retrying before falling back."""
+        return await arun_flow(
+            self._shard_flow(shard, project_requirement), self.chain.ainvoke
+        )
+
+    def _shard_flow(
+        self, shard: List[Dict], project_requirement: ProjectRequirement
+    ) -> Flow:
+        """Cache lookup, retried LLM call and fallback scoring of one shard."""
+        prompt_input = self._build_prompt_input(shard, project_requirement)
+        cache_key = self._cache_key(prompt_input)
+        cached = yield CALL, lambda: llm_cache.get("matcher", cache_key)
+        if cached is not None:
+            logger.info("Using cached LLM match evaluation")
+            return self._format_matches(cached, shard, project_requirement)
+
+        for attempt in range(settings.MATCH_SHARD_RETRIES + 1):
+            try:
+                result = yield INVOKE, prompt_input
+                matches = self._format_matches(result, shard, project_requirement)
+                yield CALL, lambda: llm_cache.set("matcher", cache_key, result)
+                return matches
+            except Exception as e:
+                delay = self._retry_delay(attempt, len(shard), e)
+                if delay is not None:
+                    yield SLEEP, delay
+
+        return self._fallback_evaluate_matches(shard, project_requirement)
+
+    @staticmethod
+    def _retry_delay(attempt: int, shard_size: int, error: Exception) -> Optional[float]:
+        """Backoff before retrying a failed shard, or None when out of retries."""
+        if attempt >= settings.MATCH_SHARD_RETRIES:
+            logger.error(
+                f"Error in LLM-based matching of a shard of {shard_size} candidates, "
+                f"giving up after {attempt + 1} attempts: {str(error)}"
+            )
+            return None
+        delay = settings.MATCH_SHARD_RETRY_BACKOFF * (2 ** attempt)
+        logger.warning(
+            f"Error in LLM-based matching of a shard of {shard_size} candidates "
+            f"(attempt {attempt + 1}), retrying in {delay:.1f}s: {str(error)}"
+        )
+        return delay
+
+    @staticmethod
+    def _merge_shards(shard_matches: List[List[Dict]]) -> List[Dict]:
+        """Merge shard results into one list ranked by score, one entry per employee."""
+        best: Dict[str, Dict] = {}
+        for matches in shard_matches:
+            for match in matches:
+                current = best.get(match["employee"])
+                if (
+                    current is None
+                    or match["match_details"]["match_score"]
+                    > current["match_details"]["match_score"]
+                ):
+                    best[match["employee"]] = match
+        return sorted(
+            best.values(), key=lambda x: x["match_details"]["match_score"], reverse=True
+        )
+
+    def _build_prompt_input(
+        self, employee_analyses: List[Dict], project_requirement: ProjectRequirement
+    ) -> Dict[str, str]:
+        """Format the project requirements and employee analyses for the prompt."""
+        # Format project requirements
+        project_info = f"""
             Title: {project_requirement.title}
             Required Level: {project_requirement.required_level}
             Required Skills: {', '.join(project_requirement.required_skills.tech_stack)}
@@ -599,199 +870,259 @@ class MatchingAgent:
             Start Date: {project_requirement.start_date}
             """
 
-            # Format employee analyses
-            employee_info = []
-            for analysis in employee_analyses:
-                all_skills = []
-                # Add all technical skills
-                for level, skills in analysis["technical_skills"].items():
-                    if skills:
-                        all_skills.append(f"{level.capitalize()}: {', '.join(skills)}")
-
-                # Add additional skills
-                if analysis["additional_skills"]:
-                    all_skills.append(
-                        f"Additional: {', '.join(analysis['additional_skills'])}"
-                    )
+        # Format employee analyses
+        employee_info = []
+        for analysis in employee_analyses:
+            all_skills = []
+            # Add all technical skills
+            for level, skills in analysis["technical_skills"].items():
+                if skills:
+                    all_skills.append(f"{level.capitalize()}: {', '.join(skills)}")
+
+            # Add additional skills
+            if analysis["additional_skills"]:
+                all_skills.append(
+                    f"Additional: {', '.join(analysis['additional_skills'])}"
+                )
 
-                emp_info = f"""
+            emp_info = f"""
                 Employee: {analysis['employee_name']}
                 Skills: {' | '.join(all_skills)}
                 Domain Expertise: {', '.join(analysis['domain_expertise']['primary_domains'])}
                 Experience Level: {analysis['experience_level']}
                 Key Strengths: {', '.join(analysis['key_strengths'])}
                 """
-                employee_info.append(emp_info)
-
-            logger.info(
-                f"Sending {len(employee_analyses)} employees to LLM for evaluation"
-            )
+            employee_info.append(emp_info)
 
-            # Get matches from LLM
-            result = self.chain.invoke(
-                {
-                    "project_requirements": project_info,
-                    "employee_analyses": "\n".join(employee_info),
-                }
-            )
+        logger.info(
+            f"Sending {len(employee_analyses)} employees to LLM for evaluation"
+        )
 
-            logger.info(f"LLM returned {len(result.get('matches', []))} matches")
-
-            # Process and format the results
-            matches = []
-            for match in result.get("matches", []):
-                # Debug logging to check the calculated match_score value
-                try:
-                    employee_name = match.get("employee", "Unknown")
-                    skill_fit = match.get("skill_fit", 0)
-                    domain_match = match.get("domain_match", 0)
-                    exp_match = match.get("experience_match", 0)
-                    llm_match_score = match.get("match_score", 0)
-
-                    # Recalculate based on our formula for comparison
-                    calculated_score = (
-                        skill_fit * 0.45 + exp_match * 0.4 + domain_match * 0.15
-                    )
+        return {
+            "project_requirements": project_info,
+            "employee_analyses": "\n".join(employee_info),
+        }
 
-                    logger.debug(
-                        f"LLM Match for {employee_name}: skill={skill_fit:.2f}, exp={exp_match:.2f}, domain={domain_match:.2f}"
-                    )
-                    logger.debug(
-                        f"Scores: LLM={llm_match_score:.2f}, Calculated={calculated_score:.2f}"
-                    )
+    def _cache_key(self, prompt_input: Dict[str, str]) -> str:
+        """Content address of a match evaluation prompt."""
+        return llm_cache.make_key(
+            "matcher",
+            self.llm.model_name,
+            MATCHER_PROMPT_VERSION,
+            json.dumps(prompt_input, sort_keys=True),
+        )
 
-                    # Use the calculated score instead of the LLM-provided score
-                    match_score = calculated_score
-
-                    formatted_match = {
-                        "employee": employee_name,
-                        "match_details": {
-                            "match_score": match_score,
-                            "skill_fit": skill_fit,
-                            "domain_match": domain_match,
-                            "experience_match": exp_match,
-                            "strengths": match.get("strengths", []),
-                            "concerns": match.get("concerns", []),
-                            "reasoning": match.get("reasoning", ""),
-                            "workload_assessment": "Available at project start date",
-                        },
-                    }
-                    matches.append(formatted_match)
-                except Exception as e:
-                    logger.error(f"Error processing match: {str(e)}")
+    @staticmethod
+    def _normalize_score(value) -> float:
+        """Coerce an LLM score onto 0-1, reading values above 1 as percentages."""
+        try:
+            score = float(value)
+        except (TypeError, ValueError):
+            return 0.0
+        if 1.0 < score <= 100.0:
+            score /= 100.0
+        return min(max(score, 0.0), 1.0)
+
+    def _format_matches(
+        self,
+        result: Dict,
+        shard: List[Dict],
+        project_requirement: ProjectRequirement,
+    ) -> List[Dict]:
+        """Convert a shard's LLM evaluation into match records scored by our formula.
+
+        Component scores are normalized the same way in every shard and the overall
+        score is always recomputed, so scores from different shards are comparable.
+        Employees the LLM invented are dropped, and employees it skipped are scored
+        with the deterministic formula. Raises ValueError on a malformed response.
+        """
+        if not isinstance(result, dict) or not isinstance(result.get("matches"), list):
+            raise ValueError("LLM response has no list of matches")
+        logger.info(f"LLM returned {len(result['matches'])} matches")
+
+        shard_codes = {analysis["employee_name"] for analysis in shard}
+
+        # Process and format the results
+        matches = {}
+        for match in result["matches"]:
+            # Debug logging to check the calculated match_score value
+            try:
+                employee_name = match.get("employee", "Unknown")
+                if employee_name not in shard_codes:
+                    logger.warning(f"Ignoring LLM match for unknown employee {employee_name}")
+                    continue
+                if employee_name in matches:
                     continue
+                skill_fit = self._normalize_score(match.get("skill_fit", 0))
+                domain_match = self._normalize_score(match.get("domain_match", 0))
+                exp_match = self._normalize_score(match.get("experience_match", 0))
+                llm_match_score = self._normalize_score(match.get("match_score", 0))
+
+                # Recalculate based on our formula for comparison
+                calculated_score = (
+                    skill_fit * 0.45 + exp_match * 0.4 + domain_match * 0.15
+                )
 
-            return matches
+                logger.debug(
+                    f"LLM Match for {employee_name}: skill={skill_fit:.2f}, exp={exp_match:.2f}, domain={domain_match:.2f}"
+                )
+                logger.debug(
+                    f"Scores: LLM={llm_match_score:.2f}, Calculated={calculated_score:.2f}"
+                )
 
-        except Exception as e:
-            logger.error(f"Error in LLM-based matching: {str(e)}")
-            logger.warning("Falling back to direct calculation for matching")
-            return self._fallback_evaluate_matches(
-                employee_analyses, project_requirement
+                # Use the calculated score instead of the LLM-provided score
+                match_score = calculated_score
+
+                formatted_match = {
+                    "employee": employee_name,
+                    "match_details": {
+                        "match_score": match_score,
+                        "skill_fit": skill_fit,
+                        "domain_match": domain_match,
+                        "experience_match": exp_match,
+                        "strengths": match.get("strengths", []),
+                        "concerns": match.get("concerns", []),
+                        "reasoning": match.get("reasoning", ""),
+                        "workload_assessment": "Available at project start date",
+                    },
+                }
+                matches[employee_name] = formatted_match
+            except Exception as e:
+                logger.error(f"Error processing match: {str(e)}")
+                continue
+
+        missing = [a for a in shard if a["employee_name"] not in matches]
+        if missing:
+            logger.warning(
+                f"LLM skipped {len(missing)} of {len(shard)} candidates, scoring them with the formula"
             )
+            for match in self.score_matches(missing, project_requirement):
+                matches.setdefault(match["employee"], match)
+
+        return list(matches.values())
+
+    def shortlist(
+        self, employee_analyses: List[Dict], project_requirement: ProjectRequirement
+    ) -> Tuple[List[Dict], Dict]:
+        """Keep the candidates worth evaluating with the LLM, ranked by the formula.
+
+        Returns the shortlisted analyses and recall diagnostics against the full
+        deterministic ranking.
+        """
+        matrix = ScoringMatrix(employee_analyses)
+        required_skills, other_skills = resolve_required(
+            skill_vocabulary, project_requirement.required_skills.tech_stack
+        )
+        required_domains, other_domains = resolve_required(
+            domain_vocabulary, project_requirement.required_skills.domains
+        )
+        scores = matrix.score(
+            required_skills, required_domains, other_skills, other_domains
+        )[0]
+        size = settings.MATCH_SHORTLIST_SIZE
+        if not settings.MATCH_SHORTLIST_ENABLED:
+            size = len(matrix)
+        selected, diagnostics = shortlist(
+            matrix,
+            scores,
+            required_skills,
+            size=size,
+            diversity_margin=settings.MATCH_SHORTLIST_DIVERSITY_MARGIN,
+        )
+        logger.info(
+            f"Shortlisted {diagnostics['shortlisted']} of {diagnostics['candidates']} candidates "
+            f"for LLM matching ({diagnostics['diversity_added']} for diversity); "
+            f"{diagnostics['qualified_shortlisted']}/{diagnostics['qualified_total']} employees "
+            f"scoring {MIN_MATCH_SCORE:.0%}+ kept (recall {diagnostics['qualified_recall']:.2f}), "
+            f"cutoff {diagnostics['cutoff_score']}, diversity scores {diagnostics['diversity_scores']}, "
+            f"best excluded {diagnostics['best_excluded_score']}"
+        )
+        return [matrix.analyses[i] for i in selected], diagnostics
 
     def _fallback_evaluate_matches(
         self, employee_analyses: List[Dict], project_requirement: ProjectRequirement
     ) -> List[Dict]:
         """Fallback method using direct calculation if LLM fails."""
         logger.info("Using fallback calculation for matching")
-        matches = []
-        for analysis in employee_analyses:
-            try:
-                # Extract required skills and domains
-                required_skills = set(project_requirement.required_skills.tech_stack)
-                required_domains = set(project_requirement.required_skills.domains)
-
-                # Extract all employee skills (primary + additional)
-                employee_skills = set()
-                # Add primary skills from all levels
-                for level in ["advanced", "intermediate", "beginner"]:
-                    employee_skills.update(analysis["technical_skills"][level])
-                # Add additional skills
-                employee_skills.update(analysis["additional_skills"])
-
-                employee_domains = set(analysis["domain_expertise"]["primary_domains"])
-
-                # Calculate skill match score
-                skill_match = (
-                    len(required_skills & employee_skills) / len(required_skills)
-                    if required_skills
-                    else 1.0
-                )
+        return self.score_matches(employee_analyses, project_requirement)
 
-                # Calculate domain match score - binary scoring
-                matching_domains = required_domains & employee_domains
-                # If there's at least one exact match, calculate proportion, otherwise 0
-                if matching_domains:
-                    domain_match = len(matching_domains) / len(required_domains)
-                else:
-                    domain_match = 0.0
-
-                # Calculate experience match
-                exp_levels = {
-                    "senior": 1.0,
-                    "intermediate": 0.7,
-                    "junior": 0.4,
-                    "fresher": 0.2,
-                }
-                exp_match = exp_levels.get(analysis["experience_level"].lower(), 0.5)
+    def score_matches(
+        self,
+        employee_analyses: Union[List[Dict], ScoringMatrix],
+        project_requirement: ProjectRequirement,
+        limit: Optional[int] = None,
+    ) -> List[Dict]:
+        """Score and rank employees with the deterministic formula, without the LLM.
+
+        Accepts analyses or a prebuilt ScoringMatrix of them, and returns the best
+        ``limit`` matches (all by default), highest score first.
+        """
+        # Extract required skills and domains as vocabulary IDs, so aliases match
+        required_skills, other_skills = resolve_required(
+            skill_vocabulary, project_requirement.required_skills.tech_stack
+        )
+        required_domains, other_domains = resolve_required(
+            domain_vocabulary, project_requirement.required_skills.domains
+        )
+        required_domain_names = ", ".join(
+            domain_vocabulary.canonical_names(project_requirement.required_skills.domains)
+        )
 
-                # Calculate overall match score with updated weights
-                # Skill: 45%, Experience: 40%, Domain: 15%
-                match_score = skill_match * 0.45 + exp_match * 0.4 + domain_match * 0.15
+        matrix = (
+            employee_analyses
+            if isinstance(employee_analyses, ScoringMatrix)
+            else ScoringMatrix(employee_analyses)
+        )
+        scores, skill_fits, domain_matches, exp_matches = matrix.score(
+            required_skills, required_domains, other_skills, other_domains
+        )
 
-                # Debug log for this specific issue
-                logger.debug(
-                    f"Match calculation for {analysis['employee_name']}: skill={skill_match:.2f}, exp={exp_match:.2f}, domain={domain_match:.2f}, total={match_score:.2f}"
-                )
+        matches = []
+        for i in top_k(scores, limit):
+            analysis = matrix.analyses[i]
+            match_score = float(scores[i])
+            skill_match = float(skill_fits[i])
+            domain_match = float(domain_matches[i])
+            exp_match = float(exp_matches[i])
+
+            # Debug log for this specific issue
+            logger.debug(
+                f"Match calculation for {analysis['employee_name']}: skill={skill_match:.2f}, exp={exp_match:.2f}, domain={domain_match:.2f}, total={match_score:.2f}"
+            )
 
-                # Prepare concerns list based on scores
-                concerns = []
-                if domain_match == 0:
-                    concerns.append(
-                        f"No domain expertise in {', '.join(required_domains)}"
-                    )
-                if exp_match == 0:
-                    concerns.append(
-                        "Experience level not aligned with project requirements"
-                    )
-                if skill_match < 0.5:
-                    concerns.append(f"Limited skill match with required technologies")
-
-                matches.append(
-                    {
-                        "employee": analysis["employee_name"],
-                        "match_details": {
-                            "match_score": match_score,
-                            "skill_fit": skill_match,
-                            "domain_match": domain_match,
-                            "experience_match": exp_match,
-                            "strengths": [
-                                f"Skill match: {skill_match:.0%}",
-                                f"Domain match: {domain_match:.0%}",
-                                f"Experience match: {exp_match:.0%}",
-                            ],
-                            "concerns": concerns,
-                            "reasoning": "Score based on direct skill and domain matching (fallback calculation)",
-                            "workload_assessment": "Available at project start date",
-                        },
-                    }
-                )
-            except Exception as e:
-                logger.error(
-                    f"Error in fallback matching for {analysis.get('employee_name', 'unknown')}: {str(e)}"
-                )
-                continue
+            # Prepare concerns list based on scores
+            concerns = []
+            if domain_match == 0:
+                concerns.append(f"No domain expertise in {required_domain_names}")
+            if exp_match == 0:
+                concerns.append("Experience level not aligned with project requirements")
+            if skill_match < 0.5:
+                concerns.append(f"Limited skill match with required technologies")
 
-        return sorted(
-            matches, key=lambda x: x["match_details"]["match_score"], reverse=True
-        )
+            matches.append(
+                {
+                    "employee": analysis["employee_name"],
+                    "match_details": {
+                        "match_score": match_score,
+                        "skill_fit": skill_match,
+                        "domain_match": domain_match,
+                        "experience_match": exp_match,
+                        "strengths": [
+                            f"Skill match: {skill_match:.0%}",
+                            f"Domain match: {domain_match:.0%}",
+                            f"Experience match: {exp_match:.0%}",
+                        ],
+                        "concerns": concerns,
+                        "reasoning": "Score based on direct skill and domain matching (fallback calculation)",
+                        "workload_assessment": "Available at project start date",
+                    },
+                }
+            )
 
+        return matches
 
-class WorkloadOptimizer:
-    def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-4o", temperature=0.1)
 
+class WorkloadOptimizer:
     def optimize_workload(self, matches: List[Dict]) -> Dict:
         """Optimize workload distribution for project matches."""
         logger.info(f"Optimizing workload for {len(matches)} matches")
@@ -806,11 +1137,10 @@ class WorkloadOptimizer:
         )
 
         # Filter matches based on minimum score threshold (40%)
-        min_score_threshold = 0.4
         qualified_matches = [
             match
             for match in sorted_matches
-            if match["match_details"]["match_score"] >= min_score_threshold
+            if match["match_details"]["match_score"] >= MIN_MATCH_SCORE
         ]
 
         logger.info(f"Found {len(qualified_matches)} matches with score >= 40%")
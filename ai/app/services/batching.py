@@ -0,0 +1,129 @@
+"""Token-aware packing of prompt items into LLM batches."""
+
+import threading
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple, TypeVar
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Rough characters-per-token ratio used when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+_encodings = {}
+_encodings_lock = threading.Lock()
+
+
+def _get_encoding(model: str):
+    """Load the tokenizer for a model, or None if tiktoken is unavailable."""
+    with _encodings_lock:
+        if model not in _encodings:
+            try:
+                import tiktoken
+
+                try:
+                    _encodings[model] = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    _encodings[model] = tiktoken.get_encoding("o200k_base")
+            except Exception as e:
+                logger.warning(
+                    f"Tokenizer for {model} unavailable, estimating tokens from length: {str(e)}"
+                )
+                _encodings[model] = None
+        return _encodings[model]
+
+
+@lru_cache(maxsize=16384)
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """Count the tokens a text uses for the given model."""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return len(text) // CHARS_PER_TOKEN + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+class TokenBudgetPacker:
+    """Greedily packs items into batches that fit an input and output token budget.
+
+    Each item's prompt tokens are counted with the model tokenizer. Its expected
+    completion size is estimated as a fixed overhead plus a share of its prompt
+    tokens, since the response restates most of what the item lists. A batch is
+    closed as soon as adding the next item would exceed either budget or the
+    item cap, so item order is preserved.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        max_input_tokens: int,
+        max_output_tokens: int,
+        output_tokens_base: int,
+        output_tokens_ratio: float,
+        max_items: int,
+        prompt_overhead_tokens: int = 0,
+    ):
+        self.model = model
+        self.max_input_tokens = max_input_tokens
+        self.max_output_tokens = max_output_tokens
+        self.output_tokens_base = output_tokens_base
+        self.output_tokens_ratio = output_tokens_ratio
+        self.max_items = max_items
+        self.prompt_overhead_tokens = prompt_overhead_tokens
+
+    def estimate(self, text: str) -> Tuple[int, int]:
+        """Estimate (prompt tokens, expected output tokens) for one item."""
+        input_tokens = count_tokens(text, self.model)
+        output_tokens = int(self.output_tokens_base + input_tokens * self.output_tokens_ratio)
+        return input_tokens, output_tokens
+
+    def pack(self, items: List[T], text_of: Callable[[T], str]) -> List[List[T]]:
+        """Split items into consecutive batches that respect the token budgets."""
+        batches: List[List[T]] = []
+        current: List[T] = []
+        input_total = self.prompt_overhead_tokens
+        output_total = 0
+
+        for item in items:
+            input_tokens, output_tokens = self.estimate(text_of(item))
+            if current and (
+                input_total + input_tokens > self.max_input_tokens
+                or output_total + output_tokens > self.max_output_tokens
+                or len(current) >= self.max_items
+            ):
+                batches.append(current)
+                current = []
+                input_total = self.prompt_overhead_tokens
+                output_total = 0
+
+            if not current and (
+                input_total + input_tokens > self.max_input_tokens
+                or output_tokens > self.max_output_tokens
+            ):
+                logger.warning(
+                    f"Single item needs ~{input_tokens} prompt and ~{output_tokens} output tokens, "
+                    "exceeding the batch budget; sending it on its own"
+                )
+
+            current.append(item)
+            input_total += input_tokens
+            output_total += output_tokens
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def describe(self, batches: List[List[T]], text_of: Callable[[T], str]) -> Optional[str]:
+        """Summarize the estimated token usage of packed batches for logging."""
+        if not batches:
+            return None
+        parts = []
+        for batch in batches:
+            estimates = [self.estimate(text_of(item)) for item in batch]
+            parts.append(
+                f"{len(batch)} items/~{self.prompt_overhead_tokens + sum(e[0] for e in estimates)} in"
+                f"/~{sum(e[1] for e in estimates)} out"
+            )
+        return ", ".join(parts)
@@ -0,0 +1,221 @@
+"""In-memory store of employee bookings indexed by date interval."""
+
+import asyncio
+import threading
+import time
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from dateutil.parser import isoparse
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.cache import upstream_cache
+from app.services.roster_sync import fingerprint_record
+
+logger = get_logger(__name__)
+
+BookingFetcher = Callable[[date, date], Awaitable[List[Dict]]]
+
+
+@dataclass
+class CoveredRange:
+    """A date range whose bookings have been fetched."""
+
+    start: datetime
+    end: datetime
+    fetched_at: float
+
+
+def _to_datetime(value) -> Optional[datetime]:
+    """Parse a booking timestamp into a naive UTC datetime."""
+    if not value:
+        return None
+    try:
+        parsed = isoparse(value) if isinstance(value, str) else value
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class BookingStore:
+    """Caches booking windows fetched from the planner API.
+
+    Windows are whole days with both ends inclusive, like the planner API's
+    date parameters: a window from ``from`` to ``to`` spans ``[from 00:00,
+    to + 1 day 00:00)`` and holds every booking with ``endDate > from 00:00``
+    and ``startDate < to + 1 day``, so bookings starting on the ``to`` day are
+    included. A booking without startDate or endDate is open-ended on that side.
+    The store remembers which day ranges have been fetched, merges that
+    coverage, and keeps each booking in a per-employee interval index sorted by
+    start date, so any window inside the covered ranges is answered from memory
+    and only the uncovered gaps are fetched.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._coverage: List[CoveredRange] = []
+        self._bookings: Dict[str, Tuple[datetime, datetime, Dict]] = {}
+        self._index: Dict[str, List[Tuple[datetime, datetime, str]]] = {}
+
+    async def get(
+        self, window_start: date, window_end: date, fetch: BookingFetcher
+    ) -> List[Dict]:
+        """Get all bookings overlapping a window, fetching only missing ranges."""
+        start, end = self._day_start(window_start), self._day_start(window_end + timedelta(days=1))
+        gaps = self.missing_ranges(start, end)
+        if gaps:
+            logger.info(
+                f"Fetching {len(gaps)} uncovered booking range(s) for {window_start} - {window_end}"
+            )
+            results = await asyncio.gather(
+                *(
+                    upstream_cache.coalesce(
+                        f"bookings:{gap_start.date()}:{gap_end.date()}",
+                        lambda s=gap_start, e=gap_end: self._fill(s, e, fetch),
+                    )
+                    for gap_start, gap_end in gaps
+                ),
+                return_exceptions=True,
+            )
+            failures = [result for result in results if isinstance(result, Exception)]
+            if failures:
+                logger.warning(
+                    f"{len(failures)} booking range fetch(es) failed, answering from cached coverage: {str(failures[0])}"
+                )
+        else:
+            logger.debug(f"Booking window {window_start} - {window_end} served from memory")
+
+        return self.query(start, end)
+
+    def missing_ranges(
+        self, start: datetime, end: datetime
+    ) -> List[Tuple[datetime, datetime]]:
+        """Sub-ranges of [start, end) without fresh coverage."""
+        now = time.monotonic()
+        gaps = []
+        cursor = start
+        with self._lock:
+            for covered in self._coverage:
+                if covered.end <= cursor or now - covered.fetched_at >= self.ttl:
+                    continue
+                if covered.start >= end:
+                    break
+                if covered.start > cursor:
+                    gaps.append((cursor, covered.start))
+                cursor = max(cursor, covered.end)
+                if cursor >= end:
+                    break
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def query(self, start: datetime, end: datetime) -> List[Dict]:
+        """Bookings overlapping [start, end)."""
+        result = []
+        with self._lock:
+            for intervals in self._index.values():
+                # Intervals are sorted by start; only those starting before `end` can overlap
+                upper = bisect_left(intervals, (end,))
+                for booking_start, booking_end, key in intervals[:upper]:
+                    if booking_end > start:
+                        result.append(self._bookings[key][2])
+        return result
+
+    async def _fill(self, start: datetime, end: datetime, fetch: BookingFetcher) -> int:
+        """Fetch one uncovered range [start, end) of whole days and merge it into the store."""
+        records = await fetch(start.date(), (end - timedelta(days=1)).date())
+        fetched_at = time.monotonic()
+
+        with self._lock:
+            fresh = {}
+            for record in records:
+                booking_start = _to_datetime(record.get("startDate")) or datetime.min
+                booking_end = _to_datetime(record.get("endDate")) or datetime.max
+                key = (
+                    str(record["id"])
+                    if record.get("id") is not None
+                    else fingerprint_record(record)
+                )
+                fresh[key] = (booking_start, booking_end, record)
+
+            # Anything stored that overlaps the range but was not returned is gone upstream
+            stale_keys = [
+                key
+                for key, (booking_start, booking_end, _) in self._bookings.items()
+                if booking_start < end and booking_end > start and key not in fresh
+            ]
+            for key in stale_keys + [key for key in fresh if key in self._bookings]:
+                self._remove(key)
+            for key, booking in fresh.items():
+                self._insert(key, booking)
+
+            self._add_coverage(CoveredRange(start=start, end=end, fetched_at=fetched_at))
+
+        logger.info(
+            f"Stored {len(records)} bookings for {start.date()} - {(end - timedelta(days=1)).date()}, "
+            f"{len(self._bookings)} bookings across {len(self._coverage)} covered range(s)"
+        )
+        return len(records)
+
+    def _insert(self, key: str, booking: Tuple[datetime, datetime, Dict]) -> None:
+        self._bookings[key] = booking
+        emp_code = booking[2].get("empCode") or ""
+        insort(self._index.setdefault(emp_code, []), (booking[0], booking[1], key))
+
+    def _remove(self, key: str) -> None:
+        booking_start, booking_end, record = self._bookings.pop(key)
+        emp_code = record.get("empCode") or ""
+        intervals = self._index.get(emp_code, [])
+        intervals.remove((booking_start, booking_end, key))
+        if not intervals:
+            self._index.pop(emp_code, None)
+
+    def _add_coverage(self, new: CoveredRange) -> None:
+        """Insert a covered range, trimming what it replaces and merging neighbours."""
+        ranges = []
+        for covered in self._coverage:
+            if new.fetched_at - covered.fetched_at >= self.ttl:
+                # Expired coverage would be refetched anyway; drop it
+                continue
+            if covered.end <= new.start or covered.start >= new.end:
+                ranges.append(covered)
+                continue
+            if covered.start < new.start:
+                ranges.append(CoveredRange(covered.start, new.start, covered.fetched_at))
+            if covered.end > new.end:
+                ranges.append(CoveredRange(new.end, covered.end, covered.fetched_at))
+        ranges.append(new)
+        ranges.sort(key=lambda covered: covered.start)
+
+        # Merge touching ranges; the merged range expires with its oldest part
+        merged: List[CoveredRange] = []
+        for covered in ranges:
+            if merged and covered.start <= merged[-1].end:
+                last = merged[-1]
+                last.end = max(last.end, covered.end)
+                last.fetched_at = min(last.fetched_at, covered.fetched_at)
+            else:
+                merged.append(CoveredRange(covered.start, covered.end, covered.fetched_at))
+        self._coverage = merged
+
+        # Forget bookings that no longer fall inside any covered range
+        for key, (booking_start, booking_end, _) in list(self._bookings.items()):
+            if not any(
+                booking_start < covered.end and booking_end > covered.start
+                for covered in merged
+            ):
+                self._remove(key)
+
+    @staticmethod
+    def _day_start(value: date) -> datetime:
+        """Midnight starting a day; window and coverage bounds are always day starts."""
+        return datetime.combine(value, dt_time.min)
+
+
+booking_store = BookingStore(ttl=settings.BOOKING_STORE_TTL)
@@ -0,0 +1,157 @@
+"""Process-wide cache for upstream API data."""
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.http_client import get_http_client
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    """A cached value and the time it was fetched."""
+
+    value: Any
+    fetched_at: float
+
+
+class UpstreamCache:
+    """TTL cache with stale-while-revalidate refresh and single-flight fetching.
+
+    Fetches run as detached tasks on the upstream HTTP loop, so every caller that
+    asks for the same key while a fetch is in flight awaits that one fetch, and a
+    caller giving up (e.g. on a deadline) does not cancel it for the others.
+    """
+
+    def __init__(self, stale_while_revalidate: float):
+        self.stale_while_revalidate = stale_while_revalidate
+        self._lock = threading.Lock()
+        self._entries: Dict[str, CacheEntry] = {}
+        self._inflight: Dict[str, concurrent.futures.Future] = {}
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+        )
+
+    async def get(
+        self, key: str, fetcher: Callable[[], Awaitable[Any]], ttl: float
+    ) -> Any:
+        """Get a cached value, fetching it when missing or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            stats = self._stats[key]
+            if entry is not None:
+                age = now - entry.fetched_at
+                if age < ttl:
+                    stats["hits"] += 1
+                    return entry.value
+                if age < ttl + self.stale_while_revalidate:
+                    stats["stale_hits"] += 1
+                else:
+                    entry = None
+            if entry is None:
+                stats["misses"] += 1
+
+        if entry is not None:
+            # Serve the stale value now and refresh it in the background
+            self._refresh(key, fetcher)
+            return entry.value
+
+        future, _ = self._start_fetch(key, fetcher)
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    async def coalesce(self, key: str, fetcher: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a fetch single-flight without caching or counting its result."""
+        future, _ = self._start_fetch(key, fetcher, store=False)
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def prime(
+        self, key: str, value: Any, fetcher: Optional[Callable[[], Awaitable[Any]]] = None
+    ) -> None:
+        """Seed a key with a value obtained elsewhere, optionally refreshing it in the background."""
+        with self._lock:
+            self._entries[key] = CacheEntry(value=value, fetched_at=time.monotonic())
+        if fetcher is not None:
+            self._refresh(key, fetcher)
+
+    def invalidate(self, key: str) -> None:
+        """Drop a cached value so the next access fetches it again."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get hit/miss counters and entry ages per key."""
+        now = time.monotonic()
+        with self._lock:
+            result = {}
+            for key, counters in self._stats.items():
+                entry = self._entries.get(key)
+                result[key] = {
+                    **counters,
+                    "age_seconds": round(now - entry.fetched_at, 1) if entry else None,
+                    "refreshing": key in self._inflight,
+                }
+            return result
+
+    def _refresh(self, key: str, fetcher: Callable[[], Awaitable[Any]]) -> None:
+        """Start a background refresh for a stale key."""
+        future, started = self._start_fetch(key, fetcher)
+        if not started:
+            return
+        with self._lock:
+            self._stats[key]["refreshes"] += 1
+
+        def log_failure(done: concurrent.futures.Future) -> None:
+            if not done.cancelled() and done.exception() is not None:
+                logger.warning(
+                    f"Background refresh of {key} failed, keeping stale value: {str(done.exception())}"
+                )
+
+        future.add_done_callback(log_failure)
+
+    def _start_fetch(
+        self, key: str, fetcher: Callable[[], Awaitable[Any]], store: bool = True
+    ) -> Tuple[concurrent.futures.Future, bool]:
+        """Start fetching a key unless a fetch for it is already in flight."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = get_http_client().submit(self._fetch(key, fetcher, store))
+            self._inflight[key] = future
+            return future, True
+
+    async def _fetch(
+        self, key: str, fetcher: Callable[[], Awaitable[Any]], store: bool
+    ) -> Any:
+        """Run a fetch and store its result. Failed fetches are not cached."""
+        try:
+            value = await fetcher()
+        except Exception:
+            if store:
+                with self._lock:
+                    self._stats[key]["errors"] += 1
+            raise
+        else:
+            if store:
+                with self._lock:
+                    self._entries[key] = CacheEntry(
+                        value=value, fetched_at=time.monotonic()
+                    )
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+upstream_cache = UpstreamCache(
+    stale_while_revalidate=settings.CACHE_STALE_WHILE_REVALIDATE
+)
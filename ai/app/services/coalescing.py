@@ -0,0 +1,83 @@
+"""Single-flight coalescing of identical concurrent match requests."""
+
+import asyncio
+import hashlib
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.project import ProjectRequirement
+from app.services.llm_cache import normalize_input
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+def description_key(description: str) -> str:
+    """Coalescing key of a free-text project description, ignoring whitespace differences."""
+    digest = hashlib.blake2b(normalize_input(description).encode("utf-8"), digest_size=16)
+    return f"description:{digest.hexdigest()}"
+
+
+def requirement_key(requirement: ProjectRequirement) -> str:
+    """Coalescing key of a parsed requirement.
+
+    Skills and domains are compared case-insensitively and regardless of order.
+    The title is part of the key, since the matcher prompt includes it.
+    """
+    parts = [
+        requirement.title,
+        ",".join(sorted({skill.casefold() for skill in requirement.required_skills.tech_stack})),
+        ",".join(sorted({domain.casefold() for domain in requirement.required_skills.domains})),
+        requirement.required_level.value,
+        requirement.start_date.isoformat(),
+    ]
+    digest = hashlib.blake2b("\n".join(parts).encode("utf-8"), digest_size=16)
+    return f"requirement:{digest.hexdigest()}"
+
+
+class RequestCoalescer:
+    """Runs identical concurrent requests once and gives every caller the result.
+
+    The first caller for a key starts the work as a task on the running event
+    loop; callers arriving while it is in flight await the same task. Nothing is
+    cached once it finishes. A caller that goes away does not cancel the work
+    for the others.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stats: Dict[str, int] = defaultdict(int)
+
+    async def run(self, key: str, work: Callable[[], Awaitable[T]]) -> T:
+        """Await work(), sharing one execution among concurrent callers with the same key."""
+        if not self.enabled:
+            return await work()
+
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self._stats[key.split(":", 1)[0] + "_joined"] += 1
+            logger.info(f"Joining in-flight match request {key}")
+        else:
+            task = asyncio.ensure_future(work())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self._stats[key.split(":", 1)[0] + "_started"] += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get started/joined counters per key kind and the number of requests in flight."""
+        return {**self._stats, "in_flight": len(self._inflight)}
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        """Drop a finished task, retrieving its error in case every caller went away."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"Coalesced match request {key} failed: {str(task.exception())}")
+
+
+match_coalescer = RequestCoalescer(enabled=settings.MATCH_COALESCING_ENABLED)
@@ -0,0 +1,187 @@
+"""Typed decoding of upstream JSON payloads with msgspec.
+
+Payloads are decoded leniently: numbers sent as strings and integral floats
+are accepted for integer fields, as the pydantic models would. If a record
+still does not fit its type, the payload is decoded again record by record
+and only the invalid records are skipped.
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - depends on the environment
+    msgspec = None
+    logger.warning("msgspec is not installed, decoding upstream payloads with response.json()")
+
+
+def fast_decoding_enabled() -> bool:
+    """Whether upstream payloads are decoded with msgspec."""
+    return msgspec is not None and settings.FAST_DECODING
+
+
+if msgspec is not None:
+
+    class Record(msgspec.Struct, kw_only=True, gc=False):
+        """Base of upstream records: nulls take the field default, null list items are dropped.
+
+        The upstream sends explicit nulls for missing values, so every field is
+        declared Optional with the default it should fall back to. Records never
+        form reference cycles, so they are not tracked by the garbage collector.
+        """
+
+        def __post_init__(self):
+            for name, default in _null_defaults(type(self)):
+                value = getattr(self, name)
+                if value is None:
+                    setattr(self, name, default())
+                elif value.__class__ is list and None in value:
+                    setattr(self, name, [item for item in value if item is not None])
+
+    _defaults_cache: Dict[type, List[Tuple[str, Callable[[], Any]]]] = {}
+
+    def _null_defaults(cls: type) -> List[Tuple[str, Callable[[], Any]]]:
+        """(field name, default factory) of each field of a record class."""
+        defaults = _defaults_cache.get(cls)
+        if defaults is None:
+            defaults = _defaults_cache[cls] = [
+                (
+                    field.name,
+                    field.default_factory
+                    if field.default_factory is not msgspec.NODEFAULT
+                    else (lambda value=field.default: value),
+                )
+                for field in msgspec.structs.fields(cls)
+            ]
+        return defaults
+
+    class SkillRecord(Record):
+        skillId: Optional[int] = 0
+        skillName: Optional[str] = ""
+        level: Optional[str] = "Beginner"
+        monthOfExperience: Optional[int] = 0
+        isPrimary: Optional[bool] = False
+
+    class AdditionalSkillRecord(Record):
+        id: Optional[int] = 0
+        additionalSkillName: Optional[str] = ""
+        proficiency: Optional[str] = "Beginner"
+
+    class BusinessDomainRecord(Record):
+        id: Optional[int] = 0
+        businessDomainName: Optional[str] = ""
+
+    class EmployeeRecord(Record):
+        """An ``/integrate/skill`` record; reads like an Employee model."""
+
+        empCode: Optional[str] = ""
+        skills: Optional[List[Optional[SkillRecord]]] = msgspec.field(default_factory=list)
+        additionalSkills: Optional[List[Optional[AdditionalSkillRecord]]] = msgspec.field(
+            default_factory=list
+        )
+        businessDomains: Optional[List[Optional[BusinessDomainRecord]]] = msgspec.field(
+            default_factory=list
+        )
+
+    class ProjectMemberRecord(Record):
+        id: Optional[int] = 0
+        teamId: Optional[int] = 0
+        empCode: Optional[str] = ""
+        isTeamLeader: Optional[bool] = False
+        name: Optional[str] = ""
+        skillNames: Optional[List[Optional[str]]] = msgspec.field(default_factory=list)
+
+    class ProjectRecord(Record):
+        """A ``/project/get-all-for-booking`` record; dates are kept as sent."""
+
+        name: Optional[str] = ""
+        startDate: Optional[str] = None
+        endDate: Optional[str] = None
+        id: Optional[int] = 0
+        projectCoordinator: Optional[ProjectMemberRecord] = msgspec.field(
+            default_factory=ProjectMemberRecord
+        )
+        color: Optional[str] = ""
+        members: Optional[List[Optional[ProjectMemberRecord]]] = msgspec.field(
+            default_factory=list
+        )
+        projectModelName: Optional[str] = ""
+
+        def with_dates(self, parse: Callable[[str], datetime]) -> "ProjectRecord":
+            """Copy with startDate and endDate parsed into datetimes."""
+            return msgspec.structs.replace(
+                self,
+                startDate=parse(self.startDate) if self.startDate else None,
+                endDate=parse(self.endDate) if self.endDate else None,
+            )
+
+    _employee_decoder = msgspec.json.Decoder(List[EmployeeRecord], strict=False)
+    _project_decoder = msgspec.json.Decoder(List[ProjectRecord], strict=False)
+    _record_decoders = {
+        EmployeeRecord: msgspec.json.Decoder(EmployeeRecord, strict=False),
+        ProjectRecord: msgspec.json.Decoder(ProjectRecord, strict=False),
+    }
+    _raw_list_decoder = msgspec.json.Decoder(List[msgspec.Raw])
+    _json_decoder = msgspec.json.Decoder()
+    _encoder = msgspec.json.Encoder()
+
+
+def decode_employees(body: bytes) -> List["EmployeeRecord"]:
+    """Decode an ``/integrate/skill`` payload into EmployeeRecord structs, skipping invalid records."""
+    return _decode_records(body, _employee_decoder, EmployeeRecord)
+
+
+def decode_projects(body: bytes) -> List["ProjectRecord"]:
+    """Decode a ``/project/get-all-for-booking`` payload into ProjectRecord structs, skipping invalid records."""
+    return _decode_records(body, _project_decoder, ProjectRecord)
+
+
+def _decode_records(body: bytes, decoder: Any, record_type: type) -> List[Any]:
+    """Decode a JSON array of records at once, or one by one if some record is invalid.
+
+    Raises ValueError if the body is not a JSON array.
+    """
+    try:
+        return decoder.decode(body)
+    except msgspec.ValidationError as e:
+        logger.warning(f"Invalid {record_type.__name__} in payload ({str(e)}), decoding records one by one")
+
+    records = []
+    record_decoder = _record_decoders[record_type]
+    for i, raw in enumerate(_raw_list_decoder.decode(body)):
+        try:
+            records.append(record_decoder.decode(raw))
+        except msgspec.ValidationError as e:
+            logger.warning(f"Skipping invalid {record_type.__name__} at index {i}: {str(e)}")
+    return records
+
+
+def convert_employee(item: Dict) -> Any:
+    """Convert one parsed ``/integrate/skill`` record into an EmployeeRecord struct.
+
+    Returns None for an invalid record. Without msgspec the record is returned
+    as is.
+    """
+    if msgspec is None:
+        return item
+    try:
+        return msgspec.convert(item, EmployeeRecord, strict=False)
+    except msgspec.ValidationError as e:
+        logger.warning(f"Skipping invalid EmployeeRecord: {str(e)}")
+        return None
+
+
+def decode_json(body: bytes) -> Any:
+    """Decode any JSON payload into builtin types."""
+    return _json_decoder.decode(body)
+
+
+def encode_record(record: Any) -> bytes:
+    """Encode a decoded record back to compact JSON."""
+    return _encoder.encode(record)
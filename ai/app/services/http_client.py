@@ -0,0 +1,234 @@
+"""Shared asynchronous HTTP client for upstream API calls."""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, AsyncIterator, Callable, Coroutine, Dict, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - depends on the environment
+    ijson = None
+
+T = TypeVar("T")
+
+
+class UpstreamHTTPClient:
+    """Process-wide pooled HTTP client for the insider and empinfo APIs.
+
+    The underlying ``httpx.AsyncClient`` lives on a dedicated event loop thread, so
+    its keep-alive connections are reused by every request regardless of which
+    event loop (or plain thread) the caller is running on.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float,
+        read_timeout: float,
+        max_connections: int,
+        max_keepalive_connections: int,
+        max_connections_per_host: int,
+        http2: bool,
+    ):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.http2 = http2
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the client event loop thread on first use."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="upstream-http", daemon=True
+                )
+                thread.start()
+                self._loop = loop
+                self._thread = thread
+                logger.info("Started upstream HTTP client loop")
+            return self._loop
+
+    def _http2_enabled(self) -> bool:
+        """Check whether HTTP/2 can be negotiated with the installed packages."""
+        if not self.http2:
+            return False
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP/2 requested but 'h2' is not installed, using HTTP/1.1")
+            return False
+        return True
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the pooled client. Must be called on the client loop."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                ),
+                http2=self._http2_enabled(),
+            )
+        return self._client
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        """Get the semaphore bounding concurrent requests to the URL's host."""
+        host = urlsplit(url).netloc
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = asyncio.Semaphore(self.max_connections_per_host)
+            self._host_limits[host] = limit
+        return limit
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        client = self._get_client()
+        async with self._host_limit(url):
+            return await client.request(method, url, **kwargs)
+
+    async def _stream_items(
+        self, method: str, url: str, on_item: Callable[[Any], None], **kwargs: Any
+    ) -> httpx.Response:
+        client = self._get_client()
+        async with self._host_limit(url):
+            async with client.stream(method, url, **kwargs) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    return response
+                reader = _ChunkReader(response.aiter_bytes())
+                try:
+                    async for item in ijson.items_async(reader, "item", use_float=True):
+                        on_item(item)
+                except ijson.JSONError as e:
+                    raise ValueError(f"Invalid JSON from {url}: {str(e)}") from e
+                return response
+
+    async def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Await a coroutine on the client loop from any event loop."""
+        loop = self._ensure_loop()
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        """Schedule a coroutine on the client loop without waiting for it."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def run_sync(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine on the client loop and block until it completes."""
+        self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("run_sync cannot be called from the upstream HTTP loop")
+        return self.submit(coro).result()
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request through the shared connection pool."""
+        return await self.run(self._request(method, url, **kwargs))
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a GET request through the shared connection pool."""
+        return await self.request("GET", url, **kwargs)
+
+    async def stream_items(
+        self, url: str, on_item: Callable[[Any], None], **kwargs: Any
+    ) -> httpx.Response:
+        """GET a JSON array, passing each element to on_item as soon as it is parsed.
+
+        The body is read and parsed in chunks, so it is never held whole. on_item
+        runs on the client loop. The returned response carries the status and
+        headers; non-200 responses are returned unparsed with their body read.
+        Malformed JSON raises ValueError, like ``response.json()``.
+        """
+        return await self.run(self._stream_items("GET", url, on_item, **kwargs))
+
+    def close(self) -> None:
+        """Close pooled connections and stop the client loop."""
+        with self._lock:
+            loop, thread, client = self._loop, self._thread, self._client
+            self._loop = self._thread = self._client = None
+            self._host_limits = {}
+
+        if loop is None:
+            return
+        if client is not None:
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+        logger.info("Closed upstream HTTP client")
+
+
+class _ChunkReader:
+    """File-like adapter feeding an async byte iterator to ijson."""
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks
+
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes the input type with read(0)
+        if size == 0:
+            return b""
+        # An empty read means end of input to ijson, so skip empty chunks
+        while True:
+            try:
+                chunk = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                return b""
+            if chunk:
+                return chunk
+
+
+def streaming_available() -> bool:
+    """Whether JSON responses can be parsed incrementally."""
+    return ijson is not None
+
+
+_http_client: Optional[UpstreamHTTPClient] = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> UpstreamHTTPClient:
+    """Get the process-wide upstream HTTP client."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = UpstreamHTTPClient(
+                connect_timeout=settings.UPSTREAM_CONNECT_TIMEOUT,
+                read_timeout=settings.UPSTREAM_READ_TIMEOUT,
+                max_connections=settings.UPSTREAM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.UPSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+                max_connections_per_host=settings.UPSTREAM_MAX_CONNECTIONS_PER_HOST,
+                http2=settings.UPSTREAM_HTTP2,
+            )
+        return _http_client
+
+
+def close_http_client() -> None:
+    """Close the process-wide upstream HTTP client if it was created."""
+    global _http_client
+    with _http_client_lock:
+        client, _http_client = _http_client, None
+    if client is not None:
+        client.close()
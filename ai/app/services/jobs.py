@@ -0,0 +1,190 @@
+"""In-process background execution of matching jobs."""
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+JobEventCallback = Callable[[str, Dict], None]
+JobRunner = Callable[[JobEventCallback], Awaitable[Dict[str, Any]]]
+
+
+class JobQueueFullError(Exception):
+    """Raised when no more jobs can be queued."""
+
+
+@dataclass
+class MatchJob:
+    """State of a submitted matching job."""
+
+    id: str
+    runner: JobRunner = field(repr=False)
+    status: str = JOB_QUEUED
+    stage: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED)
+
+    def on_event(self, event: str, data: Dict) -> None:
+        """Track the workflow stage the job has reached."""
+        if event == "stage":
+            self.stage = data.get("stage")
+
+
+class MatchJobManager:
+    """Runs matching jobs on a fixed pool of asyncio workers.
+
+    Jobs wait in a bounded queue so bursts are absorbed up to ``max_queue`` and
+    rejected beyond it. Finished jobs are kept for ``retention`` seconds so their
+    results can be polled, then forgotten. Workers start on the first submission,
+    on the running event loop.
+    """
+
+    def __init__(self, workers: int, max_queue: int, retention: float):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retention = retention
+        self._jobs: Dict[str, MatchJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers = []
+
+    def submit(self, runner: JobRunner) -> MatchJob:
+        """Queue a job, raising JobQueueFullError if the queue is full."""
+        self._start()
+        self._purge()
+        if self._queue.full():
+            raise JobQueueFullError(f"Match job queue is full ({self.max_queue} jobs waiting)")
+
+        job = MatchJob(id=uuid.uuid4().hex, runner=runner)
+        self._jobs[job.id] = job
+        self._queue.put_nowait(job)
+        logger.info(f"Queued match job {job.id} ({self._queue.qsize()} waiting)")
+        return job
+
+    def get(self, job_id: str) -> Optional[MatchJob]:
+        """Get a job by id, or None if unknown or expired."""
+        self._purge()
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[MatchJob]:
+        """Cancel a queued or running job. Finished jobs are left as they are."""
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return job
+        if job.task is not None:
+            # The worker keeps waiting for the task to unwind, but the job is
+            # reported as cancelled from now on
+            job.task.cancel()
+        self._finish(job, JOB_CANCELLED)
+        logger.info(f"Cancelled match job {job.id}")
+        return job
+
+    async def shutdown(self) -> None:
+        """Stop the workers, cancelling any running jobs."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def _start(self) -> None:
+        if self._workers:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"match-job-worker-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info(f"Started {self.workers} match job workers")
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.status == JOB_QUEUED:
+                    await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: MatchJob) -> None:
+        """Run one job and record its outcome."""
+        job.status = JOB_RUNNING
+        job.started_at = time.time()
+        task = job.task = asyncio.create_task(job.runner(job.on_event))
+        try:
+            # Wait without letting a cancelled job cancel the worker itself
+            await asyncio.wait({task})
+        except asyncio.CancelledError:
+            task.cancel()
+            self._finish(job, JOB_CANCELLED)
+            raise
+
+        if job.finished:
+            # Already reported as cancelled by cancel(); consume any error from unwinding
+            if not task.cancelled():
+                task.exception()
+        elif task.cancelled():
+            self._finish(job, JOB_CANCELLED)
+        elif task.exception() is not None:
+            error = task.exception()
+            logger.error(f"Match job {job.id} failed: {str(error)}")
+            self._finish(job, JOB_FAILED, error=getattr(error, "detail", None) or str(error))
+        else:
+            result = task.result()
+            if result.get("error"):
+                self._finish(job, JOB_FAILED, result=result, error=result["error"])
+            else:
+                self._finish(job, JOB_SUCCEEDED, result=result)
+        logger.info(
+            f"Match job {job.id} {job.status} in {job.finished_at - job.started_at:.2f} seconds"
+        )
+
+    def _finish(
+        self,
+        job: MatchJob,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        job.task = None
+
+    def _purge(self) -> None:
+        """Forget finished jobs older than the retention period."""
+        cutoff = time.time() - self.retention
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+match_jobs = MatchJobManager(
+    workers=settings.MATCH_JOB_WORKERS,
+    max_queue=settings.MATCH_JOB_QUEUE_SIZE,
+    retention=settings.MATCH_JOB_RETENTION,
+)
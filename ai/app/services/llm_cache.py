@@ -0,0 +1,162 @@
+"""Persistent content-addressed cache for LLM agent responses."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def normalize_input(text: str) -> str:
+    """Collapse whitespace so formatting-only differences share a cache entry."""
+    return " ".join(text.split())
+
+
+class LLMResponseCache:
+    """SQLite-backed cache of parsed LLM responses.
+
+    Entries are keyed by agent, model, prompt template version and a hash of the
+    normalized prompt input. Values are stored as zlib-compressed JSON, expire
+    after a per-agent TTL, and the least recently used entries are evicted once
+    the total stored size exceeds ``max_bytes``.
+    """
+
+    def __init__(self, path: str, max_bytes: int, ttls: Dict[str, float], enabled: bool = True):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = ttls
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use. Must be called with the lock held."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    agent TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def make_key(self, agent: str, model: str, prompt_version: str, prompt_input: str) -> str:
+        """Build the content address of a prompt."""
+        digest = hashlib.sha256()
+        for part in (agent, model, prompt_version, normalize_input(prompt_input)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, agent: str, key: str) -> Optional[Any]:
+        """Get a cached response, or None on a miss or expired entry."""
+        if not self.enabled:
+            return None
+        try:
+            now = time.time()
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] >= self.ttls.get(agent, 0):
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    conn.commit()
+                    row = None
+                if row is None:
+                    self._stats[agent]["misses"] += 1
+                    return None
+                conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                conn.commit()
+                self._stats[agent]["hits"] += 1
+            return json.loads(zlib.decompress(row[0]))
+
+        except Exception as e:
+            logger.warning(f"Error reading LLM cache for {agent}: {str(e)}")
+            return None
+
+    def set(self, agent: str, key: str, value: Any) -> None:
+        """Store a response and evict least recently used entries if over size."""
+        if not self.enabled:
+            return
+        try:
+            blob = zlib.compress(json.dumps(value).encode("utf-8"))
+            now = time.time()
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, agent, value, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, agent, blob, len(blob), now, now),
+                )
+                self._stats[agent]["writes"] += 1
+                self._evict(conn)
+                conn.commit()
+
+        except Exception as e:
+            logger.warning(f"Error writing LLM cache for {agent}: {str(e)}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        evicted = []
+        for key, agent, size in conn.execute(
+            "SELECT key, agent, size FROM responses ORDER BY accessed_at"
+        ):
+            evicted.append((key, agent))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key, _ in evicted])
+        for _, agent in evicted:
+            self._stats[agent]["evictions"] += 1
+        logger.info(f"Evicted {len(evicted)} LLM cache entries to stay under {self.max_bytes} bytes")
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Get hit/miss counters per agent."""
+        with self._lock:
+            return {agent: dict(counters) for agent, counters in self._stats.items()}
+
+
+llm_cache = LLMResponseCache(
+    path=settings.LLM_CACHE_PATH,
+    max_bytes=settings.LLM_CACHE_MAX_BYTES,
+    ttls={
+        "parser": settings.LLM_CACHE_PARSER_TTL,
+        "analyzer": settings.LLM_CACHE_ANALYZER_TTL,
+        "matcher": settings.LLM_CACHE_MATCHER_TTL,
+    },
+    enabled=settings.LLM_CACHE_ENABLED,
+)
@@ -0,0 +1,72 @@
+"""Blocking and event-loop drivers for LLM call flows.
+
+A flow is a generator holding the logic that the blocking and async variant of
+an agent method share: cache lookups, retries and response formatting. It yields
+each operation that needs I/O as an ``(operation, argument)`` step and is sent
+the result back; an error raised by the operation is thrown into the flow. The
+flow's return value is the result of the call.
+
+Operations:
+
+- ``INVOKE``: call the chain with the argument as input.
+- ``SLEEP``: wait the argument in seconds.
+- ``CALL``: run the argument, a blocking function without arguments, such as
+  an ``llm_cache`` lookup. On the event loop it runs in a worker thread.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Generator, Tuple, TypeVar
+
+T = TypeVar("T")
+
+INVOKE = "invoke"
+SLEEP = "sleep"
+CALL = "call"
+
+Step = Tuple[str, Any]
+Flow = Generator[Step, Any, T]
+
+
+def run_flow(flow: Flow, invoke: Callable[[Any], Any]) -> T:
+    """Run a flow in the calling thread, calling the chain with invoke."""
+    value, error = None, None
+    while True:
+        try:
+            operation, argument = flow.throw(error) if error is not None else flow.send(value)
+        except StopIteration as stop:
+            return stop.value
+        value, error = None, None
+        try:
+            if operation == INVOKE:
+                value = invoke(argument)
+            elif operation == SLEEP:
+                time.sleep(argument)
+            elif operation == CALL:
+                value = argument()
+            else:
+                raise ValueError(f"Unknown flow operation: {operation}")
+        except Exception as e:
+            error = e
+
+
+async def arun_flow(flow: Flow, ainvoke: Callable[[Any], Awaitable[Any]]) -> T:
+    """Run a flow on the event loop, calling the chain with ainvoke and blocking calls in threads."""
+    value, error = None, None
+    while True:
+        try:
+            operation, argument = flow.throw(error) if error is not None else flow.send(value)
+        except StopIteration as stop:
+            return stop.value
+        value, error = None, None
+        try:
+            if operation == INVOKE:
+                value = await ainvoke(argument)
+            elif operation == SLEEP:
+                await asyncio.sleep(argument)
+            elif operation == CALL:
+                value = await asyncio.to_thread(argument)
+            else:
+                raise ValueError(f"Unknown flow operation: {operation}")
+        except Exception as e:
+            error = e
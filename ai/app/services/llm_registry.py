@@ -0,0 +1,206 @@
+"""Process-wide LLM clients and prompt chains, one per agent role."""
+
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Builds the (prompt, output parser) pair of a role's chain
+ChainBuilder = Callable[[], Tuple[Any, Any]]
+
+
+@dataclass(frozen=True)
+class LLMRoleConfig:
+    """Model settings of one agent role."""
+
+    model: str
+    temperature: float
+    max_tokens: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class LLMChain:
+    """A role's client with its compiled prompt and output parser, piped together in chain."""
+
+    llm: Any
+    prompt: Any
+    parser: Any
+    chain: Any
+    version: str
+
+
+class LLMRegistry:
+    """Configured LLM clients and prebuilt ``prompt | llm | parser`` chains keyed by role.
+
+    Each role gets one ``ChatOpenAI`` with its own pooled sync and async httpx
+    clients, so keep-alive connections and compiled prompt templates are reused by
+    every request instead of being rebuilt per service instance. Clients and
+    chains are built on first use; langchain is only imported then. Async calls
+    are expected to run on the application event loop.
+
+    Chain calls carry a ``prompt_cache_key`` of the role and prompt version, so
+    the provider routes calls sharing a prompt prefix to the same prefix cache,
+    and the token usage of every call, including cached prompt tokens, is counted
+    per role. The provider only caches prefixes of 1024 tokens or more, which
+    the current static prompt prefixes are not (see benchmarks/prompt_prefix.py).
+    """
+
+    def __init__(
+        self,
+        roles: Dict[str, LLMRoleConfig],
+        max_connections: int,
+        max_keepalive_connections: int,
+        connect_timeout: float,
+        read_timeout: float,
+    ):
+        self.roles = roles
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self._lock = threading.RLock()
+        self._llms: Dict[str, Any] = {}
+        self._chains: Dict[str, LLMChain] = {}
+        self._versions: Dict[str, str] = {}
+        self._http_clients: Dict[str, Tuple[httpx.Client, httpx.AsyncClient]] = {}
+        self._usage: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"calls": 0, "input_tokens": 0, "cached_tokens": 0, "output_tokens": 0, "seconds": 0.0}
+        )
+
+    def llm(self, role: str) -> Any:
+        """Get the chat model client of a role, creating it on first use."""
+        with self._lock:
+            llm = self._llms.get(role)
+            if llm is None:
+                llm = self._llms[role] = self._build_llm(role)
+            return llm
+
+    def chain(self, role: str, build: ChainBuilder, version: str) -> LLMChain:
+        """Get the prebuilt chain of a role, building its prompt and parser with build on first use."""
+        with self._lock:
+            chain = self._chains.get(role)
+            if chain is None:
+                llm = self.llm(role)
+                prompt, parser = build()
+                model = llm.bind(extra_body={"prompt_cache_key": f"{role}-v{version}"})
+                chain = self._chains[role] = LLMChain(
+                    llm=llm,
+                    prompt=prompt,
+                    parser=parser,
+                    chain=prompt | model | parser,
+                    version=version,
+                )
+                self._versions[role] = version
+            return chain
+
+    def record_usage(self, role: str, usage: Optional[Dict[str, Any]], seconds: float) -> None:
+        """Count the tokens of one completed call of a role."""
+        usage = usage or {}
+        input_tokens = usage.get("input_tokens") or 0
+        cached_tokens = (usage.get("input_token_details") or {}).get("cache_read") or 0
+        output_tokens = usage.get("output_tokens") or 0
+        with self._lock:
+            version = self._versions.get(role)
+            counters = self._usage[role]
+            counters["calls"] += 1
+            counters["input_tokens"] += input_tokens
+            counters["cached_tokens"] += cached_tokens
+            counters["output_tokens"] += output_tokens
+            counters["seconds"] += seconds
+        logger.info(
+            f"LLM call for {role} (prompt v{version}): "
+            f"{input_tokens} input tokens, {cached_tokens} cached, "
+            f"{output_tokens} output tokens in {seconds:.2f}s"
+        )
+
+    def usage_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get token usage counters per role, with the share of prompt tokens served from cache."""
+        with self._lock:
+            result = {}
+            for role, counters in self._usage.items():
+                result[role] = {
+                    **counters,
+                    "seconds": round(counters["seconds"], 2),
+                    "prompt_version": self._versions.get(role),
+                    "cached_ratio": round(counters["cached_tokens"] / counters["input_tokens"], 3)
+                    if counters["input_tokens"]
+                    else 0.0,
+                }
+            return result
+
+    async def aclose(self) -> None:
+        """Close the pooled connections of every role."""
+        with self._lock:
+            http_clients = list(self._http_clients.values())
+            self._http_clients = {}
+            self._llms = {}
+            self._chains = {}
+        for client, async_client in http_clients:
+            client.close()
+            await async_client.aclose()
+        if http_clients:
+            logger.info(f"Closed {len(http_clients)} LLM clients")
+
+    def _build_llm(self, role: str) -> Any:
+        """Create a role's chat model with its own connection pool."""
+        from langchain_openai import ChatOpenAI
+
+        from app.services.llm_usage import UsageRecorder
+
+        config = self.roles[role]
+        timeout = httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+        )
+        client = httpx.Client(timeout=timeout, limits=limits)
+        async_client = httpx.AsyncClient(timeout=timeout, limits=limits)
+        self._http_clients[role] = (client, async_client)
+
+        kwargs = {}
+        if settings.OPENAI_API_KEY:
+            kwargs["api_key"] = settings.OPENAI_API_KEY
+        llm = ChatOpenAI(
+            model=config.model,
+            temperature=config.temperature,
+            max_tokens=config.max_tokens,
+            timeout=timeout,
+            http_client=client,
+            http_async_client=async_client,
+            callbacks=[UsageRecorder(self, role)],
+            **kwargs,
+        )
+        logger.info(f"Created LLM client for {role}: {config.model}")
+        return llm
+
+
+llm_registry = LLMRegistry(
+    roles={
+        "parser": LLMRoleConfig(
+            model=settings.LLM_PARSER_MODEL,
+            temperature=settings.LLM_PARSER_TEMPERATURE,
+            max_tokens=settings.LLM_PARSER_MAX_TOKENS,
+        ),
+        "analyzer": LLMRoleConfig(
+            model=settings.LLM_ANALYZER_MODEL,
+            temperature=settings.LLM_ANALYZER_TEMPERATURE,
+            max_tokens=settings.LLM_ANALYZER_MAX_TOKENS,
+        ),
+        "matcher": LLMRoleConfig(
+            model=settings.LLM_MATCHER_MODEL,
+            temperature=settings.LLM_MATCHER_TEMPERATURE,
+            max_tokens=settings.LLM_MATCHER_MAX_TOKENS,
+        ),
+    },
+    max_connections=settings.LLM_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+    connect_timeout=settings.LLM_CONNECT_TIMEOUT,
+    read_timeout=settings.LLM_READ_TIMEOUT,
+)
@@ -0,0 +1,43 @@
+"""Token usage recording for LLM calls.
+
+Imported when the first LLM client is created, since it depends on langchain.
+"""
+
+import time
+from typing import TYPE_CHECKING, Any, Dict
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+if TYPE_CHECKING:
+    from app.services.llm_registry import LLMRegistry
+
+
+class UsageRecorder(BaseCallbackHandler):
+    """Reports the token usage and latency of each chat model call of a role to the registry."""
+
+    # Recording is cheap, so run on the calling thread rather than an executor
+    run_inline = True
+
+    def __init__(self, registry: "LLMRegistry", role: str):
+        self.registry = registry
+        self.role = role
+        self._started: Dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        seconds = time.perf_counter() - started if started is not None else 0.0
+        usage = None
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                if message is not None and getattr(message, "usage_metadata", None):
+                    usage = message.usage_metadata
+        self.registry.record_usage(self.role, usage, seconds)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started.pop(run_id, None)
@@ -1,9 +1,9 @@
 """Service for matching employees to projects."""
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from app.core.logging import get_logger
 from app.models.project import ProjectRequirement
-from app.core.workflow import run_workflow
+from app.core.workflow import arun_workflow, run_workflow, WorkflowEventCallback
 
 logger = get_logger(__name__)
 
@@ -14,25 +14,49 @@ class MatchingService:
         """Initialize the matching service."""
         logger.info("Initializing matching service")
     
-    def run_workflow(self, project_requirement: ProjectRequirement) -> Dict[str, Any]:
+    def run_workflow(
+        self,
+        project_requirement: ProjectRequirement,
+        on_event: Optional[WorkflowEventCallback] = None
+    ) -> Dict[str, Any]:
         """Run the matching workflow to find suitable employees for the project."""
         try:
             logger.info(f"Starting matching workflow for project: {project_requirement.title}")
             
             # Use the existing workflow function
-            result = run_workflow(project_requirement)
+            result = run_workflow(project_requirement, on_event)
+            return self._log_result(result)
             
-            # Log results
-            recommended_count = len(result.get("recommended_employees", []))
-            logger.info(f"Matching workflow completed. Found {recommended_count} recommended employees")
+        except Exception as e:
+            return self._error_result(e)
+    
+    async def arun_workflow(
+        self,
+        project_requirement: ProjectRequirement,
+        on_event: Optional[WorkflowEventCallback] = None
+    ) -> Dict[str, Any]:
+        """Run the matching workflow without blocking the event loop."""
+        try:
+            logger.info(f"Starting matching workflow for project: {project_requirement.title}")
             
-            return result
+            result = await arun_workflow(project_requirement, on_event)
+            return self._log_result(result)
             
         except Exception as e:
-            logger.error(f"Error in matching workflow: {str(e)}")
-            return {
-                "error": f"Failed to run matching workflow: {str(e)}",
-                "recommended_employees": [],
-                "selection_criteria": [],
-                "recommendation_summary": "An error occurred during the matching process."
-            } 
\ No newline at end of file
+            return self._error_result(e)
+    
+    @staticmethod
+    def _log_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        recommended_count = len(result.get("recommended_employees", []))
+        logger.info(f"Matching workflow completed. Found {recommended_count} recommended employees")
+        return result
+    
+    @staticmethod
+    def _error_result(error: Exception) -> Dict[str, Any]:
+        logger.error(f"Error in matching workflow: {str(error)}")
+        return {
+            "error": f"Failed to run matching workflow: {str(error)}",
+            "recommended_employees": [],
+            "selection_criteria": [],
+            "recommendation_summary": "An error occurred during the matching process."
+        }
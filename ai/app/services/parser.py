@@ -1,16 +1,19 @@
 """Service for parsing free-text project requirements."""
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 import re
-from langchain_openai import ChatOpenAI
-from langchain.output_parsers import PydanticOutputParser
-from langchain.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 from app.core.logging import get_logger
-from app.core.config import settings
+from app.services.llm_cache import llm_cache
+from app.services.llm_flow import CALL, INVOKE, Flow, arun_flow, run_flow
+from app.services.llm_registry import llm_registry
+from app.services.vocabulary import domain_vocabulary, skill_vocabulary
 
 logger = get_logger(__name__)
 
+# Bump when the prompt below changes so cached responses are not reused
+PARSER_PROMPT_VERSION = "2"
+
 
 class ParsedProjectRequirement(BaseModel):
     """Parsed project requirements from free text."""
@@ -28,26 +31,23 @@ class ParsedProjectRequirement(BaseModel):
     start_date: str = Field(description="Project start date in ISO format (YYYY-MM-DD)")
 
 
-class RequirementsParserService:
-    """Service for parsing project requirements from free text."""
-
-    def __init__(self):
-        """Initialize the parser service."""
-        self.llm = ChatOpenAI(
-            model="gpt-4o", temperature=0.1, api_key=settings.OPENAI_API_KEY
-        )
-        self.parser = PydanticOutputParser(pydantic_object=ParsedProjectRequirement)
+def _parser_chain() -> Tuple:
+    """Build the extraction prompt and its output parser.
 
-    def parse_requirements(self, text: str) -> Dict[str, Any]:
-        """Parse project requirements from free text."""
-        try:
-            logger.info("Parsing project requirements from free text")
+    All instructions, including the format instructions, come before the user text,
+    so every request shares the same prompt prefix. The provider only caches it
+    once it reaches 1024 tokens, which it currently does not.
+    """
+    # Imported here so that importing this module does not load the LLM stack
+    from langchain_core.output_parsers import PydanticOutputParser
+    from langchain_core.prompts import ChatPromptTemplate
 
-            prompt = ChatPromptTemplate.from_messages(
-                [
-                    (
-                        "system",
-                        """You are an expert project analyst who extracts structured information from 
+    parser = PydanticOutputParser(pydantic_object=ParsedProjectRequirement)
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                """You are an expert project analyst who extracts structured information from 
                 project requirement descriptions. 
                 
                 Extract the following information from the text:
@@ -60,31 +60,80 @@ class RequirementsParserService:
                 Format the output as specified by the output parser.
                 If certain information is missing, make reasonable assumptions based on the context.
                 For missing start dates, use a date one month from today.""",
-                    ),
-                    ("human", "{text}"),
-                    ("system", "Format the output as follows:\n{format_instructions}"),
-                ]
-            ).partial(format_instructions=self.parser.get_format_instructions())
+            ),
+            ("system", "Format the output as follows:\n{format_instructions}"),
+            ("human", "{text}"),
+        ]
+    ).partial(format_instructions=parser.get_format_instructions())
+    return prompt, parser
+
+
+class RequirementsParserService:
+    """Service for parsing project requirements from free text."""
+
+    def __init__(self):
+        """Initialize the parser service."""
+        prepared = llm_registry.chain("parser", _parser_chain, PARSER_PROMPT_VERSION)
+        self.llm = prepared.llm
+        self.parser = prepared.parser
+        self.prompt = prepared.prompt
+        self.chain = prepared.chain
+
+    def parse_requirements(self, text: str) -> Dict[str, Any]:
+        """Parse project requirements from free text."""
+        return run_flow(self._parse_flow(text), self.chain.invoke)
+
+    async def aparse_requirements(self, text: str) -> Dict[str, Any]:
+        """Parse project requirements from free text without blocking the event loop."""
+        return await arun_flow(self._parse_flow(text), self.chain.ainvoke)
 
-            response = self.llm.invoke(prompt.format(text=text))
+    def _parse_flow(self, text: str) -> Flow:
+        """Cached LLM parse of project requirements."""
+        try:
+            logger.info("Parsing project requirements from free text")
 
-            # Parse the response
-            parsed_req = self.parser.parse(response.content)
+            cache_key = self._cache_key(text)
+            cached = yield CALL, lambda: llm_cache.get("parser", cache_key)
+            if cached is not None:
+                logger.info(f"Using cached parse of project requirements: {cached}")
+                return self._canonicalize(cached)
 
-            # Convert to dictionary
-            result = parsed_req.dict()
+            result = self._to_result((yield INVOKE, {"text": text}))
 
-            # Format date if needed
-            if result.get("start_date") and not re.match(
-                r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", result["start_date"]
-            ):
-                # If date doesn't have time component, add it
-                if re.match(r"\d{4}-\d{2}-\d{2}", result["start_date"]):
-                    result["start_date"] = f"{result['start_date']}T00:00:00"
+            yield CALL, lambda: llm_cache.set("parser", cache_key, result)
 
             logger.info(f"Successfully parsed project requirements: {result}")
-            return result
+            return self._canonicalize(result)
 
         except Exception as e:
             logger.error(f"Error parsing project requirements: {str(e)}")
             raise ValueError(f"Failed to parse project requirements: {str(e)}")
+
+    def _cache_key(self, text: str) -> str:
+        """Content address of a parse request."""
+        return llm_cache.make_key("parser", self.llm.model_name, PARSER_PROMPT_VERSION, text)
+
+    @staticmethod
+    def _to_result(parsed_req: ParsedProjectRequirement) -> Dict[str, Any]:
+        """Convert the parsed LLM response into a requirements dictionary."""
+        # Convert to dictionary
+        result = parsed_req.dict()
+
+        # Format date if needed
+        if result.get("start_date") and not re.match(
+            r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}", result["start_date"]
+        ):
+            # If date doesn't have time component, add it
+            if re.match(r"\d{4}-\d{2}-\d{2}", result["start_date"]):
+                result["start_date"] = f"{result['start_date']}T00:00:00"
+
+        return result
+
+    @staticmethod
+    def _canonicalize(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Use canonical vocabulary names for skills and domains."""
+        return {
+            **result,
+            "tech_stack": skill_vocabulary.canonical_names(result.get("tech_stack", [])),
+            "domains": domain_vocabulary.canonical_names(result.get("domains", [])),
+        }
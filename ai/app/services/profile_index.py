@@ -0,0 +1,241 @@
+"""Persistent local vector index over employee profiles."""
+
+import hashlib
+import math
+import re
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.models import Employee, ProjectRequirement
+from app.services.agents import EmployeeAnalyzer
+
+logger = get_logger(__name__)
+
+# Words of the profile template itself; they appear in every profile and carry no signal
+_TEMPLATE_WORDS = frozenset(
+    "employee code technical skills business domains additional no information "
+    "available advanced intermediate beginner".split()
+)
+
+
+class HashedNgramEmbeddings(Embeddings):
+    """Offline embeddings from hashed words and character trigrams.
+
+    Each word and each trigram of a padded word is hashed (CRC32, stable across
+    processes) into one of ``dimensions`` signed buckets, counts are dampened with
+    1 + log(count) and the vector is L2-normalized. Spelling variants such as
+    "ReactJS" and "React" share most trigrams, so they end up close without any
+    model or network access.
+    """
+
+    def __init__(self, dimensions: int = 1024):
+        self.dimensions = dimensions
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+    def _embed(self, text: str) -> List[float]:
+        counts: Dict[int, float] = {}
+        for word in re.findall(r"[a-z0-9+#]+", (text or "").lower()):
+            if word in _TEMPLATE_WORDS:
+                continue
+            padded = f" {word} "
+            features = [word] + [padded[i:i + 3] for i in range(len(padded) - 2)]
+            for feature in features:
+                digest = zlib.crc32(feature.encode("utf-8"))
+                bucket = digest % self.dimensions
+                sign = 1.0 if digest & 0x80000000 else -1.0
+                counts[bucket] = counts.get(bucket, 0.0) + sign
+
+        vector = [0.0] * self.dimensions
+        for bucket, count in counts.items():
+            if count:
+                vector[bucket] = math.copysign(1.0 + math.log(abs(count)), count)
+        norm = math.sqrt(sum(value * value for value in vector))
+        if norm:
+            vector = [value / norm for value in vector]
+        return vector
+
+
+class ProfileIndex:
+    """Chroma collection of employee profiles, kept in sync with the roster.
+
+    Profiles are the texts EmployeeAnalyzer sends to the LLM. Each record is keyed
+    by employee code and stores a fingerprint of its profile, so a sync only
+    embeds new or changed profiles and deletes employees that left the roster.
+    The collection lives in ``persist_directory`` and survives restarts.
+
+    Syncing embeds profiles, which takes seconds for large rosters, so it runs
+    in a background thread (see follow_roster and sync_in_background) and does
+    not block concurrent nearest() queries.
+    """
+
+    def __init__(self, persist_directory: str, collection_name: str, dimensions: int):
+        self.persist_directory = persist_directory
+        self.collection_name = collection_name
+        self.embeddings = HashedNgramEmbeddings(dimensions)
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._pending: Optional[List[Employee]] = None
+        self._store = None
+        self._fingerprints: Optional[Dict[str, str]] = None
+        self._synced_roster: Optional[List[Employee]] = None
+
+    def _get_store(self):
+        """Open the collection on first use. Must be called with the lock held."""
+        if self._store is None:
+            import chromadb
+            from langchain_chroma import Chroma
+
+            self._store = Chroma(
+                collection_name=self.collection_name,
+                embedding_function=self.embeddings,
+                persist_directory=self.persist_directory,
+                client_settings=chromadb.config.Settings(
+                    anonymized_telemetry=False, is_persistent=True
+                ),
+                collection_metadata={"hnsw:space": "cosine"},
+            )
+            existing = self._store.get(include=["metadatas"])
+            self._fingerprints = {
+                emp_code: (metadata or {}).get("fingerprint", "")
+                for emp_code, metadata in zip(existing["ids"], existing["metadatas"])
+            }
+        return self._store
+
+    def sync(self, employees: List[Employee]) -> None:
+        """Bring the index up to date with a roster, re-embedding only changed profiles."""
+        with self._sync_lock:
+            if self._synced_roster is employees:
+                return
+            sync_start = time.perf_counter()
+            with self._lock:
+                store = self._get_store()
+                known = dict(self._fingerprints)
+
+            profiles: Dict[str, str] = {}
+            for employee in employees:
+                profile = EmployeeAnalyzer._format_employee_profile(employee)
+                if profile:
+                    profiles[employee.empCode] = profile
+
+            fingerprints = {
+                emp_code: self._fingerprint(profile) for emp_code, profile in profiles.items()
+            }
+            changed = [
+                emp_code
+                for emp_code, fingerprint in fingerprints.items()
+                if known.get(emp_code) != fingerprint
+            ]
+            removed = [emp_code for emp_code in known if emp_code not in profiles]
+
+            # Embedding runs without the lock, so queries go on meanwhile
+            if changed:
+                store.add_texts(
+                    texts=[profiles[emp_code] for emp_code in changed],
+                    metadatas=[
+                        {"emp_code": emp_code, "fingerprint": fingerprints[emp_code]}
+                        for emp_code in changed
+                    ],
+                    ids=changed,
+                )
+            if removed:
+                store.delete(ids=removed)
+
+            with self._lock:
+                for emp_code in changed:
+                    self._fingerprints[emp_code] = fingerprints[emp_code]
+                for emp_code in removed:
+                    del self._fingerprints[emp_code]
+                self._synced_roster = employees
+        logger.info(
+            f"Synced profile index: {len(changed)} profiles embedded, {len(removed)} removed, "
+            f"{len(profiles) - len(changed)} unchanged in {time.perf_counter() - sync_start:.3f}s"
+        )
+
+    def sync_in_background(self, employees: List[Employee]) -> None:
+        """Start syncing with a roster in a background thread, unless it is synced or syncing already.
+
+        While a sync runs, the latest roster requested is synced next.
+        """
+        with self._lock:
+            if self._synced_roster is employees or self._pending is employees:
+                return
+            start = self._pending is None
+            self._pending = employees
+        if start:
+            threading.Thread(target=self._sync_pending, name="profile-index-sync", daemon=True).start()
+
+    def follow_roster(self) -> None:
+        """Sync the index in the background whenever the synced roster changes."""
+        from app.services.roster_sync import roster_sync
+
+        roster_sync.add_listener(lambda changed, removed: self.sync_in_background(roster_sync.employees))
+        if roster_sync.employees:
+            self.sync_in_background(roster_sync.employees)
+
+    def _sync_pending(self) -> None:
+        """Sync the requested rosters until none is left."""
+        while True:
+            with self._lock:
+                employees = self._pending
+            try:
+                self.sync(employees)
+            except Exception as e:
+                logger.error(f"Error syncing the profile index: {str(e)}")
+            with self._lock:
+                if self._pending is employees:
+                    self._pending = None
+                    return
+
+    def unindexed(self, emp_codes: List[str]) -> List[str]:
+        """The given employee codes that have no profile in the index yet."""
+        with self._lock:
+            self._get_store()
+            return [emp_code for emp_code in emp_codes if emp_code not in self._fingerprints]
+
+    def nearest(
+        self,
+        project_requirement: ProjectRequirement,
+        n: int,
+        emp_codes: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Codes of the n employees whose profiles are most similar to a requirement.
+
+        If given, only employees in emp_codes are considered.
+        """
+        query = self._requirement_text(project_requirement)
+        search_filter = {"emp_code": {"$in": emp_codes}} if emp_codes is not None else None
+        with self._lock:
+            store = self._get_store()
+            if emp_codes is not None and not emp_codes:
+                return []
+            results = store.similarity_search_with_score(query, k=n, filter=search_filter)
+        return [document.metadata["emp_code"] for document, _ in results]
+
+    @staticmethod
+    def _fingerprint(profile: str) -> str:
+        return hashlib.sha256(" ".join(profile.split()).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _requirement_text(project_requirement: ProjectRequirement) -> str:
+        """Describe a requirement in the same shape as an employee profile."""
+        skills = "\n".join(f"- {skill}" for skill in project_requirement.required_skills.tech_stack)
+        domains = "\n".join(f"- {domain}" for domain in project_requirement.required_skills.domains)
+        return f"Technical Skills:\n{skills}\n\nBusiness Domains:\n{domains}"
+
+
+profile_index = ProfileIndex(
+    persist_directory=settings.VECTOR_INDEX_PATH,
+    collection_name="employee_profiles",
+    dimensions=settings.VECTOR_INDEX_DIMENSIONS,
+)
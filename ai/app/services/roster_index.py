@@ -0,0 +1,121 @@
+"""Bitmap index over the employee roster for candidate pre-filtering."""
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from app.core.logging import get_logger
+from app.models.models import Employee
+from app.services.vocabulary import Vocabulary, domain_vocabulary, skill_vocabulary
+
+logger = get_logger(__name__)
+
+
+class RosterIndex:
+    """Boolean masks over a roster, one slot per employee in roster order.
+
+    Built once per roster list: a validity mask for employees whose primary skills
+    are all named, one mask per skill and domain vocabulary ID, and the row
+    positions of each employee code. Candidate selection is then a handful of
+    vectorized AND/OR operations over these masks.
+    """
+
+    def __init__(self, employees: List[Employee]):
+        self.employees = employees
+        size = len(employees)
+        self.valid = np.zeros(size, dtype=bool)
+        self._skills: Dict[int, np.ndarray] = {}
+        self._domains: Dict[int, np.ndarray] = {}
+        self._positions: Dict[str, List[int]] = {}
+
+        for i, employee in enumerate(employees):
+            self._positions.setdefault(employee.empCode, []).append(i)
+            self.valid[i] = bool(employee.skills) and all(
+                skill.skillName and skill.skillName.lower() != "none"
+                for skill in employee.skills
+            )
+            for skill_id in skill_vocabulary.intern_all(
+                skill.skillName for skill in employee.skills if skill.skillName
+            ):
+                self._row(self._skills, skill_id)[i] = True
+            for domain_id in domain_vocabulary.intern_all(
+                domain.businessDomainName
+                for domain in employee.businessDomains
+                if domain.businessDomainName
+            ):
+                self._row(self._domains, domain_id)[i] = True
+            # Not indexed, but known to the vocabulary so analyses mentioning them score
+            skill_vocabulary.intern_all(
+                skill.additionalSkillName
+                for skill in employee.additionalSkills
+                if skill.additionalSkillName and skill.additionalSkillName.lower() != "none"
+            )
+
+    def __len__(self) -> int:
+        return len(self.employees)
+
+    def _row(self, bitmaps: Dict[int, np.ndarray], term_id: int) -> np.ndarray:
+        row = bitmaps.get(term_id)
+        if row is None:
+            row = bitmaps[term_id] = np.zeros(len(self.employees), dtype=bool)
+        return row
+
+    def empty(self) -> np.ndarray:
+        """A mask selecting nobody."""
+        return np.zeros(len(self.employees), dtype=bool)
+
+    def skills_mask(self, skills: Iterable[str]) -> np.ndarray:
+        """Employees with any of the given primary skills, matched through the vocabulary."""
+        return self._any(self._skills, skill_vocabulary, skills)
+
+    def domains_mask(self, domains: Iterable[str]) -> np.ndarray:
+        """Employees with any of the given business domains, matched through the vocabulary."""
+        return self._any(self._domains, domain_vocabulary, domains)
+
+    def codes_mask(self, emp_codes: Iterable[str]) -> np.ndarray:
+        """Employees with any of the given employee codes."""
+        mask = self.empty()
+        positions = [i for code in emp_codes for i in self._positions.get(code, ())]
+        if positions:
+            mask[positions] = True
+        return mask
+
+    def select(self, mask: np.ndarray) -> List[Employee]:
+        """Employees selected by a mask, in roster order."""
+        return [self.employees[i] for i in np.flatnonzero(mask)]
+
+    def _any(
+        self, bitmaps: Dict[int, np.ndarray], vocabulary: Vocabulary, names: Iterable[str]
+    ) -> np.ndarray:
+        mask = self.empty()
+        for term_id in {vocabulary.resolve(name) for name in names}:
+            row = bitmaps.get(term_id)
+            if row is not None:
+                mask |= row
+        return mask
+
+
+_roster_index: Optional[RosterIndex] = None
+_roster_index_lock = threading.Lock()
+
+
+def get_roster_index(employees: List[Employee]) -> RosterIndex:
+    """Get the index for a roster list, rebuilding it only when the list changes.
+
+    The synced roster keeps its list identity until its version changes, so the
+    index is reused across requests until the roster is actually updated.
+    """
+    global _roster_index
+    with _roster_index_lock:
+        if _roster_index is not None and _roster_index.employees is employees:
+            return _roster_index
+        build_start = time.perf_counter()
+        index = RosterIndex(employees)
+        _roster_index = index
+    logger.info(
+        f"Built roster index for {len(employees)} employees, {len(index._skills)} skills "
+        f"and {len(index._domains)} domains in {time.perf_counter() - build_start:.3f}s"
+    )
+    return index
@@ -0,0 +1,128 @@
+"""Memory-mapped on-disk snapshots of the columnar employee roster."""
+
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.roster_store import COLUMNS, EmployeeView, RosterStore, compact_roster
+
+logger = get_logger(__name__)
+
+# Bumped whenever the on-disk layout changes; snapshots of other formats are ignored
+SNAPSHOT_FORMAT = 1
+
+# Snapshots other than the current one are removed once they are this old (seconds),
+# leaving other workers time to switch to a snapshot they just wrote
+SNAPSHOT_RETENTION = 300.0
+
+
+class RosterSnapshot:
+    """Versioned snapshots of the roster store, one directory per snapshot.
+
+    A snapshot holds one ``.npy`` file per RosterStore column plus ``meta.json``
+    with the string tables and the sync state (record keys, fingerprints and
+    HTTP validators). It is written to a temporary directory, renamed into place
+    and then published by atomically replacing the ``CURRENT`` pointer file, so
+    readers never see a partial snapshot. Columns are loaded memory-mapped and
+    read-only, so workers on the same host share the page cache rather than each
+    holding a private copy.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def save(self, employees: List, state: Dict) -> Optional[str]:
+        """Write a snapshot of a roster and its sync state, returning its directory."""
+        store = RosterStore.of(employees)
+        if store is None:
+            store = RosterStore.of(compact_roster(employees))
+
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            name = f"roster-v{state['version']:06d}-{uuid.uuid4().hex[:8]}"
+            tmp_path = os.path.join(self.directory, f".tmp-{name}")
+            os.makedirs(tmp_path)
+            try:
+                for column, array in store.columns().items():
+                    np.save(os.path.join(tmp_path, f"{column}.npy"), np.ascontiguousarray(array))
+                meta = {
+                    "format": SNAPSHOT_FORMAT,
+                    "created_at": time.time(),
+                    "strings": store._strings,
+                    "levels": store._levels,
+                    "emp_codes": store.emp_codes,
+                    "state": state,
+                }
+                with open(os.path.join(tmp_path, "meta.json"), "w", encoding="utf-8") as f:
+                    json.dump(meta, f, separators=(",", ":"))
+                os.replace(tmp_path, os.path.join(self.directory, name))
+            except Exception:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                raise
+
+            pointer = os.path.join(self.directory, "CURRENT")
+            with open(f"{pointer}.{name}", "w", encoding="utf-8") as f:
+                f.write(name)
+            os.replace(f"{pointer}.{name}", pointer)
+            self._remove_old(name)
+
+        logger.info(
+            f"Saved roster snapshot {name}: {len(store)} employees, "
+            f"{sum(array.nbytes for array in store.columns().values())} column bytes"
+        )
+        return os.path.join(self.directory, name)
+
+    def load(self) -> Optional[Tuple[List[EmployeeView], Dict]]:
+        """Memory-map the current snapshot, returning (roster, sync state) or None."""
+        try:
+            with open(os.path.join(self.directory, "CURRENT"), encoding="utf-8") as f:
+                path = os.path.join(self.directory, f.read().strip())
+            with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("format") != SNAPSHOT_FORMAT:
+                logger.warning(f"Ignoring roster snapshot {path} in format {meta.get('format')}")
+                return None
+
+            columns = {
+                column: np.load(os.path.join(path, f"{column}.npy"), mmap_mode="r")
+                for column in COLUMNS
+            }
+            store = RosterStore.from_columns(
+                columns, meta["strings"], meta["levels"], meta["emp_codes"]
+            )
+        except FileNotFoundError:
+            logger.info("No roster snapshot found")
+            return None
+        except Exception as e:
+            logger.error(f"Error loading roster snapshot: {str(e)}")
+            return None
+
+        logger.info(
+            f"Loaded roster snapshot {os.path.basename(path)}: {len(store)} employees, "
+            f"{time.time() - meta['created_at']:.0f}s old"
+        )
+        return store.views(), meta["state"]
+
+    def _remove_old(self, current: str) -> None:
+        """Delete superseded snapshots and abandoned temporary directories."""
+        cutoff = time.time() - SNAPSHOT_RETENTION
+        for entry in os.scandir(self.directory):
+            if not entry.is_dir() or entry.name == current:
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+            except FileNotFoundError:
+                continue
+
+
+roster_snapshot = RosterSnapshot(settings.ROSTER_SNAPSHOT_DIR)
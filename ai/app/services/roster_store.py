@@ -0,0 +1,404 @@
+"""Compact columnar storage of the employee roster."""
+
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from app.models.models import AdditionalSkill, BusinessDomain, Employee, Skill
+
+# Longest experience a skill can record, in months (the uint16 column limit)
+MAX_MONTHS = np.iinfo(np.uint16).max
+
+
+# Array attributes of a RosterStore
+COLUMNS = (
+    "skill_offsets",
+    "skill_ids",
+    "skill_names",
+    "skill_levels",
+    "skill_months",
+    "skill_primary",
+    "additional_offsets",
+    "additional_ids",
+    "additional_names",
+    "additional_proficiencies",
+    "domain_offsets",
+    "domain_ids",
+    "domain_names",
+)
+
+
+class RosterStore:
+    """The roster as flat arrays instead of a graph of pydantic models.
+
+    Each employee is a row; their skills, additional skills and business domains
+    are ranges of child columns delimited by offsets arrays (row ``i`` owns
+    entries ``offsets[i]:offsets[i + 1]``). Names are interned into one shared
+    string table, levels and proficiencies are uint8 codes and months of
+    experience are uint16. Rows are read through lightweight views that expose
+    the same attributes as Employee, so agents can use either interchangeably.
+    """
+
+    def __init__(self):
+        self._strings: List[str] = []
+        self._levels: List[str] = []
+        self.emp_codes: List[str] = []
+
+        self.skill_offsets = np.zeros(1, dtype=np.uint32)
+        self.skill_ids = np.zeros(0, dtype=np.int64)
+        self.skill_names = np.zeros(0, dtype=np.uint32)
+        self.skill_levels = np.zeros(0, dtype=np.uint8)
+        self.skill_months = np.zeros(0, dtype=np.uint16)
+        self.skill_primary = np.zeros(0, dtype=bool)
+
+        self.additional_offsets = np.zeros(1, dtype=np.uint32)
+        self.additional_ids = np.zeros(0, dtype=np.int64)
+        self.additional_names = np.zeros(0, dtype=np.uint32)
+        self.additional_proficiencies = np.zeros(0, dtype=np.uint8)
+
+        self.domain_offsets = np.zeros(1, dtype=np.uint32)
+        self.domain_ids = np.zeros(0, dtype=np.int64)
+        self.domain_names = np.zeros(0, dtype=np.uint32)
+
+    def __len__(self) -> int:
+        return len(self.emp_codes)
+
+    def __getitem__(self, row: int) -> "EmployeeView":
+        if not 0 <= row < len(self.emp_codes):
+            raise IndexError(row)
+        return EmployeeView(self, row)
+
+    def __iter__(self) -> Iterator["EmployeeView"]:
+        return (EmployeeView(self, row) for row in range(len(self.emp_codes)))
+
+    def views(self) -> List["EmployeeView"]:
+        """One view per row, in roster order."""
+        return list(self)
+
+    @classmethod
+    def of(cls, employees: List) -> Optional["RosterStore"]:
+        """The store whose rows are exactly these views in order, if there is one."""
+        if not employees or not isinstance(employees[0], EmployeeView):
+            return None
+        store = employees[0]._store
+        if len(store) != len(employees) or any(
+            not isinstance(employee, EmployeeView)
+            or employee._store is not store
+            or employee._row != row
+            for row, employee in enumerate(employees)
+        ):
+            return None
+        return store
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """The store's arrays by name."""
+        return {name: getattr(self, name) for name in COLUMNS}
+
+    @classmethod
+    def from_columns(
+        cls,
+        columns: Dict[str, np.ndarray],
+        strings: List[str],
+        levels: List[str],
+        emp_codes: List[str],
+    ) -> "RosterStore":
+        """Rebuild a store from saved arrays, e.g. memory-mapped from disk."""
+        store = cls()
+        for name in COLUMNS:
+            setattr(store, name, columns[name])
+        store._strings = strings
+        store._levels = levels
+        store.emp_codes = emp_codes
+        return store
+
+    def string(self, code: int) -> str:
+        return self._strings[code]
+
+    def level(self, code: int) -> str:
+        return self._levels[code]
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "RosterStore":
+        """Build a store from raw ``/integrate/skill`` employee records.
+
+        Missing or null fields get the same defaults Employee models are built with.
+        """
+        builder = _RosterBuilder()
+        for record in records:
+            builder.add_record(record)
+        return builder.finish(cls())
+
+    @classmethod
+    def from_employees(cls, employees: Iterable) -> "RosterStore":
+        """Build a store from Employee models, EmployeeRecord structs or views of another store."""
+        builder = _RosterBuilder()
+        for employee in employees:
+            builder.add_employee(employee)
+        return builder.finish(cls())
+
+
+class _RosterBuilder:
+    """Accumulates rows column by column and freezes them into a store's arrays."""
+
+    def __init__(self):
+        # Interned strings: insertion order is the code, so the dict is the table
+        self.strings: Dict[str, int] = {}
+        self.levels: Dict[str, int] = {}
+        self.emp_codes: List[str] = []
+
+        self.skill_offsets = [0]
+        self.skill_ids: List[int] = []
+        self.skill_names: List[int] = []
+        self.skill_levels: List[int] = []
+        self.skill_months: List[int] = []
+        self.skill_primary: List[bool] = []
+
+        self.additional_offsets = [0]
+        self.additional_ids: List[int] = []
+        self.additional_names: List[int] = []
+        self.additional_proficiencies: List[int] = []
+
+        self.domain_offsets = [0]
+        self.domain_ids: List[int] = []
+        self.domain_names: List[int] = []
+
+    def add_employee(self, employee) -> None:
+        """Append a row from an object with the Employee attributes."""
+        strings, levels = self.strings, self.levels
+        self.emp_codes.append(employee.empCode)
+        for skill in employee.skills:
+            self.skill_ids.append(skill.skillId)
+            self.skill_names.append(strings.setdefault(skill.skillName, len(strings)))
+            self.skill_levels.append(levels.setdefault(skill.level, len(levels)))
+            self.skill_months.append(skill.monthOfExperience)
+            self.skill_primary.append(skill.isPrimary)
+        self.skill_offsets.append(len(self.skill_ids))
+        for skill in employee.additionalSkills:
+            self.additional_ids.append(skill.id)
+            self.additional_names.append(
+                strings.setdefault(skill.additionalSkillName, len(strings))
+            )
+            self.additional_proficiencies.append(
+                levels.setdefault(skill.proficiency, len(levels))
+            )
+        self.additional_offsets.append(len(self.additional_ids))
+        for domain in employee.businessDomains:
+            self.domain_ids.append(domain.id)
+            self.domain_names.append(strings.setdefault(domain.businessDomainName, len(strings)))
+        self.domain_offsets.append(len(self.domain_ids))
+
+    def add_record(self, record: Dict) -> None:
+        """Append a row from a raw JSON record, defaulting missing or null fields."""
+        strings, levels = self.strings, self.levels
+        self.emp_codes.append(record.get("empCode") or "")
+        for skill in record.get("skills") or []:
+            self.skill_ids.append(skill.get("skillId") or 0)
+            self.skill_names.append(strings.setdefault(skill.get("skillName") or "", len(strings)))
+            self.skill_levels.append(levels.setdefault(skill.get("level") or "Beginner", len(levels)))
+            self.skill_months.append(skill.get("monthOfExperience") or 0)
+            self.skill_primary.append(bool(skill.get("isPrimary")))
+        self.skill_offsets.append(len(self.skill_ids))
+        for skill in record.get("additionalSkills") or []:
+            self.additional_ids.append(skill.get("id") or 0)
+            self.additional_names.append(
+                strings.setdefault(skill.get("additionalSkillName") or "", len(strings))
+            )
+            self.additional_proficiencies.append(
+                levels.setdefault(skill.get("proficiency") or "Beginner", len(levels))
+            )
+        self.additional_offsets.append(len(self.additional_ids))
+        for domain in record.get("businessDomains") or []:
+            self.domain_ids.append(domain.get("id") or 0)
+            self.domain_names.append(
+                strings.setdefault(domain.get("businessDomainName") or "", len(strings))
+            )
+        self.domain_offsets.append(len(self.domain_ids))
+
+    def finish(self, store: RosterStore) -> RosterStore:
+        if len(self.levels) > 256:
+            raise ValueError(f"{len(self.levels)} distinct skill levels do not fit uint8 codes")
+        store._strings = list(self.strings)
+        store._levels = list(self.levels)
+        store.emp_codes = self.emp_codes
+
+        store.skill_offsets = np.asarray(self.skill_offsets, dtype=np.uint32)
+        store.skill_ids = np.asarray(self.skill_ids, dtype=np.int64)
+        store.skill_names = np.asarray(self.skill_names, dtype=np.uint32)
+        store.skill_levels = np.asarray(self.skill_levels, dtype=np.uint8)
+        store.skill_months = np.clip(
+            np.asarray(self.skill_months, dtype=np.int64), 0, MAX_MONTHS
+        ).astype(np.uint16)
+        store.skill_primary = np.asarray(self.skill_primary, dtype=bool)
+
+        store.additional_offsets = np.asarray(self.additional_offsets, dtype=np.uint32)
+        store.additional_ids = np.asarray(self.additional_ids, dtype=np.int64)
+        store.additional_names = np.asarray(self.additional_names, dtype=np.uint32)
+        store.additional_proficiencies = np.asarray(self.additional_proficiencies, dtype=np.uint8)
+
+        store.domain_offsets = np.asarray(self.domain_offsets, dtype=np.uint32)
+        store.domain_ids = np.asarray(self.domain_ids, dtype=np.int64)
+        store.domain_names = np.asarray(self.domain_names, dtype=np.uint32)
+        return store
+
+
+class SkillView:
+    """A skill entry of a RosterStore, read like a Skill model."""
+
+    __slots__ = ("_store", "_i")
+
+    def __init__(self, store: RosterStore, i: int):
+        self._store = store
+        self._i = i
+
+    @property
+    def skillId(self) -> int:
+        return int(self._store.skill_ids[self._i])
+
+    @property
+    def skillName(self) -> str:
+        return self._store.string(self._store.skill_names[self._i])
+
+    @property
+    def level(self) -> str:
+        return self._store.level(self._store.skill_levels[self._i])
+
+    @property
+    def monthOfExperience(self) -> int:
+        return int(self._store.skill_months[self._i])
+
+    @property
+    def isPrimary(self) -> bool:
+        return bool(self._store.skill_primary[self._i])
+
+    def to_model(self) -> Skill:
+        return Skill(
+            skillId=self.skillId,
+            skillName=self.skillName,
+            level=self.level,
+            monthOfExperience=self.monthOfExperience,
+            isPrimary=self.isPrimary,
+        )
+
+
+class AdditionalSkillView:
+    """An additional skill entry of a RosterStore, read like an AdditionalSkill model."""
+
+    __slots__ = ("_store", "_i")
+
+    def __init__(self, store: RosterStore, i: int):
+        self._store = store
+        self._i = i
+
+    @property
+    def id(self) -> int:
+        return int(self._store.additional_ids[self._i])
+
+    @property
+    def additionalSkillName(self) -> str:
+        return self._store.string(self._store.additional_names[self._i])
+
+    @property
+    def proficiency(self) -> str:
+        return self._store.level(self._store.additional_proficiencies[self._i])
+
+    def to_model(self) -> AdditionalSkill:
+        return AdditionalSkill(
+            id=self.id,
+            additionalSkillName=self.additionalSkillName,
+            proficiency=self.proficiency,
+        )
+
+
+class BusinessDomainView:
+    """A business domain entry of a RosterStore, read like a BusinessDomain model."""
+
+    __slots__ = ("_store", "_i")
+
+    def __init__(self, store: RosterStore, i: int):
+        self._store = store
+        self._i = i
+
+    @property
+    def id(self) -> int:
+        return int(self._store.domain_ids[self._i])
+
+    @property
+    def businessDomainName(self) -> str:
+        return self._store.string(self._store.domain_names[self._i])
+
+    def to_model(self) -> BusinessDomain:
+        return BusinessDomain(id=self.id, businessDomainName=self.businessDomainName)
+
+
+class EmployeeView:
+    """A row of a RosterStore, read like an Employee model.
+
+    Child lists are built on access, so holding a view costs two slots.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: RosterStore, row: int):
+        self._store = store
+        self._row = row
+
+    @property
+    def empCode(self) -> str:
+        return self._store.emp_codes[self._row]
+
+    @property
+    def skills(self) -> List[SkillView]:
+        offsets = self._store.skill_offsets
+        return [
+            SkillView(self._store, i)
+            for i in range(int(offsets[self._row]), int(offsets[self._row + 1]))
+        ]
+
+    @property
+    def additionalSkills(self) -> List[AdditionalSkillView]:
+        offsets = self._store.additional_offsets
+        return [
+            AdditionalSkillView(self._store, i)
+            for i in range(int(offsets[self._row]), int(offsets[self._row + 1]))
+        ]
+
+    @property
+    def businessDomains(self) -> List[BusinessDomainView]:
+        offsets = self._store.domain_offsets
+        return [
+            BusinessDomainView(self._store, i)
+            for i in range(int(offsets[self._row]), int(offsets[self._row + 1]))
+        ]
+
+    def to_model(self) -> Employee:
+        """Materialize the row as an Employee model."""
+        return Employee(
+            empCode=self.empCode,
+            skills=[skill.to_model() for skill in self.skills],
+            additionalSkills=[skill.to_model() for skill in self.additionalSkills],
+            businessDomains=[domain.to_model() for domain in self.businessDomains],
+        )
+
+    def __repr__(self) -> str:
+        return f"EmployeeView(empCode={self.empCode!r})"
+
+
+def build_roster(records: List) -> List[EmployeeView]:
+    """Build raw employee records into views over a new columnar store.
+
+    Records are decoded JSON dicts or EmployeeRecord structs; the structs
+    already carry their defaults and read like Employee models.
+    """
+    if records and not isinstance(records[0], dict):
+        return RosterStore.from_employees(records).views()
+    return RosterStore.from_records(records).views()
+
+
+def compact_roster(employees: List) -> List[EmployeeView]:
+    """Copy a roster of models and/or views into one fresh store.
+
+    Incremental syncs build changed employees into their own small stores;
+    compacting afterwards keeps the whole roster in a single set of columns so
+    superseded stores can be freed.
+    """
+    return RosterStore.from_employees(employees).views()
@@ -0,0 +1,196 @@
+"""Incremental synchronisation of the employee skill roster."""
+
+import hashlib
+import json
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from app.core.logging import get_logger
+from app.models.models import Employee
+from app.services.decoding import encode_record
+
+if TYPE_CHECKING:
+    from app.services.decoding import EmployeeRecord
+
+logger = get_logger(__name__)
+
+RosterListener = Callable[[Set[str], Set[str]], None]
+
+
+def fingerprint_record(record: Union[Dict, "EmployeeRecord"]) -> str:
+    """Content hash of a raw employee record, independent of key order.
+
+    Records are decoded JSON dicts or EmployeeRecord structs, whose fields are
+    always encoded in declaration order.
+    """
+    if isinstance(record, dict):
+        payload = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+    return hashlib.blake2b(encode_record(record), digest_size=16).hexdigest()
+
+
+class RosterSync:
+    """Keeps the employee roster in sync with ``/integrate/skill``.
+
+    Conditional request validators (ETag/Last-Modified) are remembered between
+    fetches. When the upstream sends a full payload anyway, each employee record
+    is fingerprinted so only new or changed employees are rebuilt into models;
+    unchanged ones reuse the objects from the previous sync. The roster list keeps
+    its identity while ``version`` is unchanged.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._apply_lock = threading.Lock()
+        self.version = 0
+        self.employees: List[Employee] = []
+        self._entries: Dict[str, Tuple[str, Employee]] = {}
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._listeners: List[RosterListener] = []
+
+    def add_listener(self, listener: RosterListener) -> None:
+        """Register a callback receiving (changed, removed) employee codes."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def fingerprint(self, emp_code: str) -> Optional[str]:
+        """Get the content hash of an employee's current record."""
+        entry = self._entries.get(emp_code)
+        return entry[0] if entry else None
+
+    def export_state(self) -> Tuple[List[Employee], Dict]:
+        """The current roster and what is needed to resume syncing from it."""
+        with self._lock:
+            return self.employees, {
+                "version": self.version,
+                "keys": list(self._entries),
+                "fingerprints": [fp for fp, _ in self._entries.values()],
+                "etag": self._etag,
+                "last_modified": self._last_modified,
+            }
+
+    def restore(self, employees: List[Employee], state: Dict) -> None:
+        """Resume from a saved roster, e.g. a snapshot loaded at startup.
+
+        The saved validators are reused, so the next fetch can be answered with
+        304 if the upstream roster did not change meanwhile. Ignored once the
+        roster has been synced in this process.
+        """
+        with self._apply_lock, self._lock:
+            if self.version:
+                return
+            self._entries = {
+                key: (fp, employee)
+                for key, fp, employee in zip(state["keys"], state["fingerprints"], employees)
+            }
+            self.employees = employees
+            self.version = max(int(state.get("version") or 0), 1)
+            self._etag = state.get("etag")
+            self._last_modified = state.get("last_modified")
+        logger.info(f"Employee roster restored at version {self.version} ({len(employees)} employees)")
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers that let the upstream answer 304 when nothing changed."""
+        headers = {}
+        if not self.version:
+            return headers
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        return headers
+
+    def not_modified(self) -> List[Employee]:
+        """Handle a 304 response by keeping the current roster."""
+        logger.info(f"Employee roster not modified upstream (version {self.version})")
+        return self.employees
+
+    def apply(
+        self,
+        records: List[Union[Dict, "EmployeeRecord"]],
+        build: Callable[[List], List[Employee]],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        compact: Optional[Callable[[List[Employee]], List[Employee]]] = None,
+    ) -> List[Employee]:
+        """Merge a full roster payload, rebuilding only changed employees.
+
+        If given, compact rewrites the merged roster (e.g. into one columnar
+        store) whenever it changed; it must return employees in the same order.
+        Building and compacting are CPU-bound, so call this from a worker thread
+        when on an event loop.
+        """
+        keys = self._record_keys(records)
+        fingerprints = [fingerprint_record(record) for record in records]
+
+        # Syncs are serialised so the previous roster stays current while the
+        # new one is built; readers only wait for the swap.
+        with self._apply_lock:
+            previous = self._entries
+            stale_indexes = [
+                i
+                for i, (key, fp) in enumerate(zip(keys, fingerprints))
+                if key not in previous or previous[key][0] != fp
+            ]
+            rebuilt = dict(zip(stale_indexes, build([records[i] for i in stale_indexes])))
+
+            entries = {}
+            employees = []
+            for i, (key, fp) in enumerate(zip(keys, fingerprints)):
+                employee = rebuilt[i] if i in rebuilt else previous[key][1]
+                entries[key] = (fp, employee)
+                employees.append(employee)
+
+            changed = {keys[i] for i in stale_indexes}
+            removed = set(previous) - set(entries)
+
+            if not changed and not removed and keys == list(previous):
+                with self._lock:
+                    self._etag = etag
+                    self._last_modified = last_modified
+                logger.info(f"Employee roster unchanged (version {self.version})")
+                return self.employees
+
+            if compact is not None:
+                employees = compact(employees)
+                entries = {
+                    key: (fp, employee)
+                    for (key, (fp, _)), employee in zip(entries.items(), employees)
+                }
+
+            with self._lock:
+                self._entries = entries
+                self.employees = employees
+                self.version += 1
+                self._etag = etag
+                self._last_modified = last_modified
+                listeners = list(self._listeners)
+
+        logger.info(
+            f"Employee roster synced to version {self.version}: "
+            f"{len(changed)} new or changed, {len(removed)} removed, "
+            f"{len(employees) - len(changed)} reused"
+        )
+        for listener in listeners:
+            try:
+                listener(changed, removed)
+            except Exception as e:
+                logger.error(f"Error notifying roster listener: {str(e)}")
+
+        return employees
+
+    @staticmethod
+    def _record_keys(records: List) -> List[str]:
+        """Stable per-record keys: the employee code, disambiguated if repeated."""
+        seen: Dict[str, int] = {}
+        keys = []
+        for record in records:
+            code = (record.get("empCode") if isinstance(record, dict) else record.empCode) or ""
+            count = seen.get(code, 0)
+            seen[code] = count + 1
+            keys.append(code if count == 0 else f"{code}#{count}")
+        return keys
+
+
+roster_sync = RosterSync()
@@ -0,0 +1,290 @@
+"""Vectorized deterministic scoring of employee analyses."""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.core.logging import get_logger
+from app.services.vocabulary import Vocabulary, domain_vocabulary, normalize_key, skill_vocabulary
+
+logger = get_logger(__name__)
+
+# Experience level scores; unknown levels score 0.5
+EXPERIENCE_SCORES = {
+    "senior": 1.0,
+    "intermediate": 0.7,
+    "junior": 0.4,
+    "fresher": 0.2,
+}
+
+# Weights of the overall match score
+SKILL_WEIGHT = 0.45
+EXPERIENCE_WEIGHT = 0.4
+DOMAIN_WEIGHT = 0.15
+
+# Minimum overall score for an employee to be recommended
+MIN_MATCH_SCORE = 0.4
+
+
+class _SparseRows:
+    """Growable CSR-style sets of vocabulary IDs, one row per employee."""
+
+    def __init__(self):
+        self.indptr = [0]
+        self._chunks: List[np.ndarray] = []
+        self._indices: Optional[np.ndarray] = None
+        self._rows: Optional[np.ndarray] = None
+        self._max_id = -1
+
+    def append(self, ids: Set[int]) -> None:
+        self._chunks.append(np.fromiter(ids, dtype=np.int64, count=len(ids)))
+        self.indptr.append(self.indptr[-1] + len(ids))
+        self._indices = self._rows = None
+
+    def row(self, i: int) -> np.ndarray:
+        """IDs in one row."""
+        return self._chunks[i]
+
+    def hits(self, required: np.ndarray, size: int) -> np.ndarray:
+        """Number of required IDs in each row."""
+        if self._indices is None:
+            self._indices = (
+                np.concatenate(self._chunks) if self._chunks else np.zeros(0, dtype=np.int64)
+            )
+            self._rows = np.repeat(np.arange(size), np.diff(self.indptr))
+            self._max_id = int(self._indices.max(initial=-1))
+        # IDs are small dense integers, so a lookup table beats a sorted search
+        lookup = np.zeros(max(self._max_id, int(required.max(initial=-1))) + 1, dtype=bool)
+        lookup[required] = True
+        return np.bincount(self._rows[lookup[self._indices]], minlength=size)
+
+
+def resolve_required(vocabulary: Vocabulary, names: Iterable[str]) -> Tuple[Set[int], Set[str]]:
+    """Vocabulary IDs of required names, and the normalized keys of the other ones.
+
+    Names are resolved, not interned, so requests cannot grow the vocabulary.
+    A required name outside the vocabulary is matched exactly (by its
+    normalized key) against the names in the analyses.
+    """
+    ids, unknown = set(), set()
+    for name in names:
+        term_id = vocabulary.resolve(name)
+        if term_id is not None:
+            ids.add(term_id)
+        elif normalize_key(name or ""):
+            unknown.add(normalize_key(name))
+    return ids, unknown
+
+
+class ScoringMatrix:
+    """Employee analyses as sparse employee x skill and employee x domain matrices.
+
+    Skills (all levels plus additional skills) and primary domains are stored as
+    vocabulary IDs, and experience levels as a score vector. Names the
+    vocabulary does not know are not added to it; they get IDs local to the
+    matrix, by normalized key, in separate rows, so they still match the same
+    names in a requirement exactly. Scoring every employee is then a few array
+    operations, and only the top results are turned back into match records.
+    Rows can be appended as more analyses arrive.
+    """
+
+    def __init__(self, analyses: Iterable[Dict] = ()):
+        self.analyses: List[Dict] = []
+        self._skills = _SparseRows()
+        self._domains = _SparseRows()
+        self._other_skills = _SparseRows()
+        self._other_domains = _SparseRows()
+        self._other_skill_ids: Dict[str, int] = {}
+        self._other_domain_ids: Dict[str, int] = {}
+        self._experience: List[float] = []
+        self.extend(analyses)
+
+    def __len__(self) -> int:
+        return len(self.analyses)
+
+    def extend(self, analyses: Iterable[Dict]) -> None:
+        """Append analyses, skipping malformed ones."""
+        for analysis in analyses:
+            try:
+                # Extract all employee skills (primary + additional)
+                skill_names = []
+                for level in ["advanced", "intermediate", "beginner"]:
+                    skill_names.extend(analysis["technical_skills"][level])
+                skill_names.extend(analysis["additional_skills"])
+                skills, other_skills = self._resolve(skill_vocabulary, skill_names, self._other_skill_ids)
+                domains, other_domains = self._resolve(
+                    domain_vocabulary,
+                    analysis["domain_expertise"]["primary_domains"],
+                    self._other_domain_ids,
+                )
+                experience = EXPERIENCE_SCORES.get(analysis["experience_level"].lower(), 0.5)
+            except Exception as e:
+                logger.error(
+                    f"Skipping malformed analysis for {analysis.get('employee_name', 'unknown')}: {str(e)}"
+                )
+                continue
+
+            self.analyses.append(analysis)
+            self._skills.append(skills)
+            self._domains.append(domains)
+            self._other_skills.append(other_skills)
+            self._other_domains.append(other_domains)
+            self._experience.append(experience)
+
+    @staticmethod
+    def _resolve(
+        vocabulary: Vocabulary, names: Iterable[str], local_ids: Dict[str, int]
+    ) -> Tuple[Set[int], Set[int]]:
+        """Vocabulary IDs of names, and local IDs of the normalized keys of the other ones."""
+        ids, other = set(), set()
+        for name in names:
+            term_id = vocabulary.resolve(name)
+            if term_id is not None:
+                ids.add(term_id)
+                continue
+            key = normalize_key(name or "")
+            if key:
+                other.add(local_ids.setdefault(key, len(local_ids)))
+        return ids, other
+
+    def skills(self, i: int) -> Set[int]:
+        """Skill IDs of one row."""
+        return set(self._skills.row(i).tolist())
+
+    def experience(self, i: int) -> float:
+        """Experience score of one row."""
+        return self._experience[i]
+
+    def score(
+        self,
+        required_skills: Set[int],
+        required_domains: Set[int],
+        other_skills: Set[str] = frozenset(),
+        other_domains: Set[str] = frozenset(),
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Compute (match score, skill fit, domain match, experience match) for every row.
+
+        other_skills and other_domains are the normalized keys of required names
+        outside the vocabulary (see resolve_required).
+        """
+        size = len(self.analyses)
+
+        if required_skills or other_skills:
+            skill_match = self._hits(
+                self._skills, required_skills, self._other_skills, self._other_skill_ids, other_skills
+            ) / (len(required_skills) + len(other_skills))
+        else:
+            skill_match = np.ones(size)
+
+        # Binary domain scoring: a proportion if at least one domain matches, otherwise 0
+        if required_domains or other_domains:
+            domain_match = self._hits(
+                self._domains, required_domains, self._other_domains, self._other_domain_ids, other_domains
+            ) / (len(required_domains) + len(other_domains))
+        else:
+            domain_match = np.zeros(size)
+
+        exp_match = np.asarray(self._experience, dtype=np.float64)
+        match_score = (
+            skill_match * SKILL_WEIGHT + exp_match * EXPERIENCE_WEIGHT + domain_match * DOMAIN_WEIGHT
+        )
+        return match_score, skill_match, domain_match, exp_match
+
+    def _hits(
+        self,
+        rows: _SparseRows,
+        required: Set[int],
+        other_rows: _SparseRows,
+        local_ids: Dict[str, int],
+        other_keys: Set[str],
+    ) -> np.ndarray:
+        """Number of required names in each row, by vocabulary ID and by exact key."""
+        size = len(self.analyses)
+        hits = rows.hits(np.fromiter(required, dtype=np.int64, count=len(required)), size)
+        other = [local_ids[key] for key in other_keys if key in local_ids]
+        if other:
+            hits = hits + other_rows.hits(np.asarray(other, dtype=np.int64), size)
+        return hits
+
+
+def top_k(scores: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+    """Indexes of the k highest scores, best first; ties keep their original order."""
+    size = len(scores)
+    if k is None or k >= size:
+        candidates = np.arange(size)
+    elif k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    else:
+        # Select the k best without sorting everything, then take boundary ties in order
+        threshold = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[: k - len(above)]
+        candidates = np.concatenate([above, ties])
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+def shortlist(
+    matrix: ScoringMatrix,
+    scores: np.ndarray,
+    required_skills: Set[int],
+    size: int,
+    diversity_margin: int,
+) -> Tuple[np.ndarray, Dict]:
+    """Pick the rows worth sending to the LLM matcher, with recall diagnostics.
+
+    Keeps the ``size`` best rows, then up to ``diversity_margin`` more from the
+    rest of the ranking. The margin favours the best row of each combination of
+    matched required skills and experience level not yet represented, so
+    profiles the formula undervalues still reach the LLM. The diagnostics compare
+    the shortlist with the full ranking, in particular how many employees above
+    MIN_MATCH_SCORE were left out. The cutoff is the score of the last row kept
+    on merit; the diversity rows are reported separately, since they may score
+    below it.
+    """
+    ranking = top_k(scores)
+    selected = list(ranking[:size])
+    remaining = ranking[size:]
+    margin = []
+
+    if diversity_margin > 0 and len(remaining):
+        signatures = {
+            (frozenset(matrix.skills(i) & required_skills), matrix.experience(i))
+            for i in selected
+        }
+        for i in remaining:
+            signature = (frozenset(matrix.skills(i) & required_skills), matrix.experience(i))
+            if signature not in signatures:
+                signatures.add(signature)
+                margin.append(i)
+                if len(margin) >= diversity_margin:
+                    break
+        # Fill any unused margin with the next best rows
+        chosen = set(margin)
+        for i in remaining:
+            if len(margin) >= diversity_margin:
+                break
+            if i not in chosen:
+                margin.append(i)
+        selected.extend(margin)
+
+    selected = np.asarray(sorted(selected, key=lambda i: (-scores[i], i)), dtype=np.int64)
+    excluded = np.ones(len(scores), dtype=bool)
+    excluded[selected] = False
+    qualified = scores >= MIN_MATCH_SCORE
+    qualified_total = int(np.count_nonzero(qualified))
+    qualified_shortlisted = int(np.count_nonzero(qualified & ~excluded))
+
+    top = min(size, len(scores))
+    diagnostics = {
+        "candidates": len(scores),
+        "shortlisted": len(selected),
+        "top_k": top,
+        "diversity_added": len(margin),
+        "diversity_scores": sorted((float(scores[i]) for i in margin), reverse=True),
+        "qualified_total": qualified_total,
+        "qualified_shortlisted": qualified_shortlisted,
+        "qualified_recall": qualified_shortlisted / qualified_total if qualified_total else 1.0,
+        "cutoff_score": float(scores[ranking[top - 1]]) if top > 0 else None,
+        "best_excluded_score": float(scores[excluded].max()) if excluded.any() else None,
+    }
+    return selected, diagnostics
@@ -1,9 +1,27 @@
-import requests
-from typing import Dict, List
+import asyncio
+import httpx
+from typing import TYPE_CHECKING, Dict, List
 import logging
-from datetime import datetime, timedelta
+import threading
+from datetime import date, datetime, timedelta
 from app.models.models import Employee, Project, Skill, AdditionalSkill, BusinessDomain
 from app.core.config import settings
+from app.services.booking_store import booking_store
+from app.services.cache import upstream_cache
+from app.services.decoding import (
+    convert_employee,
+    decode_employees,
+    decode_json,
+    decode_projects,
+    fast_decoding_enabled,
+)
+from app.services.http_client import get_http_client, streaming_available
+from app.services.roster_snapshot import roster_snapshot
+from app.services.roster_store import build_roster, compact_roster
+from app.services.roster_sync import roster_sync
+
+if TYPE_CHECKING:
+    from app.services.decoding import ProjectRecord
 
 logger = logging.getLogger(__name__)
 
@@ -12,9 +30,6 @@ class APIService:
     def __init__(self):
         self.base_url_insider = "https://uat-insiderapi.saigontechnology.vn/api"
         self.base_url_empinfo = "https://uat-empinfoapi.saigontechnology.vn"
-        self._employee_skills_cache = None
-        self._employee_bookings_cache = {}
-        self._employee_active_status_cache = None
 
     def _get_headers(self, token) -> Dict:
         return {"Authorization": token, "Content-Type": "application/json"}
@@ -87,114 +102,251 @@ class APIService:
 
         return proj_data
 
-    def get_project_bookings(self) -> List[Project]:
-        """Fetch project bookings from the API"""
-        try:
-            url = f"{self.base_url_insider}/project/get-all-for-booking"
-            response = requests.get(
-                url, headers=self._get_headers(settings.INSIDER_BEARER_TOKEN)
+    def _build_projects(self, projects_data: List[Dict]) -> List[Project]:
+        """Convert raw project payloads into Project models."""
+        projects = []
+        for proj_data in projects_data:
+            try:
+                # Convert string dates to datetime objects
+                if proj_data.get("startDate"):
+                    proj_data["startDate"] = self.parse_datetime(proj_data["startDate"])
+                if proj_data.get("endDate"):
+                    proj_data["endDate"] = self.parse_datetime(proj_data["endDate"])
+
+                # Clean and validate project data
+                cleaned_data = self.clean_project_data(proj_data)
+
+                # Create project object
+                project = Project(**cleaned_data)
+                projects.append(project)
+
+            except Exception as e:
+                logger.error(f"Error processing project data: {str(e)}")
+                logger.error(f"Problematic project data: {proj_data}")
+                continue
+
+        return projects
+
+    @staticmethod
+    def _stream_ingest() -> bool:
+        """Whether roster-sized payloads are parsed incrementally as they download."""
+        return settings.STREAM_INGEST and streaming_available()
+
+    def _build_project_records(self, records: List["ProjectRecord"]) -> List[Project]:
+        """Convert decoded ProjectRecord structs into Project models."""
+        projects = []
+        for record in records:
+            try:
+                projects.append(
+                    Project.model_validate(
+                        record.with_dates(self.parse_datetime), from_attributes=True
+                    )
+                )
+            except Exception as e:
+                logger.error(f"Error processing project data: {str(e)}")
+                logger.error(f"Problematic project data: {record}")
+                continue
+
+        return projects
+
+    def _build_employees(self, employees_data: List[Dict]) -> List[Employee]:
+        """Convert raw employee skill payloads into Employee models.
+
+        With ROSTER_COLUMNAR, employees are views over a columnar RosterStore
+        that read like Employee models. Decoded EmployeeRecord structs already
+        carry their defaults and are validated as they are.
+        """
+        if settings.ROSTER_COLUMNAR:
+            return build_roster(employees_data)
+        if employees_data and not isinstance(employees_data[0], dict):
+            return [
+                Employee.model_validate(record, from_attributes=True)
+                for record in employees_data
+            ]
+
+        employees = []
+        for emp_data in employees_data:
+            # Convert skills data to match our model
+            skills = []
+            for skill in emp_data.get("skills", []):
+                skills.append(
+                    Skill(
+                        skillId=skill.get("skillId", 0),
+                        skillName=skill.get("skillName", ""),
+                        level=skill.get("level", "Beginner"),
+                        monthOfExperience=skill.get("monthOfExperience", 0),
+                        isPrimary=skill.get("isPrimary", False),
+                    )
+                )
+
+            # Convert additional skills
+            additional_skills = []
+            for add_skill in emp_data.get("additionalSkills", []):
+                additional_skills.append(
+                    AdditionalSkill(
+                        id=add_skill.get("id", 0),
+                        additionalSkillName=add_skill.get("additionalSkillName", ""),
+                        proficiency=add_skill.get("proficiency", "Beginner"),
+                    )
+                )
+
+            # Convert business domains
+            business_domains = []
+            for domain in emp_data.get("businessDomains", []):
+                business_domains.append(
+                    BusinessDomain(
+                        id=domain.get("id", 0),
+                        businessDomainName=domain.get("businessDomainName", ""),
+                    )
+                )
+
+            # Create employee object
+            employee = Employee(
+                empCode=emp_data.get("empCode", ""),
+                skills=skills,
+                additionalSkills=additional_skills,
+                businessDomains=business_domains,
             )
-            response.raise_for_status()
+            employees.append(employee)
+
+        return employees
+
+    async def _afetch_project_bookings(self) -> List[Project]:
+        """Download and build project bookings. Raises on upstream errors."""
+        url = f"{self.base_url_insider}/project/get-all-for-booking"
+        response = await get_http_client().get(
+            url, headers=self._get_headers(settings.INSIDER_BEARER_TOKEN)
+        )
+        response.raise_for_status()
 
+        if fast_decoding_enabled():
+            projects_data = decode_projects(response.content)
+            logger.info(f"Retrieved {len(projects_data)} projects from API")
+            projects = self._build_project_records(projects_data)
+        else:
             projects_data = response.json()
             logger.info(f"Retrieved {len(projects_data)} projects from API")
+            projects = self._build_projects(projects_data)
+        logger.info(f"Successfully processed {len(projects)} projects")
+        return projects
+
+    async def _afetch_employee_skills(self) -> List[Employee]:
+        """Sync the employee roster incrementally. Raises on upstream errors."""
+        url = f"{self.base_url_empinfo}/integrate/skill"
+        headers = {
+            **self._get_headers(settings.EMP_INFO_TOKEN),
+            **roster_sync.conditional_headers(),
+        }
+        streamed = self._stream_ingest()
+        if streamed:
+            # Convert each employee as it is parsed instead of decoding the whole body
+            employees_data = []
+            response = await get_http_client().stream_items(
+                url, lambda item: employees_data.append(convert_employee(item)), headers=headers
+            )
+            employees_data = [record for record in employees_data if record is not None]
+        else:
+            response = await get_http_client().get(url, headers=headers)
+        if response.status_code == 304:
+            return roster_sync.not_modified()
+        response.raise_for_status()
+
+        if not streamed:
+            if fast_decoding_enabled():
+                employees_data = decode_employees(response.content)
+            else:
+                employees_data = response.json()
+        logger.info(f"Retrieved {len(employees_data)} employees from API")
+
+        # Rebuilding the roster is CPU-bound; keep it off the shared HTTP loop
+        return await asyncio.to_thread(
+            roster_sync.apply,
+            employees_data,
+            self._build_employees,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            compact=compact_roster if settings.ROSTER_COLUMNAR else None,
+        )
+
+    async def _afetch_employee_active_status(self) -> List[Dict]:
+        """Download employee active status. Raises on upstream errors."""
+        logger.info("Fetching employee active status from API...")
+        url = f"{self.base_url_empinfo}/.well-known/employee"
+        # Use the proper authorization headers
+        headers = self._get_headers(settings.EMP_INFO_TOKEN)
+        streamed = self._stream_ingest()
+        if streamed:
+            employees_data = []
+            response = await get_http_client().stream_items(
+                url, employees_data.append, headers=headers
+            )
+        else:
+            response = await get_http_client().get(url, headers=headers)
+
+        if response.status_code != 200:
+            raise httpx.HTTPStatusError(
+                f"Failed to fetch employee active status: {response.status_code}",
+                request=response.request,
+                response=response,
+            )
 
-            projects = []
-            for proj_data in projects_data:
-                try:
-                    # Convert string dates to datetime objects
-                    if proj_data.get("startDate"):
-                        proj_data["startDate"] = self.parse_datetime(
-                            proj_data["startDate"]
-                        )
-                    if proj_data.get("endDate"):
-                        proj_data["endDate"] = self.parse_datetime(proj_data["endDate"])
-
-                    # Clean and validate project data
-                    cleaned_data = self.clean_project_data(proj_data)
-
-                    # Create project object
-                    project = Project(**cleaned_data)
-                    projects.append(project)
-
-                except Exception as e:
-                    logger.error(f"Error processing project data: {str(e)}")
-                    logger.error(f"Problematic project data: {proj_data}")
-                    continue
+        if not streamed:
+            employees_data = (
+                decode_json(response.content) if fast_decoding_enabled() else response.json()
+            )
+        logger.info(f"Retrieved active status for {len(employees_data)} employees")
+        return employees_data
 
-            logger.info(f"Successfully processed {len(projects)} projects")
-            return projects
+    async def aget_project_bookings(self) -> List[Project]:
+        """Fetch project bookings from the API"""
+        try:
+            return await upstream_cache.get(
+                "project_bookings",
+                self._afetch_project_bookings,
+                ttl=settings.CACHE_PROJECTS_TTL,
+            )
 
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
+            # ValueError covers undecodable bodies (json, msgspec and streaming decode errors)
             logger.error(f"Error fetching project bookings: {str(e)}")
             return []
 
-    def get_employee_skills(self) -> List[Employee]:
+    async def aget_employee_skills(self) -> List[Employee]:
         """Fetch employee skills from the API"""
         try:
-            url = f"{self.base_url_empinfo}/integrate/skill"
-            response = requests.get(
-                url, headers=self._get_headers(settings.EMP_INFO_TOKEN)
+            return await upstream_cache.get(
+                "employee_skills",
+                self._afetch_employee_skills,
+                ttl=settings.CACHE_ROSTER_TTL,
             )
-            response.raise_for_status()
-
-            employees_data = response.json()
-            logger.info(f"Retrieved {len(employees_data)} employees from API")
-
-            employees = []
-            for emp_data in employees_data:
-                # Convert skills data to match our model
-                skills = []
-                for skill in emp_data.get("skills", []):
-                    skills.append(
-                        Skill(
-                            skillId=skill.get("skillId", 0),
-                            skillName=skill.get("skillName", ""),
-                            level=skill.get("level", "Beginner"),
-                            monthOfExperience=skill.get("monthOfExperience", 0),
-                            isPrimary=skill.get("isPrimary", False),
-                        )
-                    )
-
-                # Convert additional skills
-                additional_skills = []
-                for add_skill in emp_data.get("additionalSkills", []):
-                    additional_skills.append(
-                        AdditionalSkill(
-                            id=add_skill.get("id", 0),
-                            additionalSkillName=add_skill.get(
-                                "additionalSkillName", ""
-                            ),
-                            proficiency=add_skill.get("proficiency", "Beginner"),
-                        )
-                    )
-
-                # Convert business domains
-                business_domains = []
-                for domain in emp_data.get("businessDomains", []):
-                    business_domains.append(
-                        BusinessDomain(
-                            id=domain.get("id", 0),
-                            businessDomainName=domain.get("businessDomainName", ""),
-                        )
-                    )
-
-                # Create employee object
-                employee = Employee(
-                    empCode=emp_data.get("empCode", ""),
-                    skills=skills,
-                    additionalSkills=additional_skills,
-                    businessDomains=business_domains,
-                )
-                employees.append(employee)
-
-            return employees
 
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
+            # ValueError covers undecodable bodies (json, msgspec and streaming decode errors)
             logger.error(f"Error fetching employee skills: {str(e)}")
             return []
 
-    def get_employee_bookings(self, start_date: datetime) -> List[Dict]:
+    async def _afetch_booking_range(self, from_date: date, to_date: date) -> List[Dict]:
+        """Download bookings overlapping a date range. Raises on upstream errors."""
+        # Format dates for API URL
+        from_date_str = from_date.strftime("%Y-%m-%d")
+        to_date_str = to_date.strftime("%Y-%m-%d")
+
+        # Call the new API endpoint
+        url = f"{self.base_url_insider}/booking/byPlanner/97/{from_date_str}/{to_date_str}"
+        response = await get_http_client().get(
+            url, headers=self._get_headers(settings.INSIDER_BEARER_TOKEN)
+        )
+        response.raise_for_status()
+
+        bookings_data = (
+            decode_json(response.content) if fast_decoding_enabled() else response.json()
+        )
+        logger.info(
+            f"Retrieved {len(bookings_data)} employee bookings from API for {from_date_str} - {to_date_str}"
+        )
+        return bookings_data
+
+    async def aget_employee_bookings(self, start_date: datetime) -> List[Dict]:
         """Fetch employee bookings from the API using the new endpoint.
 
         Args:
@@ -207,61 +359,76 @@ class APIService:
             # Calculate date range: from 30 days before start_date to start_date
             from_date = start_date - timedelta(days=30)
 
-            # Format dates for API URL
-            from_date_str = from_date.strftime("%Y-%m-%d")
-            to_date_str = start_date.strftime("%Y-%m-%d")
-
-            # Call the new API endpoint
-            url = f"{self.base_url_insider}/booking/byPlanner/97/{from_date_str}/{to_date_str}"
-            response = requests.get(
-                url, headers=self._get_headers(settings.INSIDER_BEARER_TOKEN)
+            # Serve the window from the booking store, fetching only uncovered gaps
+            bookings_data = await booking_store.get(
+                from_date.date(), start_date.date(), self._afetch_booking_range
             )
-            response.raise_for_status()
-
-            bookings_data = response.json()
-            logger.info(f"Retrieved {len(bookings_data)} employee bookings from API")
+            logger.info(f"Retrieved {len(bookings_data)} employee bookings")
 
             return bookings_data
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching employee bookings: {str(e)}")
-            return []
         except Exception as e:
             logger.error(f"Unexpected error in get_employee_bookings: {str(e)}")
             return []
 
-    def get_employee_active_status(self) -> List[Dict]:
+    async def aget_employee_active_status(self) -> List[Dict]:
         """Get employee active status information from the API."""
         try:
-            # Return cached data if available
-            if self._employee_active_status_cache is not None:
-                logger.debug("Using cached employee active status")
-                return self._employee_active_status_cache
-
-            logger.info("Fetching employee active status from API...")
-            # Use the proper authorization headers
-            response = requests.get(
-                f"{self.base_url_empinfo}/.well-known/employee",
-                headers=self._get_headers(settings.EMP_INFO_TOKEN),
+            return await upstream_cache.get(
+                "employee_active_status",
+                self._afetch_employee_active_status,
+                ttl=settings.CACHE_ACTIVE_STATUS_TTL,
             )
 
-            if response.status_code != 200:
-                logger.error(
-                    f"Failed to fetch employee active status: {response.status_code}"
-                )
-                return []
+        except Exception as e:
+            logger.error(f"Error fetching employee active status: {str(e)}")
+            return []
 
-            employees_data = response.json()
-            logger.info(f"Retrieved active status for {len(employees_data)} employees")
+    def start_roster_snapshots(self) -> bool:
+        """Warm-start the roster from its on-disk snapshot and keep the snapshot updated.
 
-            # Cache the results
-            self._employee_active_status_cache = employees_data
+        The snapshot, if any, is served right away while a background refresh
+        syncs it with upstream. Every roster change afterwards writes a new
+        snapshot. Returns whether a snapshot was loaded.
+        """
+        roster_sync.add_listener(self._save_roster_snapshot)
 
-            return employees_data
+        snapshot = roster_snapshot.load()
+        if snapshot is None:
+            return False
+        employees, state = snapshot
+        roster_sync.restore(employees, state)
+        upstream_cache.prime("employee_skills", roster_sync.employees, self._afetch_employee_skills)
+        return True
 
-        except Exception as e:
-            logger.error(f"Error fetching employee active status: {str(e)}")
-            return []
+    @staticmethod
+    def _save_roster_snapshot(changed, removed) -> None:
+        """Roster listener writing a snapshot off the upstream loop."""
+
+        def save():
+            try:
+                employees, state = roster_sync.export_state()
+                roster_snapshot.save(employees, state)
+            except Exception as e:
+                logger.error(f"Error saving roster snapshot: {str(e)}")
+
+        threading.Thread(target=save, name="roster-snapshot", daemon=True).start()
+
+    def get_project_bookings(self) -> List[Project]:
+        """Fetch project bookings from the API (blocking)."""
+        return get_http_client().run_sync(self.aget_project_bookings())
+
+    def get_employee_skills(self) -> List[Employee]:
+        """Fetch employee skills from the API (blocking)."""
+        return get_http_client().run_sync(self.aget_employee_skills())
+
+    def get_employee_bookings(self, start_date: datetime) -> List[Dict]:
+        """Fetch employee bookings from the API (blocking)."""
+        return get_http_client().run_sync(self.aget_employee_bookings(start_date))
+
+    def get_employee_active_status(self) -> List[Dict]:
+        """Get employee active status information from the API (blocking)."""
+        return get_http_client().run_sync(self.aget_employee_active_status())
 
 
 def parse_datetime(date_str: str) -> datetime:
@@ -0,0 +1,279 @@
+"""Canonical skill and domain vocabulary with interned IDs and alias resolution."""
+
+import re
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Canonical skill names with their category and known aliases
+BUILTIN_SKILLS: Dict[str, Tuple[Optional[str], List[str]]] = {
+    "React": ("frontend", ["React.js", "ReactJS", "React JS"]),
+    "Angular": ("frontend", ["AngularJS", "Angular.js", "Angular 2+"]),
+    "Vue": ("frontend", ["Vue.js", "VueJS", "Vue 3"]),
+    "JavaScript": ("frontend", ["JS", "ECMAScript", "ES6"]),
+    "TypeScript": ("frontend", ["TS"]),
+    "Next.js": ("frontend", ["NextJS"]),
+    "HTML": ("frontend", ["HTML5"]),
+    "CSS": ("frontend", ["CSS3"]),
+    ".NET": ("backend", [".NET Core", "DotNet", "DotNet Core", ".NET Framework", ".NET 6", "ASP.NET Core"]),
+    "Java": ("backend", ["Java 8", "Java 11", "Java 17", "Core Java"]),
+    "Python": ("backend", ["Python3", "Python 3"]),
+    "Node.js": ("backend", ["NodeJS", "Node"]),
+    "NestJS": ("backend", ["Nest.js"]),
+    "Spring Boot": ("backend", ["SpringBoot"]),
+    "C#": ("backend", ["CSharp", "C Sharp"]),
+    "Go": ("backend", ["Golang"]),
+    "PHP": ("backend", []),
+    "Ruby on Rails": ("backend", ["Rails", "RoR"]),
+    "Django": ("backend", []),
+    "React Native": ("mobile", ["ReactNative"]),
+    "Flutter": ("mobile", []),
+    "Swift": ("mobile", []),
+    "SwiftUI": ("mobile", []),
+    "Kotlin": ("mobile", []),
+    "Android": ("mobile", []),
+    "iOS": ("mobile", []),
+    "PostgreSQL": ("database", ["Postgres"]),
+    "MySQL": ("database", []),
+    "SQL Server": ("database", ["MSSQL", "MS SQL", "Microsoft SQL Server"]),
+    "MongoDB": ("database", ["Mongo"]),
+    "Redis": ("database", []),
+    "AWS": ("devops", ["Amazon Web Services"]),
+    "Azure": ("devops", ["Microsoft Azure"]),
+    "GCP": ("devops", ["Google Cloud", "Google Cloud Platform"]),
+    "Docker": ("devops", []),
+    "Kubernetes": ("devops", ["K8s"]),
+}
+
+# Canonical business domain names with their known aliases
+BUILTIN_DOMAINS: Dict[str, Tuple[Optional[str], List[str]]] = {
+    "Fintech": (None, ["Financial Technology"]),
+    "Banking": (None, ["Bank"]),
+    "E-commerce": (None, ["Ecommerce", "eCommerce", "Online Retail"]),
+    "Healthcare": (None, ["Health Care", "Healthtech"]),
+    "Insurance": (None, ["Insurtech"]),
+    "Education": (None, ["Edtech", "E-learning"]),
+    "Logistics": (None, ["Supply Chain"]),
+}
+
+
+def normalize_key(name: str) -> str:
+    """Lookup key of a name: lowercase, keeping only letters, digits, '+' and '#'."""
+    return re.sub(r"[^a-z0-9+#]", "", name.lower())
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Edits (insertions, deletions, substitutions, adjacent swaps) turning a into b.
+
+    Stops counting past limit and then returns limit + 1.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (a[i - 1] != b[j - 1]),
+            )
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+    return current[-1]
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Vocabulary:
+    """Interns names to integer IDs, folding aliases and typos onto one entry.
+
+    Each canonical name gets an ID; its aliases and any spelling that normalizes
+    to the same key (case, punctuation and spacing are ignored) resolve to that
+    ID. Unknown names of at least ``fuzzy_min_length`` characters are treated as
+    typos of a known key, found through a character trigram index, when they
+    start with the same character and are within one edit per five characters
+    of it (at most ``fuzzy_max_edits``). Shorter names only match exactly. This
+    keeps distinct technologies with similar names apart, such as Preact and
+    React or Swift and SwiftUI.
+
+    Only trusted names, such as the roster's, should be interned; names from
+    LLM output are resolved, so they cannot grow the vocabulary.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        entries: Dict[str, Tuple[Optional[str], List[str]]],
+        fuzzy_min_length: int,
+        fuzzy_max_edits: int,
+    ):
+        self.kind = kind
+        self.fuzzy_min_length = fuzzy_min_length
+        self.fuzzy_max_edits = fuzzy_max_edits
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._categories: List[Optional[str]] = []
+        self._keys: List[Tuple[str, int]] = []
+        self._trigram_index: Dict[str, List[int]] = {}
+
+        for name, (category, aliases) in entries.items():
+            term_id = self._add(name, category)
+            for alias in aliases:
+                self._add_key(normalize_key(alias), term_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._names)
+
+    def resolve(self, name: str) -> Optional[int]:
+        """ID of a known name, alias or close misspelling, or None."""
+        key = normalize_key(name or "")
+        if not key:
+            return None
+        with self._lock:
+            term_id = self._ids.get(key)
+            if term_id is None:
+                term_id = self._fuzzy_lookup(key)
+            return term_id
+
+    def resolve_all(self, names: Iterable[str]) -> Set[int]:
+        """IDs of the known names among names, leaving the vocabulary unchanged."""
+        ids = set()
+        for name in names:
+            term_id = self.resolve(name)
+            if term_id is not None:
+                ids.add(term_id)
+        return ids
+
+    def intern(self, name: str) -> Optional[int]:
+        """ID of a name, registering it as a new canonical name if unknown."""
+        key = normalize_key(name or "")
+        if not key:
+            return None
+        with self._lock:
+            term_id = self._ids.get(key)
+            if term_id is None:
+                term_id = self._fuzzy_lookup(key)
+                if term_id is None:
+                    term_id = self._add(name.strip(), None)
+                else:
+                    # Remember the spelling so it resolves exactly next time
+                    self._add_key(key, term_id)
+            return term_id
+
+    def intern_all(self, names: Iterable[str]) -> Set[int]:
+        """IDs of all names, registering unknown ones."""
+        ids = set()
+        for name in names:
+            term_id = self.intern(name)
+            if term_id is not None:
+                ids.add(term_id)
+        return ids
+
+    def name(self, term_id: int) -> str:
+        """Canonical name of an ID."""
+        return self._names[term_id]
+
+    def category(self, term_id: int) -> Optional[str]:
+        """Category of an ID, if it has one."""
+        return self._categories[term_id]
+
+    def canonical_names(self, names: Iterable[str]) -> List[str]:
+        """Replace known names by their canonical form, dropping duplicates."""
+        result = []
+        seen = set()
+        for name in names:
+            term_id = self.resolve(name)
+            canonical = self._names[term_id] if term_id is not None else name
+            key = term_id if term_id is not None else normalize_key(name or "")
+            if key not in seen:
+                seen.add(key)
+                result.append(canonical)
+        return result
+
+    def in_category(self, names: Iterable[str], category: str) -> List[str]:
+        """The given names whose canonical entry belongs to a category."""
+        result = []
+        for name in names:
+            term_id = self.resolve(name)
+            if term_id is not None and self._categories[term_id] == category:
+                result.append(name)
+        return result
+
+    def _add(self, name: str, category: Optional[str]) -> int:
+        """Register a canonical name. Must be called with the lock held or at init."""
+        key = normalize_key(name)
+        term_id = self._ids.get(key)
+        if term_id is not None:
+            return term_id
+        term_id = len(self._names)
+        self._names.append(name)
+        self._categories.append(category)
+        self._add_key(key, term_id)
+        return term_id
+
+    def _add_key(self, key: str, term_id: int) -> None:
+        if not key or key in self._ids:
+            return
+        self._ids[key] = term_id
+        position = len(self._keys)
+        self._keys.append((key, term_id))
+        for trigram in _trigrams(key):
+            self._trigram_index.setdefault(trigram, []).append(position)
+
+    def _fuzzy_lookup(self, key: str) -> Optional[int]:
+        """Known key that an unknown one is a likely typo of. Must be called with the lock held."""
+        if len(key) < self.fuzzy_min_length:
+            return None
+        max_edits = min(self.fuzzy_max_edits, len(key) // 5)
+
+        # Candidates share at least a third of the key's trigrams
+        query = _trigrams(key)
+        shared = Counter(
+            position
+            for trigram in query
+            for position in self._trigram_index.get(trigram, ())
+        )
+        best_id, best_edits = None, max_edits + 1
+        for position in sorted(shared):
+            if shared[position] * 3 < len(query):
+                continue
+            candidate, term_id = self._keys[position]
+            if len(candidate) < self.fuzzy_min_length or candidate[0] != key[0]:
+                continue
+            edits = edit_distance(key, candidate, max_edits)
+            if edits < best_edits:
+                best_id, best_edits = term_id, edits
+
+        if best_id is not None:
+            logger.debug(
+                f"Resolved {self.kind} '{key}' to '{self._names[best_id]}' ({best_edits} edit(s))"
+            )
+        return best_id
+
+
+skill_vocabulary = Vocabulary(
+    "skill",
+    BUILTIN_SKILLS,
+    fuzzy_min_length=settings.VOCABULARY_FUZZY_MIN_LENGTH,
+    fuzzy_max_edits=settings.VOCABULARY_FUZZY_MAX_EDITS,
+)
+
+domain_vocabulary = Vocabulary(
+    "domain",
+    BUILTIN_DOMAINS,
+    fuzzy_min_length=settings.VOCABULARY_FUZZY_MIN_LENGTH,
+    fuzzy_max_edits=settings.VOCABULARY_FUZZY_MAX_EDITS,
+)
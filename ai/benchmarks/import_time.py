@@ -0,0 +1,101 @@
+"""Measure how long importing the FastAPI app takes and check it against a budget.
+
+Runs ``python -X importtime -c "import main"`` in a fresh interpreter, prints the
+slowest top-level imports and fails if the app takes longer than the budget to
+import or loads any of the LLM client libraries, which are meant to be imported
+lazily on first use.
+
+Usage (from the ai directory):
+    python -m benchmarks.import_time [budget_ms]
+"""
+
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+# Import time of main, in milliseconds, above which the check fails
+DEFAULT_BUDGET_MS = 1200.0
+
+# Packages that must not be imported by main
+LAZY_PACKAGES = (
+    "langchain",
+    "langchain_core",
+    "langchain_openai",
+    "langchain_chroma",
+    "openai",
+    "chromadb",
+    "tiktoken",
+)
+
+# Directory of main.py, where the probe runs
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = (
+    "import sys, main; "
+    "print(','.join(sorted({m.split('.')[0] for m in sys.modules})))"
+)
+
+
+def import_times() -> Tuple[List[Tuple[str, int, int]], List[str]]:
+    """Return (indented module name, self us, cumulative us) per import and the loaded top-level packages."""
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "benchmark")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=APP_DIR,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))
+    return rows, result.stdout.strip().splitlines()[-1].split(",")
+
+
+def main_imports(rows: List[Tuple[str, int, int]]) -> Tuple[int, List[Tuple[str, int]]]:
+    """Cumulative import time of main and (module, cumulative us) of its direct imports.
+
+    importtime reports a module after everything it imports, indented two spaces
+    per level, so the direct imports of main are the one-level rows just before it.
+    """
+    children: List[Tuple[str, int]] = []
+    for name, _, cumulative in rows:
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth == 0:
+            if name == "main":
+                return cumulative, children
+            children = []
+        elif depth == 1:
+            children.append((name.strip(), cumulative))
+    raise RuntimeError("main was not imported")
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+    rows, packages = import_times()
+    total_us, children = main_imports(rows)
+    total_ms = total_us / 1000
+
+    print("Slowest imports under main:")
+    for name, cumulative in sorted(children, key=lambda row: -row[1])[:10]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    print(f"Import of main:   {total_ms:8.1f} ms (budget {budget_ms:.0f} ms)")
+
+    loaded = sorted(set(packages) & set(LAZY_PACKAGES))
+    if loaded:
+        print(f"FAIL: main eagerly imports {', '.join(loaded)}")
+        sys.exit(1)
+    if total_ms > budget_ms:
+        print("FAIL: import time over budget")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
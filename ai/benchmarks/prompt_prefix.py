@@ -0,0 +1,60 @@
+"""Measure the static prompt prefix of each agent role against the provider's cache minimum.
+
+OpenAI only caches prompts of at least 1024 tokens, matching their longest
+shared prefix in 128-token steps. A role's static prefix is everything its
+prompt sends before the first request-specific value; only a prefix of at
+least the minimum can be served from the cache. Tokens are counted with
+tiktoken when its encodings are available and estimated from the text length
+otherwise.
+
+Usage (from the ai directory):
+    python -m benchmarks.prompt_prefix
+"""
+
+import os
+from typing import Callable, Dict, Tuple
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from app.services.agents import _analysis_chain, _matching_chain  # noqa: E402
+from app.services.batching import _get_encoding, count_tokens  # noqa: E402
+from app.services.llm_registry import llm_registry  # noqa: E402
+from app.services.parser import _parser_chain  # noqa: E402
+
+# Shortest prompt OpenAI caches, in tokens
+PROMPT_CACHE_MIN_TOKENS = 1024
+
+ROLES: Dict[str, Callable[[], Tuple]] = {
+    "parser": _parser_chain,
+    "analyzer": _analysis_chain,
+    "matcher": _matching_chain,
+}
+
+# Stands in for every request-specific value; the prefix ends where it first appears
+MARKER = "\x00REQUEST\x00"
+
+
+def static_prefix(build: Callable[[], Tuple]) -> str:
+    """Text of the messages a role's prompt sends before its first request-specific value."""
+    prompt, _ = build()
+    messages = prompt.format_messages(**{name: MARKER for name in prompt.input_variables})
+    prefix = ""
+    for message in messages:
+        if MARKER in message.content:
+            return prefix + message.content[: message.content.index(MARKER)]
+        prefix += message.content
+    return prefix
+
+
+def main():
+    for role, build in ROLES.items():
+        model = llm_registry.roles[role].model
+        tokens = count_tokens(static_prefix(build), model)
+        estimated = " (estimated)" if _get_encoding(model) is None else ""
+        verdict = "cacheable" if tokens >= PROMPT_CACHE_MIN_TOKENS else "below the cache minimum"
+        print(f"{role:9} {model:14} {tokens:6} tokens{estimated}  {verdict}")
+    print(f"Cache minimum: {PROMPT_CACHE_MIN_TOKENS} tokens")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Compare the memory held by the roster as Employee models and as a RosterStore.
+
+Usage (from the ai directory):
+    python -m benchmarks.roster_memory [employees]
+"""
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+from app.core.config import settings
+from app.services.roster_store import build_roster
+from app.services.services import APIService
+
+SKILLS = [
+    "React", "Angular", "Vue.js", "JavaScript", "TypeScript", ".NET Core", "Java",
+    "Python", "Node.js", "NestJS", "Spring Boot", "C#", "Go", "PHP", "Flutter",
+    "Swift", "Kotlin", "PostgreSQL", "MySQL", "SQL Server", "MongoDB", "AWS",
+    "Azure", "Docker", "Kubernetes",
+]
+DOMAINS = ["Fintech", "Banking", "E-commerce", "Healthcare", "Insurance", "Education", "Logistics"]
+LEVELS = ["Beginner", "Intermediate", "Advanced"]
+
+
+def make_records(count: int, seed: int = 42):
+    """Synthetic /integrate/skill records shaped like the upstream payload."""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        records.append(
+            {
+                "empCode": f"EMP{i:05d}",
+                "skills": [
+                    {
+                        "skillId": rng.randint(1, 500),
+                        "skillName": name,
+                        "level": rng.choice(LEVELS),
+                        "monthOfExperience": rng.randint(0, 120),
+                        "isPrimary": j == 0,
+                    }
+                    for j, name in enumerate(rng.sample(SKILLS, rng.randint(2, 8)))
+                ],
+                "additionalSkills": [
+                    {"id": rng.randint(1, 500), "additionalSkillName": name, "proficiency": rng.choice(LEVELS)}
+                    for name in rng.sample(SKILLS, rng.randint(0, 5))
+                ],
+                "businessDomains": [
+                    {"id": rng.randint(1, 50), "businessDomainName": name}
+                    for name in rng.sample(DOMAINS, rng.randint(0, 3))
+                ],
+            }
+        )
+    return records
+
+
+def measure(build, records):
+    """Return (roster, bytes still allocated by it, build seconds)."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    roster = build(records)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return roster, current, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    records = make_records(count)
+    api = APIService()
+
+    settings.ROSTER_COLUMNAR = False
+    models, model_bytes, model_time = measure(api._build_employees, records)
+    stores, store_bytes, store_time = measure(build_roster, records)
+
+    assert [m.empCode for m in models] == [v.empCode for v in stores]
+    assert all(v.to_model() == m for v, m in zip(stores, models))
+
+    print(f"Employees:        {count}")
+    print(f"Employee models:  {model_bytes / 1024 / 1024:8.2f} MiB  built in {model_time:.3f}s")
+    print(f"RosterStore:      {store_bytes / 1024 / 1024:8.2f} MiB  built in {store_time:.3f}s")
+    print(f"Reduction:        {model_bytes / max(store_bytes, 1):8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,16 @@
 """Main FastAPI application."""
+import threading
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.router import api_router
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.services.http_client import close_http_client
+from app.services.jobs import match_jobs
+from app.services.llm_registry import llm_registry
+from app.services.services import APIService
 
 # Set up logging
 setup_logging()
@@ -29,6 +35,47 @@ app.add_middleware(
 # Include API router
 app.include_router(api_router)
 
+@app.on_event("startup")
+def load_roster_snapshot():
+    """Serve the roster from its last snapshot while it is refreshed from upstream."""
+    if settings.ROSTER_SNAPSHOT_ENABLED and settings.ROSTER_COLUMNAR:
+        APIService().start_roster_snapshots()
+
+@app.on_event("startup")
+def prewarm_llm_stack():
+    """Load the LLM client stack off the request path when LLM_PREWARM is set."""
+    if settings.LLM_PREWARM:
+        from app.services.agents import prewarm_llm_stack
+
+        threading.Thread(target=prewarm_llm_stack, name="llm-prewarm", daemon=True).start()
+
+@app.on_event("startup")
+def start_profile_index():
+    """Keep the profile vector index synced with the roster in the background."""
+    if settings.VECTOR_INDEX_ENABLED:
+        def follow_roster():
+            # Imported here: the index pulls in the vector store stack
+            from app.services.profile_index import profile_index
+
+            profile_index.follow_roster()
+
+        threading.Thread(target=follow_roster, name="profile-index", daemon=True).start()
+
+@app.on_event("shutdown")
+async def shutdown_match_jobs():
+    """Stop background match job workers."""
+    await match_jobs.shutdown()
+
+@app.on_event("shutdown")
+async def shutdown_llm_clients():
+    """Release pooled LLM API connections."""
+    await llm_registry.aclose()
+
+@app.on_event("shutdown")
+def shutdown_http_client():
+    """Release pooled upstream connections."""
+    close_http_client()
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -0,0 +1,100 @@
+import asyncio
+from datetime import date, datetime, timedelta
+
+from app.services.booking_store import BookingStore
+
+BOOKINGS = [
+    {"id": 1, "empCode": "E1", "startDate": "2026-09-20T00:00:00", "endDate": "2026-10-05T00:00:00"},
+    {"id": 2, "empCode": "E2", "startDate": "2026-11-01T00:00:00", "endDate": "2026-12-01T00:00:00"},
+    {"id": 3, "empCode": "E3", "startDate": "2026-10-10T00:00:00", "endDate": "2026-10-20T00:00:00"},
+    {"id": 4, "empCode": "E4", "startDate": "2026-11-05T00:00:00", "endDate": "2026-11-20T00:00:00"},
+    {"id": 5, "empCode": "E5", "startDate": "2026-09-01T00:00:00", "endDate": "2026-09-15T00:00:00"},
+]
+
+
+def _day(value: date) -> datetime:
+    return datetime.combine(value, datetime.min.time())
+
+
+class StubPlanner:
+    """Planner API stub: whole-day windows, both ends inclusive."""
+
+    def __init__(self, bookings):
+        self.bookings = bookings
+        self.calls = []
+
+    async def __call__(self, from_date: date, to_date: date):
+        self.calls.append((from_date, to_date))
+        start, end = _day(from_date), _day(to_date + timedelta(days=1))
+        result = []
+        for booking in self.bookings:
+            booking_start = datetime.fromisoformat(booking["startDate"]) if booking.get("startDate") else datetime.min
+            booking_end = datetime.fromisoformat(booking["endDate"]) if booking.get("endDate") else datetime.max
+            if booking_end > start and booking_start < end:
+                result.append(booking)
+        return result
+
+
+def _ids(bookings):
+    return sorted(booking["id"] for booking in bookings)
+
+
+def test_booking_starting_on_window_end_day_is_kept():
+    store, planner = BookingStore(ttl=3600), StubPlanner(BOOKINGS)
+    result = asyncio.run(store.get(date(2026, 10, 2), date(2026, 11, 1), planner))
+
+    assert planner.calls == [(date(2026, 10, 2), date(2026, 11, 1))]
+    assert 2 in _ids(result)
+    assert _ids(result) == _ids(asyncio.run(planner(date(2026, 10, 2), date(2026, 11, 1))))
+
+
+def test_booking_ending_at_window_start_is_dropped():
+    store, planner = BookingStore(ttl=3600), StubPlanner(BOOKINGS)
+    result = asyncio.run(store.get(date(2026, 10, 5), date(2026, 10, 31), planner))
+
+    assert _ids(result) == [3]
+
+
+def test_overlapping_windows_fetch_only_the_gap_and_merge_coverage():
+    store, planner = BookingStore(ttl=3600), StubPlanner(BOOKINGS)
+    asyncio.run(store.get(date(2026, 10, 1), date(2026, 10, 31), planner))
+    later = asyncio.run(store.get(date(2026, 10, 15), date(2026, 11, 10), planner))
+
+    assert planner.calls == [
+        (date(2026, 10, 1), date(2026, 10, 31)),
+        (date(2026, 11, 1), date(2026, 11, 10)),
+    ]
+    assert _ids(later) == [2, 3, 4]
+    assert len(store._coverage) == 1
+
+    # Anything inside the merged coverage is answered without fetching
+    inner = asyncio.run(store.get(date(2026, 10, 19), date(2026, 11, 1), planner))
+    assert len(planner.calls) == 2
+    assert _ids(inner) == [2, 3]
+
+
+def test_window_before_covered_range_fetches_without_duplicates():
+    store, planner = BookingStore(ttl=3600), StubPlanner(BOOKINGS)
+    asyncio.run(store.get(date(2026, 10, 1), date(2026, 10, 31), planner))
+    result = asyncio.run(store.get(date(2026, 9, 10), date(2026, 10, 3), planner))
+
+    assert planner.calls[-1] == (date(2026, 9, 10), date(2026, 9, 30))
+    assert _ids(result) == [1, 5]
+
+
+def test_records_without_dates_are_open_ended():
+    bookings = BOOKINGS + [
+        {"id": 10, "empCode": "E10", "startDate": "2026-10-10T00:00:00", "endDate": None},
+        {"id": 11, "empCode": "E11", "startDate": None, "endDate": "2026-10-10T00:00:00"},
+        {"id": 12, "empCode": "E12"},
+    ]
+    store, planner = BookingStore(ttl=3600), StubPlanner(bookings)
+    first = asyncio.run(store.get(date(2026, 10, 1), date(2026, 10, 15), planner))
+    assert {10, 11, 12} <= set(_ids(first))
+
+    # A later window is answered partly from memory: the open ends decide membership
+    later = asyncio.run(store.get(date(2026, 10, 12), date(2026, 11, 3), planner))
+    assert 10 in _ids(later)
+    assert 12 in _ids(later)
+    assert 11 not in _ids(later)
+    assert _ids(later) == _ids(asyncio.run(planner(date(2026, 10, 12), date(2026, 11, 3))))
@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from app.models.models import ProjectRequirement, Skills
+from app.services.coalescing import requirement_key
+
+
+def _requirement(title, tech_stack, domains):
+    return ProjectRequirement(
+        title=title,
+        required_skills=Skills(tech_stack=tech_stack, domains=domains),
+        required_level="senior",
+        start_date=datetime(2026, 11, 1),
+    )
+
+
+def test_requirement_key_ignores_skill_and_domain_order_and_case():
+    first = _requirement("Shop rebuild", ["React", "Node.js"], ["E-commerce", "Fintech"])
+    second = _requirement("Shop rebuild", ["node.js", "React"], ["Fintech", "e-commerce"])
+    assert requirement_key(first) == requirement_key(second)
+
+
+def test_requirement_key_tells_different_requirements_apart():
+    base = _requirement("Shop", ["React"], ["E-commerce"])
+    assert requirement_key(base) != requirement_key(_requirement("Online store", ["React"], ["E-commerce"]))
+    assert requirement_key(base) != requirement_key(_requirement("Shop", ["Vue"], ["E-commerce"]))
+    assert requirement_key(base) != requirement_key(_requirement("Shop", ["React"], ["Fintech"]))
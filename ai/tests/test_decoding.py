@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from app.services.decoding import convert_employee, decode_employees, decode_projects
+
+msgspec = pytest.importorskip("msgspec")
+
+
+def _body(records):
+    return json.dumps(records).encode("utf-8")
+
+
+def test_null_fields_take_defaults_and_null_items_are_dropped():
+    [employee] = decode_employees(_body([
+        {"empCode": None, "skills": [None, {"skillId": 1, "skillName": "Python", "level": None}], "businessDomains": None}
+    ]))
+    assert employee.empCode == ""
+    assert [skill.skillName for skill in employee.skills] == ["Python"]
+    assert employee.skills[0].level == "Beginner"
+    assert employee.businessDomains == []
+
+
+def test_missing_fields_take_defaults():
+    [employee] = decode_employees(_body([{"empCode": "E1"}]))
+    assert employee.skills == [] and employee.additionalSkills == [] and employee.businessDomains == []
+
+    [project] = decode_projects(_body([{"name": "P1"}]))
+    assert project.id == 0 and project.members == [] and project.startDate is None
+
+
+def test_coercible_types_are_accepted():
+    [project] = decode_projects(_body([
+        {"id": "5", "name": "P1", "members": [{"id": 1, "teamId": 1.0, "empCode": "E1", "isTeamLeader": "true"}]}
+    ]))
+    assert project.id == 5
+    assert project.members[0].teamId == 1
+    assert project.members[0].isTeamLeader is True
+
+
+def test_mistyped_records_are_skipped_alone():
+    employees = decode_employees(_body([
+        {"empCode": "E1", "skills": [{"skillId": 1, "skillName": "Python", "monthOfExperience": 12}]},
+        {"empCode": "E2", "skills": [{"skillId": 2, "skillName": "Go", "monthOfExperience": 12.5}]},
+        {"empCode": "E3", "skills": "Python"},
+        {"empCode": "E4"},
+    ]))
+    assert [employee.empCode for employee in employees] == ["E1", "E4"]
+
+    projects = decode_projects(_body([{"id": "not a number"}, {"id": 7}]))
+    assert [project.id for project in projects] == [7]
+
+
+def test_payload_that_is_not_a_list_is_an_error():
+    with pytest.raises(ValueError):
+        decode_employees(b'{"error": "unavailable"}')
+
+
+def test_convert_employee_returns_none_for_invalid_records():
+    assert convert_employee({"empCode": "E1", "skills": [{"skillId": "3"}]}).skills[0].skillId == 3
+    assert convert_employee({"empCode": "E2", "skills": [{"monthOfExperience": 12.5}]}) is None
@@ -0,0 +1,9 @@
+from benchmarks.import_time import DEFAULT_BUDGET_MS, LAZY_PACKAGES, import_times, main_imports
+
+
+def test_main_imports_lazily_and_within_budget():
+    rows, packages = import_times()
+    total_us, _ = main_imports(rows)
+
+    assert not sorted(set(packages) & set(LAZY_PACKAGES))
+    assert total_us / 1000 <= DEFAULT_BUDGET_MS
@@ -0,0 +1,44 @@
+import asyncio
+
+from app.services.jobs import JOB_CANCELLED, JOB_SUCCEEDED, MatchJobManager
+
+
+def test_cancelled_running_job_is_reported_cancelled_at_once():
+    async def run():
+        jobs = MatchJobManager(workers=1, max_queue=4, retention=60)
+        started, unwound = asyncio.Event(), asyncio.Event()
+
+        async def runner(on_event):
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            finally:
+                await asyncio.sleep(0.01)
+                unwound.set()
+
+        job = jobs.submit(runner)
+        await started.wait()
+        cancelled = jobs.cancel(job.id)
+        status = cancelled.status
+        await unwound.wait()
+        await asyncio.sleep(0)
+        await jobs.shutdown()
+        return status, job.status, job.finished_at is not None
+
+    assert asyncio.run(run()) == (JOB_CANCELLED, JOB_CANCELLED, True)
+
+
+def test_jobs_record_their_result():
+    async def run():
+        jobs = MatchJobManager(workers=1, max_queue=4, retention=60)
+
+        async def runner(on_event):
+            return {"matches": []}
+
+        job = jobs.submit(runner)
+        while not job.finished:
+            await asyncio.sleep(0)
+        await jobs.shutdown()
+        return job.status, job.result
+
+    assert asyncio.run(run()) == (JOB_SUCCEEDED, {"matches": []})
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+
+from app.services.llm_flow import CALL, INVOKE, SLEEP, arun_flow, run_flow
+
+
+def retrying_flow(calls, retries=2):
+    """Invoke the chain, retrying failures, and record which thread ran each blocking call."""
+    cached = yield CALL, lambda: calls.append(threading.current_thread().name) or None
+    if cached is not None:
+        return cached
+    for attempt in range(retries + 1):
+        try:
+            return (yield INVOKE, attempt)
+        except RuntimeError:
+            if attempt < retries:
+                yield SLEEP, 0
+    return "fallback"
+
+
+def flaky(failures):
+    def invoke(attempt):
+        if attempt < failures:
+            raise RuntimeError("upstream error")
+        return f"result {attempt}"
+    return invoke
+
+
+def test_run_flow_retries_failed_invokes():
+    assert run_flow(retrying_flow([]), flaky(1)) == "result 1"
+    assert run_flow(retrying_flow([]), flaky(5)) == "fallback"
+
+
+def test_arun_flow_matches_run_flow():
+    async def ainvoke_with(failures):
+        invoke = flaky(failures)
+
+        async def ainvoke(attempt):
+            return invoke(attempt)
+        return ainvoke
+
+    async def run(failures):
+        return await arun_flow(retrying_flow([]), await ainvoke_with(failures))
+
+    for failures in range(4):
+        assert asyncio.run(run(failures)) == run_flow(retrying_flow([]), flaky(failures))
+
+
+def test_arun_flow_runs_blocking_calls_off_the_event_loop():
+    calls = []
+
+    async def ainvoke(attempt):
+        return "done"
+
+    async def run():
+        return await arun_flow(retrying_flow(calls), ainvoke), threading.current_thread().name
+
+    result, loop_thread = asyncio.run(run())
+    assert result == "done"
+    assert calls and calls[0] != loop_thread
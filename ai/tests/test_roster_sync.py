@@ -0,0 +1,52 @@
+import threading
+
+from app.models.models import Employee
+from app.services.roster_sync import RosterSync
+
+
+def record(emp_code, skill):
+    return {
+        "empCode": emp_code,
+        "skills": [{"skillId": 1, "skillName": skill, "level": "Advanced", "monthOfExperience": 24, "isPrimary": True}],
+        "additionalSkills": [],
+        "businessDomains": [],
+    }
+
+
+def build(records):
+    return [Employee.model_validate(record) for record in records]
+
+
+def test_apply_rebuilds_only_changed_employees():
+    sync = RosterSync()
+    first = sync.apply([record("E1", "Python"), record("E2", "Go")], build)
+    second = sync.apply([record("E1", "Python"), record("E2", "Rust")], build)
+    assert sync.version == 2
+    assert second[0] is first[0]
+    assert second[1].skills[0].skillName == "Rust"
+    assert sync.apply([record("E1", "Python"), record("E2", "Rust")], build) is second
+    assert sync.version == 2
+
+
+def test_roster_can_be_read_while_a_sync_builds():
+    sync = RosterSync()
+    sync.apply([record("E1", "Python")], build)
+    building, release = threading.Event(), threading.Event()
+
+    def slow_build(records):
+        building.set()
+        release.wait(5)
+        return build(records)
+
+    worker = threading.Thread(target=sync.apply, args=([record("E1", "Go")], slow_build))
+    worker.start()
+    assert building.wait(5)
+    try:
+        employees, state = sync.export_state()
+        assert state["version"] == 1
+        assert employees[0].skills[0].skillName == "Python"
+    finally:
+        release.set()
+        worker.join(5)
+    assert sync.version == 2
+    assert sync.employees[0].skills[0].skillName == "Go"
@@ -0,0 +1,65 @@
+import numpy as np
+
+from app.services.scoring import ScoringMatrix, resolve_required, shortlist
+from app.services.vocabulary import skill_vocabulary
+
+
+def _analysis(name, skills, level):
+    return {
+        "employee_name": name,
+        "technical_skills": {"advanced": skills, "intermediate": [], "beginner": []},
+        "additional_skills": [],
+        "domain_expertise": {"primary_domains": [], "secondary_domains": []},
+        "experience_level": level,
+    }
+
+
+def test_shortlist_cutoff_ignores_diversity_rows():
+    matrix = ScoringMatrix([
+        _analysis("E1", ["React", "Node.js"], "senior"),
+        _analysis("E2", ["React", "Node.js"], "senior"),
+        _analysis("E3", ["React", "Node.js"], "intermediate"),
+        _analysis("E4", ["Node.js"], "junior"),
+        _analysis("E5", [], "fresher"),
+    ])
+    required = skill_vocabulary.resolve_all(["React", "Node.js"])
+    scores = matrix.score(required, set())[0]
+
+    selected, diagnostics = shortlist(matrix, scores, required, size=2, diversity_margin=2)
+
+    assert len(selected) == 4
+    assert diagnostics["top_k"] == 2
+    assert diagnostics["cutoff_score"] == float(scores[1])
+    assert diagnostics["diversity_added"] == 2
+    assert diagnostics["diversity_scores"] == [float(scores[2]), float(scores[3])]
+    assert max(diagnostics["diversity_scores"]) < diagnostics["cutoff_score"]
+    assert diagnostics["best_excluded_score"] == float(scores[4])
+
+
+def test_shortlist_without_margin_reports_no_diversity():
+    matrix = ScoringMatrix([_analysis(f"E{i}", ["React"], "senior") for i in range(3)])
+    required = skill_vocabulary.resolve_all(["React"])
+    scores = matrix.score(required, set())[0]
+
+    selected, diagnostics = shortlist(matrix, scores, required, size=5, diversity_margin=0)
+
+    assert np.array_equal(selected, [0, 1, 2])
+    assert diagnostics["cutoff_score"] == float(scores.min())
+    assert diagnostics["diversity_scores"] == []
+    assert diagnostics["best_excluded_score"] is None
+
+
+def test_names_outside_the_vocabulary_match_exactly():
+    matrix = ScoringMatrix([
+        _analysis("E1", ["React", "REST APIs"], "senior"),
+        _analysis("E2", ["React", "rest-apis"], "senior"),
+        _analysis("E3", ["React", "GraphQL APIs"], "senior"),
+    ])
+    size = len(skill_vocabulary)
+    required, other = resolve_required(skill_vocabulary, ["React", "REST APIs"])
+
+    skill_fit = matrix.score(required, set(), other)[1]
+
+    assert other == {"restapis"}
+    assert skill_fit.tolist() == [1.0, 1.0, 0.5]
+    assert len(skill_vocabulary) == size
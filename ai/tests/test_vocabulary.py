@@ -0,0 +1,53 @@
+import pytest
+
+from app.services.vocabulary import BUILTIN_SKILLS, Vocabulary, edit_distance
+
+
+@pytest.fixture
+def vocabulary():
+    return Vocabulary("skill", BUILTIN_SKILLS, fuzzy_min_length=5, fuzzy_max_edits=2)
+
+
+def _name(vocabulary, name):
+    term_id = vocabulary.resolve(name)
+    return vocabulary.name(term_id) if term_id is not None else None
+
+
+@pytest.mark.parametrize(
+    "alias, canonical",
+    [("ReactJS", "React"), ("react.js", "React"), ("Golang", "Go"), ("k8s", "Kubernetes"), ("C Sharp", "C#")],
+)
+def test_aliases_resolve_to_canonical_name(vocabulary, alias, canonical):
+    assert _name(vocabulary, alias) == canonical
+
+
+@pytest.mark.parametrize(
+    "typo, canonical",
+    [("Kubernates", "Kubernetes"), ("Postgress", "PostgreSQL"), ("Javascirpt", "JavaScript"), ("Djnago", "Django")],
+)
+def test_typos_resolve_to_canonical_name(vocabulary, typo, canonical):
+    assert _name(vocabulary, typo) == canonical
+
+
+@pytest.mark.parametrize("name", ["Preact", "SwiftData", "Vuex", "Rust", "Ruby", "Scala", "Elixir"])
+def test_distinct_technologies_do_not_resolve(vocabulary, name):
+    assert vocabulary.resolve(name) is None
+
+
+def test_resolve_does_not_grow_the_vocabulary(vocabulary):
+    size = len(vocabulary)
+    assert vocabulary.resolve_all(["React", "Preact", "Elixir"]) == {vocabulary.resolve("React")}
+    assert len(vocabulary) == size
+
+
+def test_intern_registers_unknown_names(vocabulary):
+    preact = vocabulary.intern("Preact")
+    assert preact != vocabulary.resolve("React")
+    assert vocabulary.resolve("preact") == preact
+    assert vocabulary.name(preact) == "Preact"
+
+
+def test_edit_distance_counts_adjacent_swaps_once():
+    assert edit_distance("javascirpt", "javascript", 2) == 1
+    assert edit_distance("preact", "react", 2) == 1
+    assert edit_distance("abcdef", "uvwxyz", 2) == 3
@@ -0,0 +1,22 @@
+import asyncio
+
+from app.core import workflow
+from app.core.config import settings
+
+
+async def _contend():
+    """Hold the analysis semaphore from more tasks than it admits at once."""
+    semaphore = workflow.get_analysis_semaphore()
+
+    async def hold():
+        async with workflow.get_analysis_semaphore():
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(hold() for _ in range(settings.ANALYSIS_MAX_CONCURRENCY + 2)))
+    return semaphore
+
+
+def test_analysis_semaphore_works_on_every_event_loop():
+    first = asyncio.run(_contend())
+    second = asyncio.run(_contend())
+    assert first is not second